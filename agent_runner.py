@@ -1,35 +1,413 @@
 # imports
+import inspect
 import json
 import time
-from typing import Callable, Optional
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, List, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
 from langchain_openai import ChatOpenAI
 from langchain_community.utilities import RequestsWrapper
 from langchain_community.tools import RequestsGetTool
 from langchain.agents import initialize_agent, AgentType
 from tools import ParsePageTool
+from common.checkpoint import Checkpoint, CrawlIncomplete, open_checkpoint
+from common.details import DetailEnricher
+from common.batch import DEFAULT_CONCURRENCY, BatchResult, run_batch
+from common.job_store import DeltaResult, JobStore, delta_crawl
+from common.sinks import JobSink
+from common.llm_json import extract_json_text
+from common.listing import (RESULTS_PER_PAGE, SITE, fetch_html, fetch_listing, get_session,
+                            next_page_url, offset_of, page_url, parse_listing, search_url)
+from common.pagination import PageLedger
+from common.rate_limit import get_limiter
+from common.retry import MAX_ATTEMPTS, RetryableError, backoff_delay, is_retryable, retry_call
+from common.tracing import Tracer
 
-def crawl_labcorp(start_url: str, progress_callback: Optional[Callable] = None):
+HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
+}
+
+def crawl_labcorp(start_url: str, progress_callback: Optional[Callable] = None,
+                  use_agent: bool = False, sink: Optional[JobSink] = None,
+                  resume: bool = False, tracer: Optional[Tracer] = None,
+                  details: bool = False, strict: bool = False):
     """
     Crawls the LabCorp careers website starting from the provided URL.
     
     Args:
         start_url: The starting URL for the search results
-        progress_callback: Optional callback function to report progress
+        progress_callback: Optional callback, called after each page as
+            (page number, jobs found so far, total reported by the site or None,
+            per-stage metrics from Tracer.summary()). Callbacks taking only
+            (page_num, total_jobs) still work and get the first two
+        use_agent: Drive fetching and parsing through the ReAct agent instead
+            of calling the tools directly
+        sink: Optional streaming writer; each page's jobs are written to it as
+            soon as the page is parsed instead of being collected in memory
+        resume: Continue from the checkpoint of an earlier, interrupted crawl
+            of the same URL; completed pages are not fetched again. Open the
+            sink in append mode so it keeps the rows already written
+        tracer: Records per-stage spans; defaults to one tagged with the
+            URL's keywords. Its summary is printed at the end
+        details: Fetch each job's detail page and add employment_type,
+            date_posted, valid_through and description (common/details.py)
+            before the page is written. Crawls with and without details keep
+            separate checkpoints
+        strict: Raise CrawlIncomplete (common/checkpoint.py) when a page keeps
+            failing, instead of returning the rows found up to it
+
+    Jobs are de-duplicated by canonical job id across the crawl (and a resumed
+    one). When the result list shifted while it was being walked, only the
+    offsets that drift may have hidden are fetched again (common/pagination.py).
         
     Returns:
-        List of job dictionaries with title, location, job_id, url, employment_type
+        JobColumns (common/columns.py), a compact sequence of job dictionaries
+        with title, location, category, job_id, url and, with details, the detail
+        fields (empty when a sink is given)
     """
+    progress_callback = _progress_reporter(progress_callback)
     llm = ChatOpenAI(model_name="gpt-3.5-turbo", temperature=0)
-    requests_wrapper = RequestsWrapper(headers={
-        "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
-    })
+    requests_wrapper = RequestsWrapper(headers=HEADERS)
+    parse_tool = ParsePageTool(llm)
+    tracer = tracer or Tracer(parse_qs(urlsplit(start_url).query).get("keywords", [None])[0])
+    checkpoint = open_checkpoint("labcorp", f"{start_url} details" if details else start_url,
+                                 resume, keep_jobs=sink is None)
+    enricher = DetailEnricher(llm, tracer=tracer) if details else None
+    ledger = PageLedger(seen=checkpoint.seen)
+    try:
+        if use_agent:
+            complete = _crawl_with_agent(checkpoint, start_url, progress_callback, llm,
+                                         requests_wrapper, parse_tool, sink, tracer=tracer,
+                                         enricher=enricher, ledger=ledger)
+        else:
+            complete = _crawl_direct(checkpoint, start_url, progress_callback, parse_tool, sink,
+                                     tracer=tracer, enricher=enricher, ledger=ledger)
+        if complete:
+            _repair_drift(ledger, checkpoint, start_url, progress_callback, parse_tool, sink,
+                          tracer, enricher)
+    finally:
+        if enricher is not None:
+            enricher.close()
+    if complete:
+        checkpoint.finish()
+    else:
+        checkpoint.close()
+        print(f"Crawl incomplete; progress saved to {checkpoint.path}. "
+              f"Run again with resume=True (--resume) to continue from page "
+              f"{len(checkpoint.completed) + 1}.")
+    if parse_tool.cache is not None:
+        print(f"LLM cache: {parse_tool.cache.stats()}")
+    if enricher is not None:
+        print(f"Job details: {enricher.stats()}")
+    print(f"Pagination: {ledger.stats()}")
+    print(f"Rate limiter: {get_limiter().stats()}")
+    print(tracer.format_summary())
+    if strict and not complete:
+        raise CrawlIncomplete(checkpoint)
+    return checkpoint.jobs
+
+def crawl_labcorp_delta(keyword: str, store: Optional[JobStore] = None,
+                        progress_callback: Optional[Callable] = None,
+                        tracer: Optional[Tracer] = None) -> DeltaResult:
+    """
+    Incremental crawl: only fetches recency-sorted pages until it reaches jobs
+    the store already knows for this keyword.
+    
+    Args:
+        keyword: Search keywords
+        store: Persistent job store (defaults to the shared one on disk)
+        progress_callback: Optional callback, called as (page, jobs found, total,
+            per-stage metrics), or (page, jobs found) if it takes two arguments
+        tracer: Records per-stage spans (defaults to a new one for `keyword`)
+        
+    Returns:
+        DeltaResult with added jobs and removed/unchanged job ids
+    """
+    store = store or JobStore()
+    progress_callback = _progress_reporter(progress_callback)
+    llm = ChatOpenAI(model_name="gpt-3.5-turbo", temperature=0)
+    parse_tool = ParsePageTool(llm)
+    tracer = tracer or Tracer(keyword)
+    found = [0]
+
+    def fetch_page(offset: int):
+        url = search_url(keyword, offset)
+        page = offset // RESULTS_PER_PAGE + 1
+        html = _fetch_traced(url, tracer, page)
+        jobs, _, total = _parse_html(url, html, parse_tool, tracer, page)
+        found[0] += len(jobs)
+        if progress_callback:
+            progress_callback(page, found[0], total, tracer.summary())
+        return jobs, total
+
+    result = delta_crawl(keyword, fetch_page, store)
+    print(tracer.format_summary())
+    return result
+
+def crawl_labcorp_batch(keywords: List[str], max_concurrency: int = DEFAULT_CONCURRENCY,
+                        sink: Optional[JobSink] = None, store: Optional[JobStore] = None,
+                        render: bool = False,
+                        progress_callback: Optional[Callable] = None,
+                        tracer: Optional[Tracer] = None) -> BatchResult:
+    """
+    Runs several keyword searches concurrently and merges their jobs.
+    
+    Every query shares one keep-alive HTTP session, one LLM client (and its
+    cache) and, with `render`, one browser pool. A job matched by several
+    queries is returned once with all of its keywords.
+    
+    Args:
+        keywords: Search queries
+        max_concurrency: Queries (page fetches) in flight at once
+        sink: Optional writer, given each query's new jobs as it finishes
+            (use common.batch.BATCH_FIELDS)
+        store: Optional persistent store recording each query's matches
+        render: Render pages without embedded search JSON in the shared
+            browser before parsing them
+        progress_callback: Called as (keyword, jobs found, queries finished)
+        tracer: Records per-stage spans, each tagged with its query
+        
+    Returns:
+        BatchResult with the merged jobs and per-query counts
+    """
+    llm = ChatOpenAI(model_name="gpt-3.5-turbo", temperature=0)
+    parse_tool = ParsePageTool(llm)
+    session = get_session(pool_size=max(10, max_concurrency))
+    tracer = tracer or Tracer()
+
+    def fetch_page(keyword: str, offset: int):
+        url = search_url(keyword, offset)
+        page = offset // RESULTS_PER_PAGE + 1
+        html = _fetch_traced(url, tracer, page, session, keyword=keyword)
+        if render and parse_listing(html) is None:
+            from common.browser_pool import get_pool
+            with tracer.span("navigation", page, keyword=keyword, channel="browser") as span:
+                html = get_pool().fetch(url)
+                span["bytes"] = len(html)
+        jobs, _, total = _parse_html(url, html, parse_tool, tracer, page, keyword=keyword)
+        return jobs, total
+
+    result = run_batch(keywords, fetch_page, max_concurrency, sink, store, progress_callback,
+                       tracer)
+    if parse_tool.cache is not None:
+        print(f"LLM cache: {parse_tool.cache.stats()}")
+    print(tracer.format_summary())
+    return result
+
+def _progress_reporter(callback: Optional[Callable]) -> Optional[Callable]:
+    """
+    Adapts a progress callback to be called as (page, found, total, metrics).
+    Callbacks written for the original (page_num, total_jobs) contract, or
+    any that take fewer positional arguments, get only as many as they accept.
+    """
+    if callback is None:
+        return None
+    try:
+        params = list(inspect.signature(callback).parameters.values())
+    except (TypeError, ValueError):
+        return callback
+    if any(p.kind is inspect.Parameter.VAR_POSITIONAL for p in params):
+        return callback
+    accepted = sum(p.kind in (inspect.Parameter.POSITIONAL_ONLY,
+                              inspect.Parameter.POSITIONAL_OR_KEYWORD) for p in params)
+    if accepted >= 4:
+        return callback
+    return lambda *args: callback(*args[:accepted])
+
+def _absolute(next_page: Optional[str]) -> Optional[str]:
+    if next_page and next_page.startswith("/"):
+        return f"{SITE}{next_page}"
+    return next_page
+
+def _same_page(a: str, b: str) -> bool:
+    """True when two result URLs point at the same query and offset."""
+    qa, qb = parse_qs(urlsplit(a).query), parse_qs(urlsplit(b).query)
+    return (urlsplit(a).path == urlsplit(b).path
+            and qa.get("keywords") == qb.get("keywords")
+            and qa.get("from", ["0"]) == qb.get("from", ["0"]))
+
+def _fetch_traced(url: str, tracer: Tracer, page: Optional[int] = None, session=None,
+                  **tags) -> str:
+    """GETs a results page inside a "navigation" span recording its size and status."""
+    with tracer.span("navigation", page, channel="http", **tags) as span:
+        response = fetch_html(url, session, timeout=30)
+        span.update(bytes=len(response.content), status=response.status_code)
+        return response.text
+
+def _parse_html(url: str, html: str, parse_tool: ParsePageTool,
+                tracer: Optional[Tracer] = None, page: Optional[int] = None,
+                **tags) -> Tuple[List[dict], Optional[str], Optional[int]]:
+    """
+    Jobs, next-page link and reported total for one page: embedded JSON first, then the parse tool.
+    Traced as an "extraction" span, plus an "llm" span when the tool called the model.
+    """
+    tracer = tracer or Tracer()
+    with tracer.span("extraction", page, **tags) as span:
+        listing = parse_listing(html)
+        if listing is not None:
+            jobs = [job.model_dump() for job in listing.jobs]
+            span.update(source="embedded-json", jobs=len(jobs))
+            return jobs, next_page_url(url, listing.total, len(jobs)), listing.total
+        data = json.loads(parse_tool.run(html))
+        span.update(source=data.get("source"), jobs=len(data.get("jobs") or []))
+    usage = data.get("llm_usage")
+    if usage:
+        tracer.record("llm", usage.get("seconds", 0.0), page, **tags,
+                      **{k: v for k, v in usage.items() if k != "seconds"})
+    if data.get("error"):
+        # bad model output: retried like any other transient failure
+        raise RetryableError(f"parse_page: {data['error']}")
+    return data.get("jobs", []), data.get("next_page"), data.get("total_jobs")
+
+def _write_page(tracer: Tracer, page: int, checkpoint: Checkpoint, url: str,
+                next_url: Optional[str], jobs: List[dict], total: Optional[int],
+                sink: Optional[JobSink], enricher: Optional[DetailEnricher] = None,
+                ledger: Optional[PageLedger] = None, repair: bool = False) -> List[dict]:
+    """
+    Hands a parsed page to the sink and the checkpoint, each in its own span,
+    after dropping jobs the ledger has already seen and adding job details
+    when an enricher is given. Returns the jobs written.
+    """
+    if ledger is not None:
+        with tracer.span("dedup", page) as span:
+            unique = ledger.add(offset_of(url), jobs, total, repair=repair)
+            span.update(jobs=len(unique), duplicates=len(jobs) - len(unique))
+        jobs = unique
+    if enricher is not None:
+        jobs = enricher.enrich(jobs, page)
+    if sink is not None:
+        with tracer.span("write", page, jobs=len(jobs)):
+            sink.write_page(jobs)
+    with tracer.span("checkpoint", page):
+        checkpoint.page_done(url, next_url, jobs, total)
+    return jobs
+
+def _repair_drift(ledger: PageLedger, checkpoint: Checkpoint, start_url: str,
+                  progress_callback: Optional[Callable], parse_tool: ParsePageTool,
+                  sink: Optional[JobSink] = None, tracer: Optional[Tracer] = None,
+                  enricher: Optional[DetailEnricher] = None) -> None:
+    """
+    Refetches the offsets pagination drift may have hidden and writes the jobs
+    they bring back. The walk itself already finished, so a repair page that
+    keeps failing is reported and skipped.
+    """
+    tracer = tracer or Tracer()
+    found = checkpoint.rows
+    for offset in ledger.repair_offsets():
+        url = page_url(start_url, offset)
+        page = offset // RESULTS_PER_PAGE + 1
+        try:
+            html = retry_call(_fetch_traced, url, tracer, page, repair=True,
+                              label=f"Repair at offset {offset}: ")
+            jobs, _, total = _parse_html(url, html, parse_tool, tracer, page, repair=True)
+        except Exception as e:
+            print(f"Could not refetch offset {offset}: {e}")
+            continue
+        found += len(_write_page(tracer, page, checkpoint, url, None, jobs, total, sink,
+                                 enricher, ledger, repair=True))
+        if progress_callback:
+            progress_callback(page, found, total, tracer.summary())
+
+def _crawl_direct(checkpoint: Checkpoint, start_url: str,
+                  progress_callback: Optional[Callable], parse_tool: ParsePageTool,
+                  sink: Optional[JobSink] = None, max_attempts: int = MAX_ATTEMPTS,
+                  tracer: Optional[Tracer] = None,
+                  enricher: Optional[DetailEnricher] = None,
+                  ledger: Optional[PageLedger] = None) -> bool:
+    """
+    Calls the fetch and parse tools directly, as a two-stage pipeline: while
+    page N is parsed, the fetch thread already downloads the page N+1 is
+    expected to be (its offset-advanced URL). If the parsed next link points
+    elsewhere the prefetch is discarded. Pacing comes from the shared rate
+    limiter, so waits are paid on the fetch thread.
+
+    Returns True when the last page was reached, False when a page failed
+    (the checkpoint then points at that page).
+    """
+    tracer = tracer or Tracer()
+
+    def fetch(target: str, page: int) -> str:
+        return _fetch_traced(target, tracer, page)
+
+    found = checkpoint.rows
+    url = checkpoint.next if checkpoint.completed else start_url
+    page_num = len(checkpoint.completed) + 1
+    total = checkpoint.total
+    if not url:
+        return True
+    with ThreadPoolExecutor(max_workers=1) as fetcher:
+        pending = fetcher.submit(fetch, url, page_num)
+        while url:
+            guess = prefetch = error = None
+            for attempt in range(1, max_attempts + 1):
+                try:
+                    html = pending.result()
+                    if prefetch is None:
+                        guess = next_page_url(url, total, RESULTS_PER_PAGE)
+                        prefetch = fetcher.submit(fetch, guess, page_num + 1) if guess else None
+                    current_page_jobs, next_page, page_total = _parse_html(
+                        url, html, parse_tool, tracer, page_num)
+                    error = None
+                    break
+                except Exception as e:
+                    error = e
+                    if not is_retryable(e) or attempt == max_attempts:
+                        break
+                    delay = backoff_delay(attempt)
+                    print(f"Error on page {page_num}: {str(e)}. "
+                          f"Retrying {attempt}/{max_attempts - 1} in {delay:.1f}s...")
+                    time.sleep(delay)
+                    pending = fetcher.submit(fetch, url, page_num)
+            if error is not None:
+                reason = "retries exhausted" if is_retryable(error) else "fatal error"
+                print(f"Stopping at page {page_num} ({reason}): {error}")
+                if prefetch is not None:
+                    prefetch.cancel()
+                return False
+
+            next_url = _absolute(next_page)
+            try:
+                found += len(_write_page(tracer, page_num, checkpoint, url, next_url,
+                                         current_page_jobs, page_total, sink, enricher, ledger))
+                total = page_total if page_total is not None else total
+                if progress_callback:
+                    progress_callback(page_num, found, total, tracer.summary())
+            except Exception as e:
+                # same as a failed page: the checkpoint says where a resume picks up
+                print(f"Stopping after page {page_num}: {e}")
+                if prefetch is not None:
+                    prefetch.cancel()
+                return False
+
+            if prefetch is not None and next_url and _same_page(next_url, guess):
+                pending = prefetch
+            else:
+                if prefetch is not None:
+                    prefetch.cancel()
+                pending = fetcher.submit(fetch, next_url, page_num + 1) if next_url else None
+            url = next_url
+            page_num += 1
+    return True
+
+def _crawl_with_agent(checkpoint: Checkpoint, start_url: str,
+                      progress_callback: Optional[Callable],
+                      llm: ChatOpenAI, requests_wrapper: RequestsWrapper,
+                      parse_tool: ParsePageTool, sink: Optional[JobSink] = None,
+                      max_attempts: int = MAX_ATTEMPTS,
+                      tracer: Optional[Tracer] = None,
+                      enricher: Optional[DetailEnricher] = None,
+                      ledger: Optional[PageLedger] = None) -> bool:
+    """
+    Original mode: every fetch and parse goes through the ReAct agent. The
+    agent's steps cannot be told apart, so they are traced as a single
+    "extraction" span per page.
+    """
+    tracer = tracer or Tracer()
     http_tool = RequestsGetTool(
         requests_wrapper=requests_wrapper,
         description="Make HTTP GET requests to fetch web pages",
         allow_dangerous_requests=True,)
-    
-    parse_tool = ParsePageTool(llm)
-    
+
     tools = [http_tool, parse_tool]
     agent = initialize_agent(
         tools=tools,
@@ -37,57 +415,90 @@ def crawl_labcorp(start_url: str, progress_callback: Optional[Callable] = None):
         agent=AgentType.ZERO_SHOT_REACT_DESCRIPTION,
         verbose=False,
     )
-    
-    all_jobs = []
-    url = start_url
-    page_num = 1
-    max_retries = 3
-    
+
+    def crawl_page(url: str, page: int):
+        with tracer.span("navigation", page, channel="http") as span:
+            listing = fetch_listing(url)
+            span["source"] = "embedded-json" if listing is not None else "none"
+        if listing is not None:
+            # embedded search JSON: no browser, no LLM
+            jobs = [job.model_dump() for job in listing.jobs]
+            return jobs, next_page_url(url, listing.total, len(jobs)), listing.total
+        # the agent's HTTP tool hides the response, so only pace it
+        get_limiter().acquire(url)
+        with tracer.span("extraction", page, source="agent") as span:
+            html = agent.run(f"requests_get url={url}")
+            parse_result = agent.run(f"parse_page html={json.dumps(html)}")
+            data = json.loads(extract_json_text(parse_result))
+            span.update(bytes=len(html), jobs=len(data.get("jobs") or []))
+        if data.get("error"):
+            raise RetryableError(f"parse_page: {data['error']}")
+        return data.get("jobs", []), data.get("next_page"), data.get("total_jobs")
+
+    found = checkpoint.rows
+    url = checkpoint.next if checkpoint.completed else start_url
+    page_num = len(checkpoint.completed) + 1
+    total = checkpoint.total
+
     while url:
-        retry_count = 0
-        success = False
-        
-        while not success and retry_count < max_retries:
-            try:
-                html = agent.run(f"requests_get url={url}")
-                parse_result = agent.run(f"parse_page html={json.dumps(html)}")
-                if not parse_result.strip().startswith('{'):
-                    if '```json' in parse_result:
-                        parse_result = parse_result.split('```json')[1].split('```')[0].strip()
-                
-                data = json.loads(parse_result)
-                current_page_jobs = data.get("jobs", [])
-                all_jobs.extend(current_page_jobs)
-                if progress_callback:
-                    progress_callback(page_num, len(all_jobs))
-                next_page = data.get("next_page")
-                if next_page and next_page.startswith("/"):
-                    url = f"https://careers.labcorp.com{next_page}"
-                else:
-                    url = next_page
-    
-                page_num += 1
-                success = True
-                time.sleep(1)
-                
-            except Exception as e:
-                retry_count += 1
-                print(f"Error on page {page_num}: {str(e)}. Retrying {retry_count}/{max_retries}...")
-                time.sleep(2)
-                
-                if retry_count >= max_retries:
-                    print(f"Failed after {max_retries} retries on page {page_num}. Continuing to next page.")
-                    url = None
-    return all_jobs
+        try:
+            current_page_jobs, next_page, page_total = retry_call(
+                crawl_page, url, page_num, attempts=max_attempts, label=f"Page {page_num}: ")
+        except Exception as e:
+            print(f"Stopping at page {page_num}: {str(e)}")
+            return False
+        next_url = _absolute(next_page)
+        found += len(_write_page(tracer, page_num, checkpoint, url, next_url,
+                                 current_page_jobs, page_total, sink, enricher, ledger))
+        total = page_total if page_total is not None else total
+        if progress_callback:
+            progress_callback(page_num, found, total, tracer.summary())
+        url = next_url
+        page_num += 1
+    return True
 
 if __name__ == "__main__":
+    import sys
     from pprint import pprint
     
-    def print_progress(page, total):
-        print(f"Processed page {page}. Found {total} jobs so far...")
-    
-    start = "https://careers.labcorp.com/global/en/search-results?keywords=QA%20automation%20testing"
-    jobs = crawl_labcorp(start, print_progress)
+    def print_progress(page, found, total=None, metrics=None):
+        of = f" of {total}" if total is not None else ""
+        print(f"Processed page {page}. Found {found}{of} jobs so far...")
+
+    def flag_value(name: str) -> Optional[str]:
+        return sys.argv[sys.argv.index(name) + 1] if name in sys.argv else None
+
+    # --trace FILE appends every span as JSON lines; --metrics FILE writes the
+    # Prometheus text exposition when the crawl ends
+    tracer = Tracer("QA automation testing", trace_path=flag_value("--trace"))
+    metrics_path = flag_value("--metrics")
     
-    pprint(jobs[:3])
-    print(f"Total jobs fetched: {len(jobs)}")
\ No newline at end of file
+    if "--delta" in sys.argv:
+        delta = crawl_labcorp_delta("QA automation testing", progress_callback=print_progress,
+                                    tracer=tracer)
+        pprint(delta.added[:3])
+        print(f"Pages fetched: {delta.pages}. Added: {len(delta.added)}, "
+              f"removed: {len(delta.removed)}, unchanged: {len(delta.unchanged)}")
+    elif "--batch" in sys.argv:
+        from common.batch import BATCH_FIELDS, read_keywords
+        from common.sinks import open_sink
+        keyword_file = flag_value("--batch")
+        tracer.keyword = None                   # spans carry their own query
+        with open_sink("labcorp_batch.csv", BATCH_FIELDS) as out:
+            batch = crawl_labcorp_batch(
+                read_keywords(keyword_file), sink=out, tracer=tracer,
+                progress_callback=lambda kw, n, done: print(f"Query {kw!r}: {n} jobs ({done} done)"))
+        print(f"Unique jobs: {len(batch.jobs)} from {batch.pages} pages in {batch.seconds:.1f}s. "
+              f"Per query: {batch.per_keyword}")
+    else:
+        start = f"{SITE}/global/en/search-results?keywords=QA%20automation%20testing"
+        jobs = crawl_labcorp(start, print_progress, use_agent="--agent" in sys.argv,
+                             resume="--resume" in sys.argv, tracer=tracer,
+                             details="--details" in sys.argv)
+        pprint(jobs[:3])
+        print(f"Total jobs fetched: {len(jobs)}")
+
+    tracer.close()
+    if metrics_path:
+        tracer.write_prometheus(metrics_path)
+        print(f"Metrics written to {metrics_path}")
\ No newline at end of file
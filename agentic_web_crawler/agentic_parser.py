@@ -1,6 +1,10 @@
 from crew_config import build_crew
+from tools import shutdown_browser
 import sys, asyncio
 
 if __name__ == "__main__":
     keyword = " ".join(sys.argv[1:]) or input("Keyword: ")
-    asyncio.run(build_crew(keyword).run())
+    try:
+        asyncio.run(build_crew(keyword).run())
+    finally:
+        shutdown_browser()
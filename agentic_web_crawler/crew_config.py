@@ -1,7 +1,7 @@
 from crewai import Agent, Task, Crew
 from tools import one_page
 from pydantic import BaseModel, Field
-import pandas as pd
+from common.sinks import CsvSink
 
 class Job(BaseModel):
     title: str
@@ -42,9 +42,9 @@ def build_crew(keyword: str) -> Crew:
         context=[t1],
         output_schema=Job)
     def save_action(jobs):
-        df = pd.DataFrame([j.model_dump() for j in jobs])
-        df.to_csv("labcorp_jobs.csv", index=False)
-        return f"Saved {len(df)} rows to labcorp_jobs.csv"
+        with CsvSink("labcorp_jobs.csv") as sink:
+            sink.write_page(j.model_dump() for j in jobs)
+        return f"Saved {sink.count} rows to labcorp_jobs.csv"
     t3 = Task(
         description="Persist the cleaned jobs to CSV.",
         agent=orchestrator,
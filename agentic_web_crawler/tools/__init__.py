@@ -1,2 +1,12 @@
 # tools/__init__.py
+# Scripts here run from the project directory; expose the repo root so the
+# shared `common` package resolves. Appended, so local modules keep priority.
+import sys
+from pathlib import Path
+
+_REPO_ROOT = str(Path(__file__).resolve().parents[2])
+if _REPO_ROOT not in sys.path:
+    sys.path.append(_REPO_ROOT)
+
 from .labcorp_tool import one_page
+from common.browser_pool import shutdown_browser
@@ -1,31 +1,20 @@
 from typing import List, Dict
-from playwright.sync_api import sync_playwright
-from bs4 import BeautifulSoup
 import urllib.parse, math
 
+from common.browser_pool import get_pool
+from common.cards import parse_cards
+from common.listing import SITE, fetch_listing
+
 RESULTS_PER_PAGE = 20
-SELECTOR = '[data-ph-at-id="job-link"]'
 
 def one_page(keyword: str, offset: int) -> List[Dict]:
     """Return a list of job‑dicts from one Labcorp page."""
-    url = ("https://careers.labcorp.com/global/en/search-results"
+    url = (f"{SITE}/global/en/search-results"
            f"?keywords={urllib.parse.quote_plus(keyword)}&from={offset}&s=1")
 
-    with sync_playwright() as p:
-        page = p.chromium.launch(headless=True).new_page()
-        page.goto(url, wait_until="networkidle")
-        html = page.content()
+    listing = fetch_listing(url)      # embedded JSON over plain HTTP
+    if listing is not None:
+        return [job.model_dump() for job in listing.jobs]
 
-    soup = BeautifulSoup(html, "lxml")
-    jobs = []
-    for li in soup.select(SELECTOR):
-        a = li.find("a", {"data-ph-at-id": "job-link"})
-        jobs.append({
-            "title": a.get_text(strip=True),
-            "url":   "https://careers.labcorp.com" + a["href"],
-            "location": (loc := li.select_one('[data-ph-at-id="job-location"]')
-                         and loc.get_text(strip=True)) or "",
-            "category": (cat := li.select_one('[data-ph-at-id="job-category"]')
-                         and cat.get_text(strip=True)) or "",
-            "job_id": li.get("data-job-id") or a["href"].split("-")[-1]})
-    return jobs
\ No newline at end of file
+    html = get_pool().fetch(url)      # warm, process-wide Chromium
+    return parse_cards(html)
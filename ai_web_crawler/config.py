@@ -1,12 +1,25 @@
 # config.py
+import os
 
-BASE_URL = "https://careers.labcorp.com/global/en/search-results?keywords=CHAR_STRING&from=PAGE_NO&s=1"
-CSS_SELECTOR = '[data-ph-at-id="jobs-list-item"]'
+import utils                                      # puts the repo root on sys.path
+from common.cards import CARD_SELECTOR
+
+# LABCORP_SITE points the crawler at another host (e.g. the offline benchmark site)
+SITE = os.getenv("LABCORP_SITE", "https://careers.labcorp.com").rstrip("/")
+BASE_URL = SITE + "/global/en/search-results?keywords=CHAR_STRING&from=PAGE_NO&s=1"
+# The job-card selector is shared with the other crawlers (common/cards.py)
+CSS_SELECTOR = CARD_SELECTOR
 # CSS_SELECTOR = "li.jobs-list-item"  # CSS_SELECTOR = "[class^='jobs-list-item']"
 REQUIRED_KEYS = [
     "title",
     "location",
-    "role",
+    "category",
     "job_id",
     "url",
-]
\ No newline at end of file
+]
+# Max prompt tokens per LLM call; larger pages are pruned and split into chunks
+LLM_TOKEN_BUDGET = 6000
+# Raw page cache: "read-through", "write-only", "bypass" or "revalidate"
+# (override with --page-cache on the command line). Result pages are dynamic,
+# so the crawl goes to the site unless asked otherwise
+PAGE_CACHE_MODE = "bypass"
@@ -1,75 +1,179 @@
+import argparse
 import asyncio
+from collections import Counter
+from typing import Optional
 from crawl4ai import AsyncWebCrawler
 from dotenv import load_dotenv
-from config import BASE_URL, CSS_SELECTOR, REQUIRED_KEYS
-from utils.data_utils import save_jobs_to_csv
-from utils.scraper_utils import fetch_and_process_page, get_browser_config, get_llm_strategy
+from config import BASE_URL, CSS_SELECTOR, LLM_TOKEN_BUDGET, PAGE_CACHE_MODE, REQUIRED_KEYS
+from utils.scraper_utils import (fetch_and_process_page, get_browser_config, get_llm_strategy,
+                                 install_lean_hooks)
+from common.checkpoint import open_checkpoint
+from common.listing import RESULTS_PER_PAGE
+from common.page_cache import MODES, PageCache
+from common.pagination import PageLedger
+from common.rate_limit import get_limiter
+from common.retry import RetryableError, aretry_call
+from common.sinks import JOB_FIELDS, can_append, open_sink
+from common.tracing import Tracer
 
 load_dotenv()
 
-async def crawl_jobs():
+async def crawl_jobs(page_cache_mode: str = PAGE_CACHE_MODE, output: str = "complete_jobs.csv",
+                     resume: bool = False, trace: Optional[str] = None,
+                     metrics: Optional[str] = None, keyword: Optional[str] = None):
     """
     Main function to crawl job data from the website.
+
+    Result pages are walked by offset (``from=0,20,40...``). Jobs are
+    de-duplicated by canonical job id, and once the last page is reached only
+    the offsets that pagination drift may have hidden are fetched again
+    (common/pagination.py). A page that fails or yields no jobs is retried
+    with exponential backoff. If it still fails, the crawl stops and its
+    checkpoint is kept for a later resume.
+
+    Args:
+        page_cache_mode (str): How fetched pages use the on-disk page cache.
+        output (str): Results file; .csv, .jsonl or .parquet. Rows are
+            appended as each page finishes.
+        resume (bool): Continue an interrupted crawl for the same search from
+            its last completed page, appending to `output`.
+        trace (str): JSON-lines file that every per-stage span is appended to.
+        metrics (str): File for the Prometheus text exposition of the stage
+            metrics, written when the crawl ends.
+        keyword (str): The job search; asked for on stdin when not given.
     """
     # Initialize configurations
     browser_config = get_browser_config()
-    llm_strategy = get_llm_strategy()
+    llm_strategy = get_llm_strategy(LLM_TOKEN_BUDGET)
+    page_cache = PageCache(page_cache_mode)
+    fetch_counter = Counter()
+    subrequests = Counter()
     session_id = "job_crawl_session"
 
+    char_string = keyword or input("Enter the job you are searching for: ")
+
     # Initialize state variables
-    page_number = 20
-    all_jobs = []
-    seen_names = set()
-
-    char_string = input("Enter the job you are searching for: ")
-
-    # Start the web crawler context
-    # https://docs.crawl4ai.com/api/async-webcrawler/#asyncwebcrawler
-    async with AsyncWebCrawler(config=browser_config) as crawler:
-        while True:
-            print(BASE_URL.replace("CHAR_STRING", "%20".join(char_string.split())).replace("PAGE_NO", str(page_number)))
-            jobs, no_results_found = await fetch_and_process_page(
-                crawler,
-                page_number,
-                BASE_URL.replace("CHAR_STRING", "%20".join(char_string.split())).replace("PAGE_NO", str(page_number)),
-                CSS_SELECTOR,
-                llm_strategy,
-                session_id,
-                REQUIRED_KEYS,
-                seen_names,
-            )
-
-            if no_results_found:
-                print("No more jobs found. Ending crawl.")
-                break  # Stop crawling when "No Results Found" message appears
-
-            if not jobs:
-                print(f"No jobs extracted from page {page_number}.")
-                break  # Stop if no jobs are extracted
-
-            # Add the jobs from this page to the total list
-            all_jobs.extend(jobs)
-            page_number = page_number - 1  # Move to the next page
-
-            # Pause between requests to be polite and avoid rate limits
-            await asyncio.sleep(2)  # Adjust sleep time as needed
-
-    # Save the collected jobs to a CSV file
-    if all_jobs:
-        save_jobs_to_csv(all_jobs, "complete_jobs.csv")
-        print(f"Saved {len(all_jobs)} jobs to 'complete_jobs.csv'.")
+    checkpoint = open_checkpoint("crawl4ai", " ".join(char_string.split()), resume,
+                                 keep_jobs=False)
+    offset = checkpoint.next if checkpoint.completed else 0
+    sink = open_sink(output, fields=JOB_FIELDS, append=bool(checkpoint.completed))
+    ledger = PageLedger(RESULTS_PER_PAGE, seen=checkpoint.seen)
+    tracer = Tracer(" ".join(char_string.split()), trace_path=trace)
+
+    def page_url(offset):
+        return BASE_URL.replace("CHAR_STRING", "%20".join(char_string.split())).replace("PAGE_NO", str(offset))
+
+    async def crawl_page(crawler, offset, repair=False):
+        page_number = offset // RESULTS_PER_PAGE + 1
+        fetched = ledger.fetched
+        jobs, no_results_found = await fetch_and_process_page(
+            crawler,
+            page_number,
+            page_url(offset),
+            CSS_SELECTOR,
+            llm_strategy,
+            session_id,
+            REQUIRED_KEYS,
+            ledger,
+            page_cache,
+            fetch_counter,
+            tracer,
+            repair,
+        )
+        # a page whose jobs were all seen before still counts as read
+        if not no_results_found and ledger.fetched == fetched:
+            raise RetryableError(f"No jobs extracted from page {page_number}")
+        return jobs, no_results_found
+
+    def save_page(offset, jobs, next_offset):
+        page_number = offset // RESULTS_PER_PAGE + 1
+        # Write this page's jobs out straight away
+        with tracer.span("write", page_number, jobs=len(jobs)):
+            sink.write_page(jobs)
+        with tracer.span("checkpoint", page_number):
+            checkpoint.page_done(offset, next_offset, jobs)
+
+    async def repair_drift(crawler):
+        for repair_offset in ledger.repair_offsets():
+            try:
+                jobs, _ = await aretry_call(crawl_page, crawler, repair_offset, True,
+                                            label=f"Offset {repair_offset}: ")
+            except Exception as e:
+                print(f"Could not refetch offset {repair_offset}: {e}")
+                continue
+            save_page(repair_offset, jobs, offset)
+
+    with sink:
+        # Start the web crawler context
+        # https://docs.crawl4ai.com/api/async-webcrawler/#asyncwebcrawler
+        async with AsyncWebCrawler(config=browser_config) as crawler:
+            # skip images, fonts, styles and analytics; pages are ready once cards show
+            install_lean_hooks(crawler, counter=subrequests)
+            while True:
+                page_number = offset // RESULTS_PER_PAGE + 1
+                print(page_url(offset))
+                try:
+                    jobs, no_results_found = await aretry_call(
+                        crawl_page, crawler, offset, label=f"Page {page_number}: ")
+                except Exception as e:
+                    print(f"Giving up on page {page_number}: {e}. Progress is saved; "
+                          f"run again with --resume to continue from this page.")
+                    break
+
+                if no_results_found:
+                    print("No more jobs found. Ending crawl.")
+                    # postings added or removed mid-crawl: refetch only what they hid
+                    await repair_drift(crawler)
+                    checkpoint.finish()
+                    break  # Stop crawling when "No Results Found" message appears
+
+                save_page(offset, jobs, offset + RESULTS_PER_PAGE)
+                offset += RESULTS_PER_PAGE  # Move to the next page
+                # Politeness is handled per request by the shared rate limiter
+    checkpoint.close()
+
+    if sink.count:
+        print(f"Saved {sink.count} jobs to '{output}'.")
     else:
         print("No jobs were found during the crawl.")
 
     # Display usage statistics for the LLM strategy
     llm_strategy.show_usage()
+    if llm_strategy.cache is not None:
+        print(f"LLM cache: {llm_strategy.cache.stats()}")
+    print(f"Page cache: {page_cache.stats()}")
+    print(f"Fetches: {dict(fetch_counter)}")
+    print(f"Pagination: {ledger.stats()}")
+    if subrequests:
+        print(f"Browser subrequests: {dict(subrequests)}")
+    print(f"Rate limiter: {get_limiter().stats()}")
+    print(tracer.format_summary())
+    tracer.close()
+    if metrics:
+        tracer.write_prometheus(metrics)
+        print(f"Metrics written to {metrics}")
 
 
 async def main():
     """
     Entry point of the script.
     """
-    await crawl_jobs()
+    parser = argparse.ArgumentParser(description="Crawl LabCorp job listings.")
+    parser.add_argument("--page-cache", choices=MODES, default=PAGE_CACHE_MODE,
+                        help=f"page cache mode (default: {PAGE_CACHE_MODE})")
+    parser.add_argument("--output", default="complete_jobs.csv",
+                        help="results file: .csv, .jsonl or .parquet (default: complete_jobs.csv)")
+    parser.add_argument("--resume", action="store_true",
+                        help="continue the last interrupted crawl for the same search")
+    parser.add_argument("--trace", metavar="FILE",
+                        help="append a JSON line per stage span (navigation, extraction, llm, ...)")
+    parser.add_argument("--metrics", metavar="FILE",
+                        help="write the stage metrics in Prometheus text format at the end")
+    args = parser.parse_args()
+    if args.resume and not can_append(args.output):
+        parser.error(f"--resume appends to --output, and {args.output} can't be appended to; "
+                     f"use a .csv or .jsonl file")
+    await crawl_jobs(args.page_cache, args.output, args.resume, args.trace, args.metrics)
 
 
 if __name__ == "__main__":
@@ -1,100 +1,251 @@
-import asyncio, csv, math, urllib.parse, re, itertools
-from typing import List, Dict
+import asyncio, math, urllib.parse, sys, time
+from typing import List, Dict, Optional, Tuple
 
+from collections import Counter
 from playwright.async_api import async_playwright
-from bs4 import BeautifulSoup
+from playwright.async_api import TimeoutError as PlaywrightTimeoutError
+
+import utils                                      # puts the repo root on sys.path
+from common.cards import extract_page
+from common.columns import JobColumns
+from common.listing import SITE, fetch_listing
+from common.navigation import LEAN_PROFILE, NavProfile, async_route_handler
+from common.pagination import PageLedger
+from common.rate_limit import get_limiter
+from common.sinks import CsvSink, JobSink
+from common.tracing import Tracer
 
 RESULTS_PER_PAGE = 20
-SELECTOR_CARD    = '[data-ph-at-id="job-link"]'   # every job <li> has this
+DEFAULT_WORKERS  = 4                              # pages fetched in parallel
 
 def build_url(query: str, offset: int) -> str:
     encoded = urllib.parse.quote_plus(query)
-    return (f"https://careers.labcorp.com/global/en/"
+    return (f"{SITE}/global/en/"
             f"search-results?keywords={encoded}&from={offset}&s=1")
 
-def parse_cards(html: str) -> List[Dict]:
-    """Extract fields from the HTML of one results page."""
-    soup  = BeautifulSoup(html, "lxml")
-    cards = soup.select(SELECTOR_CARD)
-    jobs  = []
-    for li in cards:
-        a_tag = li.find("a", {"data-ph-at-id": "job-link"})
-        if not a_tag:
-            continue
-        title = a_tag.get_text(strip=True)
-        url   = "https://careers.labcorp.com" + a_tag["href"]
-
-        # the site embeds these bits in spans; fall back to empty string
-        location  = li.select_one('[data-ph-at-id="job-location"]')
-        category  = li.select_one('[data-ph-at-id="job-category"]')
-        job_id    = li.get("data-job-id") or url.split("-")[-1]
-
-        jobs.append(
-            dict(
-                title     = title,
-                location  = location.get_text(strip=True) if location else "",
-                category  = category.get_text(strip=True) if category else "",
-                job_id    = job_id,
-                url       = url,
-            )
-        )
-    return jobs
+class PagePool:
+    """Up to `size` browser pages, launched lazily the first time one is needed.
+
+    `slots` bounds how many offsets are in flight, whichever path serves them.
+    Contexts use the lean navigation `profile`; `requests` counts the blocked
+    and allowed subrequests.
+    """
+    def __init__(self, playwright, size: int, profile: NavProfile = LEAN_PROFILE):
+        self.playwright = playwright
+        self.size       = size
+        self.profile    = profile
+        self.requests   = Counter()
+        self.slots      = asyncio.Semaphore(size)
+        self.browser    = None
+        self._free: asyncio.Queue = asyncio.Queue()
+        self._created   = 0
+        self._lock      = asyncio.Lock()
+
+    async def get(self):
+        async with self._lock:
+            if self._free.empty() and self._created < self.size:
+                if self.browser is None:
+                    self.browser = await self.playwright.chromium.launch(headless=True)
+                context = await self.browser.new_context()
+                if self.profile.lean:
+                    await context.route("**/*", async_route_handler(self.profile, self.requests))
+                self._created += 1
+                return await context.new_page()
+        return await self._free.get()
+
+    def put(self, page) -> None:
+        self._free.put_nowait(page)
+
+    async def close(self) -> None:
+        if self.browser is not None:
+            await self.browser.close()
+
+async def wait_ready(page, profile: NavProfile, url: str) -> None:
+    """Waits until the page can be parsed; a timeout leaves it as loaded."""
+    if not profile.lean:
+        await page.wait_for_load_state("networkidle")
+        return
+    try:
+        await page.wait_for_selector(profile.ready_selector, state="attached",
+                                     timeout=profile.timeout_ms)
+    except PlaywrightTimeoutError:
+        print(f"{url}: no job cards or no-results marker after "
+              f"{profile.ready_timeout:.0f}s; using the page as loaded")
+
+async def fetch_page(pool: PagePool, keyword: str, offset: int,
+                     tracer: Optional[Tracer] = None) -> Tuple[List[Dict], Optional[int]]:
+    """Jobs and reported total for one offset.
+
+    Tries the embedded search JSON over plain HTTP first and only renders the
+    page in Chromium when that JSON is missing. Both paths are paced by the
+    shared per-host rate limiter. A render is traced as "navigation" (until the
+    DOM is loaded) plus "render_wait": until a job card or the no-results
+    marker appears with the lean profile, until the network is idle otherwise.
+    """
+    url = build_url(keyword, offset)
+    tracer = tracer or Tracer(keyword)
+    page_no = offset // RESULTS_PER_PAGE + 1
+    async with pool.slots:
+        print(f"Fetching offset {offset}")
+        with tracer.span("navigation", page_no, channel="http") as span:
+            listing = await asyncio.to_thread(fetch_listing, url)
+            span["source"] = "embedded-json" if listing is not None else "none"
+        if listing is not None:
+            page_jobs = [job.model_dump() for job in listing.jobs]
+            total     = listing.total
+        else:
+            limiter = get_limiter()
+            await limiter.aacquire(url)
+            page = await pool.get()
+            started = time.monotonic()
+            try:
+                with tracer.span("navigation", page_no, channel="browser") as span:
+                    response = await page.goto(url, wait_until="domcontentloaded")
+                    span["status"] = response.status if response else None
+                with tracer.span("render_wait", page_no):
+                    await wait_ready(page, pool.profile, url)
+                html = await page.content()
+            except Exception:
+                limiter.record(url, None, time.monotonic() - started, channel="browser")
+                raise
+            finally:
+                pool.put(page)
+            limiter.record(url, response.status if response else 200,
+                           time.monotonic() - started,
+                           response.headers.get("retry-after") if response else None,
+                           channel="browser")
+            with tracer.span("extraction", page_no, source="selectors", bytes=len(html)) as span:
+                parsed    = extract_page(html)
+                page_jobs = parsed["jobs"]
+                total     = parsed["total_jobs"]
+                span["jobs"] = len(page_jobs)
+    return page_jobs, total
+
+async def scrape(keyword: str, workers: int = DEFAULT_WORKERS,
+                 sink: Optional[JobSink] = None,
+                 tracer: Optional[Tracer] = None) -> JobColumns:
+    """Crawl every results page for `keyword`.
+
+    Rows are collected in a compact JobColumns table (a sequence of dicts).
+    With a `sink`, each page's rows are streamed to it as soon as the page (and
+    every page before it) is done, and the returned table stays empty. Per-stage
+    spans go to `tracer`, whose summary is printed at the end.
+
+    Up to `workers` pages are in flight at once. A page that raises does not
+    stop the others: it is reported, retried once after the walk, and skipped
+    if it fails again, so the rows already written stay valid.
+
+    Jobs are de-duplicated by canonical job id. Pages fetched in parallel see
+    the result list at slightly different moments, so once every page is in,
+    the offsets that postings added or removed meanwhile may have hidden are
+    fetched again (common/pagination.py); their rows are emitted last.
+    """
+    jobs = JobColumns()
+    tracer = tracer or Tracer(keyword)
+    ledger = PageLedger(RESULTS_PER_PAGE)
+    found = 0
 
-async def scrape(keyword: str) -> List[Dict]:
-    jobs: List[Dict] = []
+    def emit(page: int, rows: List[Dict]) -> None:
+        with tracer.span("write", page, jobs=len(rows)):
+            (sink.write_page if sink is not None else jobs.extend)(rows)
+
+    async def fetch_timed(offset: int) -> Tuple[List[Dict], Optional[int], float]:
+        # pages are recorded in offset order; the ledger needs the order they arrived in
+        page_jobs, total = await fetch_page(pool, keyword, offset, tracer)
+        return page_jobs, total, time.monotonic()
+
+    workers = max(workers, 1)
     async with async_playwright() as p:
-        browser = await p.chromium.launch(headless=True)
-        page    = await browser.new_page()
+        pool = PagePool(p, workers)
 
         # ── first page ────────────────────────────────────────────────────────
-        offset = 0
-        url    = build_url(keyword, offset)
-        await page.goto(url, wait_until="networkidle")
-        html   = await page.content()
-        jobs.extend(parse_cards(html))
+        first_jobs, total_results = await fetch_page(pool, keyword, 0, tracer)
+        first_jobs = ledger.add(0, first_jobs, total_results)
+        emit(1, first_jobs)
+        found += len(first_jobs)
 
         # ── figure out how many pages we actually have ───────────────────────
-        # Look for “Showing 262 results” anywhere in the HTML
-        match  = re.search(r"Showing\s+(\d+)\s+results", html, re.I)
-        if match:
-            total_results = int(match.group(1))
+        if total_results is not None:
             pages = math.ceil(total_results / RESULTS_PER_PAGE)
         else:
-            # Fallback: we don't know the total → we'll iterate until empty
+            # Fallback: we don't know the total → we'll probe until empty
             pages = math.inf
 
-        print(f"Initial page returned {len(jobs)} jobs. Total pages: {pages}")
-
-        # ── subsequent pages ─────────────────────────────────────────────────
-        for page_idx in itertools.count(1):          # 1,2,3,… until break
-            if page_idx >= pages:
-                break
+        print(f"Initial page returned {found} jobs. Total pages: {pages}")
 
-            offset = page_idx * RESULTS_PER_PAGE
-            url    = build_url(keyword, offset)
-            print(f"Fetching offset {offset}")
+        # ── subsequent pages: a sliding window of `workers` pages ────────────
+        # Pages finish in any order; each is written as soon as it and every
+        # page before it are in, so at most `workers` results wait in memory.
+        # A page that fails is reported and skipped, and tried once more below.
+        pending: Dict[int, asyncio.Task] = {}
+        failed: List[int] = []
+        next_fetch = next_emit = 1
+        failures_in_row = 0
+        try:
+            while next_emit < pages:
+                while next_fetch < pages and next_fetch < next_emit + workers:
+                    pending[next_fetch] = asyncio.create_task(
+                        fetch_timed(next_fetch * RESULTS_PER_PAGE))
+                    next_fetch += 1
+                await asyncio.wait(pending.values(), return_when=asyncio.FIRST_COMPLETED)
+                while next_emit in pending and pending[next_emit].done():
+                    i = next_emit
+                    next_emit += 1
+                    try:
+                        page_jobs, total, fetched_at = pending.pop(i).result()
+                    except Exception as e:
+                        print(f"Offset {i * RESULTS_PER_PAGE} failed: {e}")
+                        failed.append(i)
+                        failures_in_row += 1
+                        if pages == math.inf and failures_in_row >= workers:
+                            pages = next_emit    # unknown total and nothing coming back
+                            break
+                        continue
+                    failures_in_row = 0
+                    new_jobs = ledger.add(i * RESULTS_PER_PAGE, page_jobs, total,
+                                          fetched_at=fetched_at)
+                    if not page_jobs:            # empty page ⇒ we're done
+                        pages = next_emit
+                        break
+                    emit(i + 1, new_jobs)
+                    found += len(new_jobs)
+        finally:
+            for task in pending.values():
+                task.cancel()
 
-            await page.goto(url, wait_until="networkidle")
-            html = await page.content()
-            page_jobs = parse_cards(html)
+        # ── pages that failed above get one more try ─────────────────────────
+        for i in failed:
+            if i >= pages:
+                continue
+            try:
+                page_jobs, total = await fetch_page(pool, keyword, i * RESULTS_PER_PAGE, tracer)
+            except Exception as e:
+                print(f"Offset {i * RESULTS_PER_PAGE} failed again, skipping it: {e}")
+                continue
+            new_jobs = ledger.add(i * RESULTS_PER_PAGE, page_jobs, total)
+            emit(i + 1, new_jobs)
+            found += len(new_jobs)
 
-            if not page_jobs:        # empty page ⇒ we're done
-                break
+        # ── drift repair: only the offsets shifted postings may have hidden ──
+        for offset in ledger.repair_offsets():
+            page_jobs, total = await fetch_page(pool, keyword, offset, tracer)
+            new_jobs = ledger.add(offset, page_jobs, total, repair=True)
+            emit(offset // RESULTS_PER_PAGE + 1, new_jobs)
+            found += len(new_jobs)
 
-            jobs.extend(page_jobs)
-            await asyncio.sleep(1.5)
-
-        await browser.close()
+        await pool.close()
+        if pool.requests:
+            print(f"Browser subrequests: {dict(pool.requests)}")
+    print(f"Pagination: {ledger.stats()}")
+    print(tracer.format_summary())
     return jobs
 
 def save_csv(rows: List[Dict], filename: str) -> None:
     if not rows:
         print("No jobs captured.")
         return
-    with open(filename, "w", newline="", encoding="utf-8") as f:
-        writer = csv.DictWriter(f, fieldnames=rows[0].keys())
-        writer.writeheader()
-        writer.writerows(rows)
+    with CsvSink(filename, fields=rows[0].keys()) as sink:
+        sink.write_page(rows)
     print(f"Saved {len(rows)} rows to {filename}")
 
 if __name__ == "__main__":
@@ -103,5 +254,10 @@ if __name__ == "__main__":
         print("Keyword required.")
         exit(1)
 
-    data = asyncio.run(scrape(kw))
-    save_csv(data, "labcorp_jobs.csv")
+    workers = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_WORKERS
+    with CsvSink("labcorp_jobs.csv") as sink:     # rows land on disk page by page
+        asyncio.run(scrape(kw, workers, sink=sink))
+    if sink.count:
+        print(f"Saved {sink.count} rows to labcorp_jobs.csv")
+    else:
+        print("No jobs captured.")
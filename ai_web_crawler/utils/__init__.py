@@ -0,0 +1,9 @@
+# utils/__init__.py
+# Scripts here run from this directory; expose the repo root so the shared
+# `common` package resolves. Appended, so local modules keep priority.
+import sys
+from pathlib import Path
+
+_REPO_ROOT = str(Path(__file__).resolve().parents[2])
+if _REPO_ROOT not in sys.path:
+    sys.path.append(_REPO_ROOT)
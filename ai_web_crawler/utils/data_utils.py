@@ -1,5 +1,4 @@
-import csv
-from models.job import Job
+from common.sinks import JOB_FIELDS, CsvSink
 
 
 def is_duplicate_venue(job_id: str, seen_ids: set) -> bool:
@@ -15,10 +14,6 @@ def save_jobs_to_csv(jobs: list, filename: str):
         print("No jobs to save.")
         return
 
-    fieldnames = Job.model_fields.keys()
-
-    with open(filename, mode="w", newline="", encoding="utf-8") as file:
-        writer = csv.DictWriter(file, fieldnames=fieldnames)
-        writer.writeheader()
-        writer.writerows(jobs)
+    with CsvSink(filename, JOB_FIELDS) as sink:
+        sink.write_page(jobs)
     print(f"Saved {len(jobs)} jobs to '{filename}'.")
\ No newline at end of file
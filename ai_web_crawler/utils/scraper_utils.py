@@ -1,14 +1,25 @@
-import json, os
-from typing import List, Set, Tuple
+import asyncio, json, os, time
+from collections import Counter
+from typing import List, Optional, Tuple
 
+import requests
 from crawl4ai import (
     AsyncWebCrawler,
     BrowserConfig,
     CacheMode,
     CrawlerRunConfig,
     LLMExtractionStrategy,)
+from common.cards import parse_total
+from common.listing import ListingPage, fetch_html, offset_of, parse_listing
+from common.llm_cache import LLMCache, get_cache, make_key
+from common.navigation import LEAN_PROFILE, NavProfile, async_route_handler
+from common.page_cache import PageCache
+from common.pagination import PageLedger
+from common.rate_limit import get_limiter
+from common.prune import LLM_TOKEN_BUDGET, prepare_for_llm
+from common.tracing import Tracer
 from models.job import Job
-from utils.data_utils import is_complete_venue, is_duplicate_venue
+from utils.data_utils import is_complete_venue
 
 
 def get_browser_config() -> BrowserConfig:
@@ -25,15 +36,110 @@ def get_browser_config() -> BrowserConfig:
         verbose=True,)
 
 
-def get_llm_strategy() -> LLMExtractionStrategy:
+def install_lean_hooks(crawler: AsyncWebCrawler, profile: NavProfile = LEAN_PROFILE,
+                       counter: Optional[Counter] = None) -> None:
+    """
+    Makes every browser context the crawler creates abort the requests the
+    lean navigation profile blocks (images, fonts, stylesheets, analytics),
+    via crawl4ai's ``on_page_context_created`` hook.
+
+    Args:
+        crawler (AsyncWebCrawler): The crawler to hook.
+        profile (NavProfile): What to block; nothing is hooked when not lean.
+        counter (Optional[Counter]): Tallies "blocked" and "allowed" requests.
+    """
+    if not profile.lean:
+        return
+    handler = async_route_handler(profile, counter)
+
+    async def on_page_context_created(page, context=None, **kwargs):
+        await (context or page).route("**/*", handler)
+        return page
+
+    crawler.crawler_strategy.set_hook("on_page_context_created", on_page_context_created)
+
+
+def get_run_config(css_selector: str, session_id: str,
+                   profile: NavProfile = LEAN_PROFILE) -> CrawlerRunConfig:
+    """
+    Run configuration for one results page.
+
+    With the lean profile the page counts as loaded once a job card or the
+    no-results marker is present (or `profile.ready_timeout` passes) rather
+    than at network idle.
+
+    Args:
+        css_selector (str): Selector the content is scoped to.
+        session_id (str): Browser session to reuse.
+        profile (NavProfile): Navigation profile.
+
+    Returns:
+        CrawlerRunConfig: The per-page settings.
+    """
+    readiness = ({"wait_until": "domcontentloaded",
+                  "wait_for": f"css:{profile.ready_selector}",
+                  "page_timeout": int(profile.timeout_ms)}
+                 if profile.lean else {"wait_until": "networkidle"})
+    return CrawlerRunConfig(
+        cache_mode=CacheMode.BYPASS,
+        css_selector=css_selector,
+        session_id=session_id,
+        **readiness,)
+
+
+class PrunedLLMExtractionStrategy(LLMExtractionStrategy):
+    """
+    LLMExtractionStrategy that prunes the page to the job-list subtree and
+    re-chunks it to a token budget before any LLM call.
+    """
+
+    def __init__(self, *args, token_budget: int = LLM_TOKEN_BUDGET,
+                 cache: Optional[LLMCache] = None, **kwargs):
+        super().__init__(*args, chunk_token_threshold=token_budget, **kwargs)
+        self.token_budget = token_budget
+        self.cache = cache
+
+    def run(self, url: str, sections: List[str]) -> List[dict]:
+        chunks = prepare_for_llm("\n".join(sections), self.token_budget, f"{url} ")
+        key = make_key("\n".join(chunks), self.instruction, self.provider,
+                       json.dumps(self.schema, sort_keys=True))
+        if self.cache is not None:
+            cached = self.cache.get(key)
+            if cached is not None:
+                print(f"{url} LLM cache hit ({len(cached)} items)")
+                return cached
+        extracted = super().run(url, chunks)
+
+        # Cards never span chunks, but the model may repeat one; keep the first.
+        unique, seen = [], set()
+        for item in extracted:
+            item_key = item.get("job_id") or item.get("url")
+            if item_key is not None:
+                if item_key in seen:
+                    continue
+                seen.add(item_key)
+            unique.append(item)
+        if self.cache is not None and unique and not any(item.get("error") for item in unique):
+            self.cache.set(key, unique)
+        return unique
+
+
+def get_llm_strategy(
+    token_budget: int = LLM_TOKEN_BUDGET,
+    use_cache: bool = True,
+) -> LLMExtractionStrategy:
     """
     Returns the configuration for the language model extraction strategy.
 
+    Args:
+        token_budget (int): Maximum prompt tokens per LLM call.
+        use_cache (bool): Serve repeated pages from the on-disk LLM cache.
+
     Returns:
         LLMExtractionStrategy: The settings for how to extract data using LLM.
     """
     # https://docs.crawl4ai.com/api/strategies/#llmextractionstrategy
-    return LLMExtractionStrategy(
+    return PrunedLLMExtractionStrategy(
         provider="groq/deepseek-r1-distill-llama-70b",
         api_token=os.getenv("GROQ_API_KEY"),
         schema=Job.model_json_schema(),
@@ -42,42 +148,115 @@ def get_llm_strategy() -> LLMExtractionStrategy:
             "Extract all job objects with keys "
             "'title', 'location', 'category', 'job_id', 'url', and 'snippet' "
             "from the following HTML."),
-        input_format="markdown", verbose=True,)
+        input_format="html", token_budget=token_budget,
+        cache=get_cache() if use_cache else None, verbose=True,)
 
 
-async def check_no_results(
+async def fetch_page(
     crawler: AsyncWebCrawler,
     url: str,
-    session_id: str,
-) -> bool:
+    config: CrawlerRunConfig,
+    page_cache: Optional[PageCache] = None,
+    fetch_counter: Optional[Counter] = None,
+    cached_html: Optional[str] = None,
+):
     """
-    Checks if the "No Results Found" message is present on the page.
+    Runs the crawler on a URL through the page cache.
+
+    A cached page is replayed with crawl4ai's ``raw:`` input, so extraction
+    still runs but no browser navigation happens. crawl4ai's own cache stays
+    bypassed; the page cache decides what is fresh. Browser navigations wait
+    for the shared per-host rate limiter and report their status back to it.
 
     Args:
         crawler (AsyncWebCrawler): The web crawler instance.
-        url (str): The URL to check.
-        session_id (str): The session identifier.
+        url (str): The URL to fetch.
+        config (CrawlerRunConfig): Run configuration for this fetch.
+        page_cache (Optional[PageCache]): Cache to read/write, per its mode.
+        fetch_counter (Optional[Counter]): Tallies "browser" navigations and
+            "cache" replays for the crawl.
+        cached_html (Optional[str]): HTML the caller already got from
+            `page_cache` for this URL; replayed without a second lookup.
+
+    Returns:
+        CrawlResult: The crawl4ai result.
+    """
+    counter = fetch_counter if fetch_counter is not None else Counter()
+    html = cached_html
+    if html is None and page_cache is not None:
+        html = await asyncio.to_thread(page_cache.lookup, url)
+    if html is not None:
+        counter["cache"] += 1
+        return await crawler.arun(url=f"raw:{html}", config=config)
+
+    counter["browser"] += 1
+    limiter = get_limiter()
+    await limiter.aacquire(url)
+    started = time.monotonic()
+    result = await crawler.arun(url=url, config=config)
+    limiter.record(url, result.status_code, time.monotonic() - started,
+                   (result.response_headers or {}).get("retry-after"), channel="browser")
+    if page_cache is not None and result.success:
+        await asyncio.to_thread(page_cache.store, url, result.html, result.response_headers)
+    return result
+
+
+def fetch_listing_cached(
+    url: str,
+    page_cache: Optional[PageCache] = None,
+) -> Tuple[Optional[ListingPage], Optional[str]]:
+    """
+    The fast path through the page cache: the embedded job list for `url`.
+
+    A cached copy is used when the cache mode serves one. Otherwise the page is
+    fetched over plain HTTP and stored, with its response headers, if it
+    carries the embedded JSON. Pages without it are left for the browser path
+    to store, so a rendered page in the cache is not overwritten by its source.
+
+    Args:
+        url (str): The search-results URL.
+        page_cache (Optional[PageCache]): Cache to read/write, per its mode.
+
+    Returns:
+        Tuple[Optional[ListingPage], Optional[str]]:
+            - The parsed page, or None when the fast path can't serve it.
+            - The cached HTML, when the cache served the URL; a cached page
+              without the JSON is a rendered one for the browser path to replay.
+    """
+    cached = page_cache.lookup(url) if page_cache is not None else None
+    if cached is not None:
+        return parse_listing(cached), cached
+    try:
+        response = fetch_html(url)
+    except requests.RequestException as e:
+        print(f"Fast path failed for {url}: {e}")
+        return None, None
+    listing = parse_listing(response.text)
+    if listing is not None and page_cache is not None:
+        page_cache.store(url, response.text, response.headers)
+    return listing, None
+
+
+def check_no_results(result) -> bool:
+    """
+    Checks if the "No Results Found" message is present on a fetched page.
+
+    Args:
+        result (CrawlResult): The crawl result; its raw ``html`` is searched,
+            so the check works even when the run was CSS-scoped.
 
     Returns:
         bool: True if "No Results Found" message is found, False otherwise.
     """
-    result = await crawler.arun(
-        url=url,
-        config=CrawlerRunConfig(
-            cache_mode=CacheMode.BYPASS,
-            session_id=session_id,
-        ),
-    )
+    return bool(result.success and "No Results Found" in (result.html or ""))
 
-    if result.success:
-        if "No Results Found" in result.cleaned_html:
-            return True
-    else:
-        print(
-            f"Error fetching page for 'No Results Found' check: {result.error_message}"
-        )
 
-    return False
+def _llm_totals(strategy) -> Tuple[int, int, int]:
+    """Calls, prompt tokens and completion tokens the strategy has used so far."""
+    usage = getattr(strategy, "total_usage", None)
+    return (len(getattr(strategy, "usages", None) or ()),
+            getattr(usage, "prompt_tokens", 0) or 0,
+            getattr(usage, "completion_tokens", 0) or 0)
 
 
 async def fetch_and_process_page(
@@ -88,11 +267,20 @@ async def fetch_and_process_page(
     llm_strategy: LLMExtractionStrategy,
     session_id: str,
     required_keys: List[str],
-    seen_names: Set[str],
+    ledger: PageLedger,
+    page_cache: Optional[PageCache] = None,
+    fetch_counter: Optional[Counter] = None,
+    tracer: Optional[Tracer] = None,
+    repair: bool = False,
 ) -> Tuple[List[dict], bool]:
     """
     Fetches and processes a single page of venue data.
 
+    The page is navigated once: the same result serves the "No Results Found"
+    check, the CSS-scoped content and the LLM extraction. Every page that was
+    read, even one whose jobs were all seen before, is recorded in `ledger`
+    with the total the site reported, so pagination drift can be repaired.
+
     Args:
         crawler (AsyncWebCrawler): The web crawler instance.
         page_number (int): The page number to fetch.
@@ -101,33 +289,85 @@ async def fetch_and_process_page(
         llm_strategy (LLMExtractionStrategy): The LLM extraction strategy.
         session_id (str): The session identifier.
         required_keys (List[str]): List of required keys in the venue data.
-        seen_names (Set[str]): Set of venue names that have already been seen.
+        ledger (PageLedger): Pages read so far; drops jobs already seen
+            (by canonical job id).
+        page_cache (Optional[PageCache]): Page cache to go through.
+        fetch_counter (Optional[Counter]): Per-crawl tally of "http", "browser"
+            and "cache" fetches.
+        tracer (Optional[Tracer]): Receives navigation, extraction, llm and
+            dedup spans for the page.
+        repair (bool): The page is refetched to repair drift
+            (PageLedger.repair_offsets).
 
     Returns:
         Tuple[List[dict], bool]:
-            - List[dict]: A list of processed venues from the page.
+            - List[dict]: The page's venues not seen before.
             - bool: A flag indicating if the "No Results Found" message was encountered.
     """
     url = base_url
-    no_results = await check_no_results(crawler, url, session_id)
-    if no_results:
-        return [], True
+    offset = offset_of(url)
+    counter = fetch_counter if fetch_counter is not None else Counter()
+    tracer = tracer or Tracer()
+
+    # Fast path: the results page embeds its job list as JSON, so a plain HTTP
+    # fetch is enough. Only render with the browser + LLM when it is missing.
+    # Both paths go through the page cache.
+    with tracer.span("navigation", page_number, channel="http") as span:
+        listing, cached_html = await asyncio.to_thread(fetch_listing_cached, url, page_cache)
+        span["source"] = "embedded-json" if listing is not None else "none"
+        if cached_html is not None:
+            span["channel"] = "cache"
+    if cached_html is None:
+        counter["http"] += 1
+    elif listing is not None:
+        counter["cache"] += 1
+    if listing is not None:
+        page_jobs = [job.model_dump() for job in listing.jobs]
+        with tracer.span("dedup", page_number) as span:
+            jobs = ledger.add(offset, page_jobs, listing.total, repair=repair)
+            span.update(jobs=len(jobs), duplicates=len(page_jobs) - len(jobs))
+        if not page_jobs:
+            return [], True
+        print(f"Extracted {len(jobs)} jobs from page {page_number} (embedded JSON).")
+        return jobs, False
 
-    result = await crawler.arun(
-        url=url,
-        config=CrawlerRunConfig(
-            cache_mode=CacheMode.BYPASS,
-            extraction_strategy=llm_strategy,
-            css_selector=css_selector,
-            session_id=session_id,),)
+    browser_fetches = counter["browser"]
+    with tracer.span("navigation", page_number) as span:
+        result = await fetch_page(
+            crawler,
+            url,
+            get_run_config(css_selector, session_id),
+            page_cache,
+            counter,
+            cached_html,)
+        span.update(channel="browser" if counter["browser"] > browser_fetches else "cache",
+                    bytes=len(result.html or ""), status=result.status_code)
 
-    if not (result.success and result.extracted_content):
+    if not result.success:
         print(f"Error fetching page {page_number}: {result.error_message}")
         return [], False
 
-    extracted_data = json.loads(result.extracted_content)
+    if check_no_results(result):
+        return [], True
+
+    # Extract from the page we already have instead of navigating again.
+    before = _llm_totals(llm_strategy)
+    started = time.perf_counter()
+    with tracer.span("extraction", page_number, source="llm") as span:
+        extracted_data = await asyncio.to_thread(llm_strategy.run, url, [result.html])
+        span["jobs"] = len(extracted_data or [])
+    calls, prompt_tokens, completion_tokens = (
+        now - then for now, then in zip(_llm_totals(llm_strategy), before))
+    if calls:
+        # crawl4ai reports tokens but not call timings; the extraction time stands in
+        tracer.record("llm", time.perf_counter() - started, page_number, calls=calls,
+                      prompt_tokens=prompt_tokens, completion_tokens=completion_tokens)
+    if not extracted_data:
+        print(f"Error extracting page {page_number}: no data returned")
+        return [], False
+
     print("Extracted data:", extracted_data)
-    complete_venues = []
+    page_venues = []
     for venue in extracted_data:
         print("Processing venue:", venue)
 
@@ -136,17 +376,19 @@ async def fetch_and_process_page(
 
         if not is_complete_venue(venue, required_keys):
             continue
+        page_venues.append(venue)
 
-        if is_duplicate_venue(venue["name"], seen_names):
-            print(f"Duplicate venue '{venue['name']}' found. Skipping.")
-            continue
-
-        seen_names.add(venue["name"])
-        complete_venues.append(venue)
-
-    if not complete_venues:
+    if not page_venues:
         print(f"No complete venues found on page {page_number}.")
         return [], False
 
+    with tracer.span("dedup", page_number) as span:
+        complete_venues = ledger.add(offset, page_venues, parse_total(result.html or ""),
+                                     repair=repair)
+        span.update(jobs=len(complete_venues), duplicates=len(page_venues) - len(complete_venues))
+    if len(complete_venues) < len(page_venues):
+        print(f"Skipped {len(page_venues) - len(complete_venues)} duplicate venue(s) "
+              f"on page {page_number}.")
+
     print(f"Extracted {len(complete_venues)} venues from page {page_number}.")
-    return complete_venues, False
\ No newline at end of file
+    return complete_venues, False
@@ -2,8 +2,10 @@
 import streamlit as st
 import pandas as pd
 import os
+import time
 from dotenv import load_dotenv
-from agent_runner import crawl_labcorp
+from crawl_worker import SearchRegistry
+from common.export import EXPORT_FORMATS, export_rows
 
 load_dotenv()
 
@@ -27,33 +29,54 @@ if not os.getenv("OPENAI_API_KEY"):
         st.warning("Please enter your OpenAI API key to continue.")
         st.stop()
 
+# Seconds between UI refreshes while a crawl is running
+POLL_INTERVAL = 1.0
+
+@st.cache_resource
+def get_registry() -> SearchRegistry:
+    """One registry per server process, so every session shares finished searches."""
+    return SearchRegistry()
+
+details = st.checkbox("Fetch job details (employment type, posting date, description)",
+                      help="Opens each job's page; details are cached, so repeat searches stay fast")
+
 if st.button("Search Jobs"):
-    base = "https://careers.labcorp.com/global/en/search-results"
-    start_url = f"{base}?keywords={keywords.replace(' ', '%20')}"
-    progress_bar = st.progress(0)
+    st.session_state["task"] = get_registry().search(keywords, details=details)
+
+task = st.session_state.get("task")
+if task is not None:
+    state = task.snapshot()
+    progress_bar = st.progress(state["progress"])
     status_text = st.empty()
     col1, col2 = st.columns(2)
-    
-    with st.spinner("Crawling & parsing job listings..."):
-        status_text.text("Initializing search...")
-        
-        def progress_callback(current_page, total_jobs):
-            progress_value = min(current_page * 0.1, 0.95)
-            progress_bar.progress(progress_value)
-            status_text.text(f"Processed page {current_page}. Found {total_jobs} jobs so far...")
-            
-        try:
-            jobs = crawl_labcorp(start_url, progress_callback)
-            progress_bar.progress(1.0)
-            status_text.text("Search complete!")
-        except Exception as e:
-            st.error(f"An error occurred: {str(e)}")
-            st.stop()
+    # the task's live column table; this rerun shows its first `count` rows
+    jobs, count = state["rows"], state["count"]
+
+    if state["error"]:
+        st.error(f"An error occurred: {state['error']}")
+    elif state["incomplete"]:
+        st.warning(f"Search incomplete: {count} jobs for '{task.keywords}' so far; "
+                   f"a page kept failing. Search again to retry.")
+    elif state["done"]:
+        status_text.text(f"Search complete! {count} jobs for '{task.keywords}' "
+                         f"in {state['elapsed']:.0f}s.")
+    elif state["total"]:
+        status_text.text(f"Processed page {state['page']}. "
+                         f"Found {count} of {state['total']} jobs so far...")
+    else:
+        status_text.text("Initializing search..." if not state["page"]
+                         else f"Processed page {state['page']}. Found {count} jobs so far...")
 
-    if not jobs:
-        st.warning("No jobs found matching your search criteria. Try different keywords.")
+    if not count:
+        if state["done"] and not state["error"] and not state["incomplete"]:
+            st.warning("No jobs found matching your search criteria. Try different keywords.")
     else:
-        df = pd.DataFrame(jobs)
+        # rebuild the frame only when rows were added, not on every rerun
+        frame_key = (id(task), count)
+        cached = st.session_state.get("frame")
+        if cached is None or cached[0] != frame_key:
+            cached = st.session_state["frame"] = (frame_key, jobs.to_pandas(limit=count))
+        df = cached[1]
         with col1:
             st.metric("Total Jobs Found", len(df))
         with col2:
@@ -67,23 +90,48 @@ if st.button("Search Jobs"):
                 "title": "Job Title",
                 "location": "Location",
                 "job_id": "Job ID",
-                "employment_type": "Employment Type"},hide_index=True)
-        
-        csv = df.to_csv(index=False)
-        col1, col2 = st.columns(2)
-        with col1:
-            st.download_button(
-                "Download as CSV",
-                csv,
-                file_name=f"labcorp_jobs_{keywords.replace(' ','_')}.csv",
-                mime="text/csv",
-                key="csv-download")
-        
-        with col2:
-            buffer = df.to_excel(index=False, engine='openpyxl')
+                "employment_type": "Employment Type",
+                "date_posted": "Posted",
+                "valid_through": "Closes",
+                "description": "Description"},hide_index=True)
+
+    if state["metrics"]:
+        with st.expander("Crawl metrics"):
+            # one row per stage (navigation, extraction, llm, write, ...), from the crawl's tracer
+            st.dataframe(pd.DataFrame.from_dict(state["metrics"], orient="index").fillna(0),
+                         column_config={"count": "Spans", "total_seconds": "Total (s)",
+                                        "mean_ms": "Mean (ms)", "p50_ms": "p50 (ms)",
+                                        "p95_ms": "p95 (ms)", "max_ms": "Max (ms)"})
+
+    if state["done"] and count:
+        # Files are only built when asked for, then kept until the results change
+        export_col, button_col = st.columns([3, 1])
+        with export_col:
+            fmt = st.selectbox("Export format", list(EXPORT_FORMATS), key="export-format")
+        export_key = (id(task), fmt, count)
+        with button_col:
+            st.write("")
+            if st.button("Prepare download", key="export-prepare"):
+                with st.spinner(f"Writing {count} rows as {fmt}..."):
+                    try:
+                        st.session_state["export"] = (export_key,
+                                                      export_rows(jobs, fmt, jobs.fields))
+                    except ImportError as e:
+                        st.error(f"{fmt} export needs an optional package: {e.name}")
+        export = st.session_state.get("export")
+        if export is not None and export[0] != export_key:
+            del st.session_state["export"]          # stale: free it
+        elif export is not None:
+            spec = EXPORT_FORMATS[fmt]
             st.download_button(
-                "Download as Excel",
-                buffer,
-                file_name=f"labcorp_jobs_{keywords.replace(' ','_')}.xlsx",
-                mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-                key="excel-download")
\ No newline at end of file
+                f"Download as {fmt}",
+                export[1],
+                file_name=f"labcorp_jobs_{task.keywords.replace(' ','_')}.{spec.extension}",
+                mime=spec.mime,
+                key="export-download")
+
+    if not state["done"]:
+        # keep the page live while the background crawl runs; widget changes
+        # rerun the script too but never restart the crawl
+        time.sleep(POLL_INTERVAL)
+        st.rerun()
@@ -0,0 +1 @@
+"""Offline benchmarks: a mock careers site, fake LLMs and a runner (``python -m benchmarks.run``)."""
@@ -0,0 +1,117 @@
+"""
+Deterministic stand-ins for the paid LLMs.
+
+`FakeChatModel` fills the ``ChatOpenAI`` slot (``invoke``/``ainvoke``) and
+`FakeExtractionStrategy` the crawl4ai ``LLMExtractionStrategy`` slot
+(``run``/``show_usage``). Both answer from the mock site's job catalogue: each
+job link in the prompt is looked up by its id, and the count and "Next" link
+are read from the page text. Replies do not depend on the card markup, so they
+are right for the ``plain_cards`` pages that the selectors can't read. Both
+tally calls and tokens in the module-level `USAGE` counter.
+"""
+import asyncio
+import html
+import json
+import re
+import threading
+import time
+from collections import Counter
+from types import SimpleNamespace
+from typing import Dict, List
+
+from benchmarks.mock_site import FIRST_JOB_ID, make_job
+from common.cards import parse_total
+from common.prune import LLM_TOKEN_BUDGET, count_tokens, prepare_for_llm
+
+USAGE: Counter = Counter()
+_usage_lock = threading.Lock()
+
+_JOB_LINK_RE = re.compile(r'href="([^"]*/job/(\d+)/[^"]*)"')
+_NEXT_LINK_RE = re.compile(r'<a\b[^>]*\bhref="([^"#][^"]*)"[^>]*>\s*Next\s*</a>')
+
+
+def answer(prompt: str) -> Dict:
+    """The page's jobs, next link and total, as a model reading `prompt` would report them."""
+    jobs, seen = [], set()
+    for url, job_id in _JOB_LINK_RE.findall(prompt):
+        if job_id in seen:
+            continue
+        seen.add(job_id)
+        job = make_job(int(job_id) - FIRST_JOB_ID)
+        jobs.append({"title": job["title"], "location": job["location"],
+                     "category": job["category"], "job_id": job_id, "url": html.unescape(url)})
+    next_link = _NEXT_LINK_RE.search(prompt)
+    return {"jobs": jobs, "next_page": html.unescape(next_link.group(1)) if next_link else None,
+            "total_jobs": parse_total(prompt)}
+
+
+def _record(prompt: str, reply: str) -> None:
+    with _usage_lock:
+        USAGE["calls"] += 1
+        USAGE["prompt_tokens"] += count_tokens(prompt)
+        USAGE["completion_tokens"] += count_tokens(reply)
+
+
+class FakeMessage:
+    def __init__(self, content: str):
+        self.content = content
+
+
+class FakeChatModel:
+    """
+    Chat model whose reply is the page's jobs as fenced JSON, like a
+    well-behaved model would send. Accepts and ignores ChatOpenAI's arguments.
+
+    Args:
+        latency (float): Seconds each call takes, standing in for the API.
+    """
+
+    def __init__(self, model_name: str = "fake-chat", latency: float = 0.2, **kwargs):
+        self.model_name = model_name
+        self.latency = latency
+
+    def _reply(self, prompt: str) -> FakeMessage:
+        reply = "```json\n" + json.dumps(answer(prompt)) + "\n```"
+        _record(prompt, reply)
+        return FakeMessage(reply)
+
+    def invoke(self, prompt, *args, **kwargs) -> FakeMessage:
+        time.sleep(self.latency)
+        return self._reply(str(prompt))
+
+    async def ainvoke(self, prompt, *args, **kwargs) -> FakeMessage:
+        await asyncio.sleep(self.latency)
+        return self._reply(str(prompt))
+
+
+class FakeExtractionStrategy:
+    """
+    Mirrors ``PrunedLLMExtractionStrategy``: prunes and chunks the page, then
+    "calls the model" once per chunk and returns Job-schema dicts.
+    """
+
+    def __init__(self, token_budget: int = LLM_TOKEN_BUDGET, latency: float = 0.2):
+        self.token_budget = token_budget
+        self.latency = latency
+        self.cache = None
+        # the per-call and running usage crawl4ai's strategies keep
+        self.usages: List[SimpleNamespace] = []
+        self.total_usage = SimpleNamespace(prompt_tokens=0, completion_tokens=0)
+
+    def run(self, url: str, sections: List[str]) -> List[dict]:
+        items: List[dict] = []
+        for chunk in prepare_for_llm("\n".join(sections), self.token_budget, f"{url} "):
+            time.sleep(self.latency)
+            jobs = answer(chunk)["jobs"]
+            reply = json.dumps(jobs)
+            _record(chunk, reply)
+            usage = SimpleNamespace(prompt_tokens=count_tokens(chunk),
+                                    completion_tokens=count_tokens(reply))
+            self.usages.append(usage)
+            self.total_usage.prompt_tokens += usage.prompt_tokens
+            self.total_usage.completion_tokens += usage.completion_tokens
+            items.extend(dict(job, snippet="", error=False) for job in jobs)
+        return items
+
+    def show_usage(self) -> None:
+        print(f"Fake LLM usage: {dict(USAGE)}")
@@ -0,0 +1,87 @@
+"""
+Import-time budget for the entry points.
+
+Imports each module in a fresh interpreter under ``python -X importtime``
+and fails when its cumulative import time exceeds the budget, or when it
+pulls in a heavy backend (langchain, openai, crawl4ai, crewai, Playwright, ...)
+that only a selected subcommand should load::
+
+    python -m benchmarks.import_time
+    python -m benchmarks.import_time --runs 5 --scale 2     # slower machine
+
+Exits with status 1 when any budget is exceeded.
+"""
+import argparse
+import subprocess
+import sys
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Set
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+# module -> cumulative import budget in milliseconds
+BUDGETS: Dict[str, float] = {
+    "cli": 50,                 # `cli.py --help` and argument parsing
+    "crawl_worker": 600,       # what app.py adds to a Streamlit cold start
+    "common.job_store": 600,   # the cache-only `stored` query
+}
+HEAVY_PACKAGES = ("langchain", "langchain_core", "langchain_openai", "langchain_community",
+                  "openai", "tiktoken", "crawl4ai", "crewai", "playwright", "bs4", "pandas",
+                  "streamlit")
+
+
+class ImportTiming(NamedTuple):
+    module: str
+    ms: float
+    heavy: Set[str]
+
+
+def measure(module: str) -> ImportTiming:
+    """Cumulative import time of `module` and the heavy packages it loaded."""
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                          cwd=REPO_ROOT, capture_output=True, text=True)
+    if proc.returncode != 0:
+        raise RuntimeError(f"import {module} failed:\n{proc.stderr[-2000:]}")
+    ms, heavy = 0.0, set()
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line.split("|", 2)
+        if not cumulative.strip().isdigit():
+            continue                            # the header line
+        package = name.strip().split(".")[0]
+        if package in HEAVY_PACKAGES:
+            heavy.add(package)
+        # nested imports are indented two spaces per level
+        if name.strip() == module and len(name) - len(name.lstrip()) <= 1:
+            ms = int(cumulative) / 1000
+    return ImportTiming(module, ms, heavy)
+
+
+def best_of(module: str, runs: int) -> ImportTiming:
+    """The fastest of `runs` imports, so one slow cold start doesn't fail the check."""
+    timings = [measure(module) for _ in range(max(runs, 1))]
+    return min(timings, key=lambda timing: timing.ms)
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("modules", nargs="*", help=f"modules to check (default: {list(BUDGETS)})")
+    parser.add_argument("--runs", type=int, default=3, help="imports per module; the best counts")
+    parser.add_argument("--scale", type=float, default=1.0, help="multiply every budget")
+    args = parser.parse_args(argv)
+
+    failed = 0
+    print(f"{'module':<20}{'ms':>9}{'budget':>9}  heavy packages")
+    for module in args.modules or BUDGETS:
+        budget = BUDGETS.get(module, min(BUDGETS.values())) * args.scale
+        timing = best_of(module, args.runs)
+        over = timing.ms > budget or timing.heavy
+        failed += bool(over)
+        print(f"{module:<20}{timing.ms:>9.1f}{budget:>9.0f}  "
+              f"{', '.join(sorted(timing.heavy)) or '-'}{'  OVER BUDGET' if over else ''}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,302 @@
+"""
+A local stand-in for the LabCorp careers site.
+
+Serves paginated search results with the same markup the crawlers parse
+(``data-ph-at-id`` cards, "Showing N results", ``from=`` offsets, a
+pagination "next" link and, optionally, the embedded ``phApp.ddo`` JSON),
+plus a job detail page per result. Latency, error rate and result count are
+configurable and the content is deterministic for a given seed. With
+``drift`` the result list changes mid-crawl: postings are added to (or
+removed from) its front, shifting every later offset. With ``plain_cards``
+the results use markup the card selectors don't know, so (without the
+embedded JSON) only an LLM can read them.
+
+    python -m benchmarks.mock_site --jobs 200 --latency 0.05
+    python -m benchmarks.mock_site --drift 3 --drift-after 4   # 3 new postings
+    python -m benchmarks.mock_site --no-json --plain-cards     # LLM-only pages
+"""
+import argparse
+import html
+import json
+import random
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional
+from urllib.parse import parse_qs, quote, urlsplit
+
+PAGE_SIZE = 20
+FIRST_JOB_ID = 3000000
+TITLES = ["QA Automation Engineer", "Software Test Engineer", "Quality Assurance Analyst",
+          "SDET", "Validation Engineer", "Performance Test Engineer", "Test Automation Lead",
+          "Clinical Systems QA Engineer", "Quality Control Technologist", "Data QA Engineer"]
+LOCATIONS = ["Durham, North Carolina, United States of America", "Burlington, North Carolina, "
+             "United States of America", "Indianapolis, Indiana, United States of America",
+             "Bangalore, Karnataka, India", "Mechelen, Belgium", "Maidenhead, United Kingdom",
+             "Remote, United States of America"]
+CATEGORIES = ["Information Technology", "Quality", "Clinical Research", "Laboratory Operations"]
+# Roughly the weight of the real page: scripts, styles and navigation the LLM path must prune
+PAGE_PADDING = ('<script>window.dataLayer=window.dataLayer||[];' + "var x=0;" * 400 + '</script>'
+                '<style>' + ".c{color:#333}" * 300 + '</style>')
+# Subresources a browser would load (each served after the site latency); the
+# lean navigation profile aborts all but the script
+ASSETS = {"site.css": ("text/css", 40_000), "brand.woff2": ("font/woff2", 60_000),
+          "hero.jpg": ("image/jpeg", 150_000), "analytics.js": ("application/javascript", 20_000)}
+ASSET_TAGS = ('<link rel="stylesheet" href="/static/site.css">'
+              '<link rel="preload" as="font" type="font/woff2" crossorigin href="/static/brand.woff2">'
+              '<script async src="/static/analytics.js"></script>')
+
+
+def make_job(index: int) -> Dict:
+    """The deterministic job at position `index` of the result list."""
+    rng = random.Random(index)
+    title = f"{TITLES[index % len(TITLES)]} {index // len(TITLES) + 1}"
+    return {
+        "jobId": str(FIRST_JOB_ID + index),
+        "title": title,
+        "location": rng.choice(LOCATIONS),
+        "category": rng.choice(CATEGORIES),
+        "type": "Full-Time" if index % 5 else "Part-Time",
+        "postedDate": f"2026-10-{index % 28 + 1:02d}T00:00:00.000+0000",
+    }
+
+
+class MockSite:
+    """
+    Threaded HTTP server with request counters.
+
+    Args:
+        total_jobs (int): Results reported for every query.
+        page_size (int): Results per page.
+        latency (float): Seconds to wait before each response.
+        error_rate (float): Fraction of requests answered with 503.
+        embed_json (bool): Include the ``phApp.ddo`` blob (the fast path).
+        seed (int): Seed for the error draws.
+        drift (int): Postings added to the front of the results (negative:
+            removed from it) just before search request ``drift_after + 1``.
+        drift_after (int): Search requests served before the drift.
+        plain_cards (bool): Serve result cards, count and pagination without
+            the ``data-ph-at-id`` attributes the selectors look for.
+    """
+
+    def __init__(self, total_jobs: int = 200, page_size: int = PAGE_SIZE, latency: float = 0.05,
+                 error_rate: float = 0.0, embed_json: bool = True, seed: int = 0,
+                 host: str = "127.0.0.1", port: int = 0, drift: int = 0, drift_after: int = 3,
+                 plain_cards: bool = False):
+        self.total_jobs = total_jobs
+        self.drift = drift
+        self.drift_after = drift_after
+        # job indices in result order; replaced, never mutated, when drift applies
+        self._order: List[int] = list(range(total_jobs))
+        self._created = total_jobs
+        self.page_size = page_size
+        self.latency = latency
+        self.error_rate = error_rate
+        self.embed_json = embed_json
+        self.plain_cards = plain_cards
+        self.counts: Counter = Counter()
+        self.offsets: Counter = Counter()
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer((host, port), self._handler())
+        self._server.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "MockSite":
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True,
+                                        name="mock-site")
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self) -> "MockSite":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {"requests": dict(self.counts), "unique_pages": len(self.offsets),
+                    "repeat_page_fetches": sum(self.offsets.values()) - len(self.offsets),
+                    "listed": len(self._order)}
+
+    def _apply_drift(self) -> None:
+        """Adds or removes `drift` postings at the front of the results (call with the lock)."""
+        if self.drift > 0:
+            added = list(range(self._created, self._created + self.drift))
+            self._created += self.drift
+            self._order = added + self._order
+        else:
+            self._order = self._order[-self.drift:]
+
+    # ── pages ────────────────────────────────────────────────────────────────
+    def search_page(self, keywords: str, offset: int) -> str:
+        order = self._order
+        total = len(order)
+        if offset < 0 or offset >= total:
+            return self._layout(keywords, offset, [], '<div class="no-results" '
+                                'data-ph-at-id="no-results"><h2>No Results Found</h2></div>',
+                                total)
+        jobs = [make_job(i) for i in order[offset:offset + self.page_size]]
+        if self.plain_cards:
+            return self._layout(keywords, offset, jobs, self._plain_results(keywords, offset,
+                                                                            jobs, total), total)
+        cards = "".join(self._card(job) for job in jobs)
+        body = (f'<div class="search-results-header"><span data-ph-at-id="search-page-top-job-count">'
+                f'Showing {total} results</span></div>'
+                f'<ul data-ph-at-id="jobs-list">{cards}</ul>'
+                f'{self._pagination(keywords, offset, total)}')
+        return self._layout(keywords, offset, jobs, body, total)
+
+    def job_page(self, job_id: str) -> Optional[str]:
+        index = int(job_id) - FIRST_JOB_ID if job_id.isdigit() else -1
+        if not 0 <= index < self._created:
+            return None
+        job = make_job(index)
+        posting = {"@context": "https://schema.org", "@type": "JobPosting",
+                   "title": job["title"], "identifier": {"@type": "PropertyValue",
+                                                         "value": job["jobId"]},
+                   "datePosted": job["postedDate"][:10], "employmentType": job["type"],
+                   "description": f"<p>{job['title']} at Labcorp. " + "Duties. " * 50 + "</p>",
+                   "jobLocation": {"@type": "Place", "address": {
+                       "@type": "PostalAddress", "addressLocality": job["location"].split(",")[0]}},
+                   "hiringOrganization": {"@type": "Organization", "name": "Labcorp"}}
+        return (f"<!DOCTYPE html><html><head><title>{html.escape(job['title'])}</title>"
+                f'<script type="application/ld+json">{json.dumps(posting)}</script>'
+                f"{PAGE_PADDING}</head><body><h1>{html.escape(job['title'])}</h1></body></html>")
+
+    def _job_url(self, job: Dict) -> str:
+        return f"{self.url}/global/en/job/{job['jobId']}/{quote(job['title'].replace(' ', '-'))}"
+
+    def _card(self, job: Dict) -> str:
+        title = html.escape(job["title"])
+        return (f'<li class="jobs-list-item" data-ph-at-id="jobs-list-item"><div class="information">'
+                f'<a href="{self._job_url(job)}" data-ph-at-id="job-link" '
+                f'data-ph-at-job-id-text="{job["jobId"]}"><div class="job-title">'
+                f'<span>{title}</span></div></a><p class="job-info">'
+                f'<span data-ph-at-id="job-location">{html.escape(job["location"])}</span>'
+                f'<span data-ph-at-id="job-category">{html.escape(job["category"])}</span></p>'
+                f'<p data-ph-at-id="job-description">Join Labcorp as a {title} ...</p></div></li>')
+
+    def _plain_results(self, keywords: str, offset: int, jobs: List[Dict], total: int) -> str:
+        """Count, cards and next link as an older template would mark them up."""
+        cards = "".join(
+            f'<div class="result"><h3><a href="{self._job_url(job)}">{html.escape(job["title"])}'
+            f'</a></h3><div class="meta">{html.escape(job["location"])} | '
+            f'{html.escape(job["category"])}</div></div>' for job in jobs)
+        return (f'<p class="count">Showing {total} results</p><div class="results">{cards}</div>'
+                f'<div class="pager"><a href="{self._next_href(keywords, offset, total)}">Next</a>'
+                f'</div>')
+
+    def _next_href(self, keywords: str, offset: int, total: int) -> str:
+        nxt = offset + self.page_size
+        return (f"{self.url}/global/en/search-results?keywords={quote(keywords)}&amp;from={nxt}&amp;s=1"
+                if nxt < total else "#")
+
+    def _pagination(self, keywords: str, offset: int, total: int) -> str:
+        href = self._next_href(keywords, offset, total)
+        return (f'<ul class="pagination" data-ph-at-id="pagination"><li><a data-ph-at-id='
+                f'"pagination-next-link" href="{href}">Next</a></li></ul>')
+
+    def _layout(self, keywords: str, offset: int, jobs: List[Dict], body: str,
+                total: int) -> str:
+        ddo = ""
+        if self.embed_json:
+            blob = {"eagerLoadRefineSearch": {"status": 200, "hits": len(jobs),
+                                              "totalHits": total if jobs else 0,
+                                              "data": {"jobs": jobs}},
+                    "searchConfig": {"from": offset, "size": self.page_size}}
+            ddo = f"<script>var phApp = phApp || {{}}; phApp.ddo = {json.dumps(blob)};</script>"
+        return (f"<!DOCTYPE html><html><head><title>Search results</title>{ASSET_TAGS}"
+                f"{PAGE_PADDING}{ddo}</head>"
+                f'<body><header><nav><a href="/global/en">Home</a></nav>'
+                f'<img src="/static/hero.jpg" alt=""></header><main>'
+                f'<section data-ph-at-id="search-results">{body}</section></main>'
+                f"<footer>&copy; Labcorp</footer></body></html>")
+
+    # ── HTTP ─────────────────────────────────────────────────────────────────
+    def _handler(self):
+        site = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                if site.latency:
+                    time.sleep(site.latency)
+                parts = urlsplit(self.path)
+                with site._lock:
+                    failed = site.error_rate and site._rng.random() < site.error_rate
+                if failed:
+                    site.counts["503"] += 1
+                    return self._send(503, "Service Unavailable")
+                if parts.path.endswith("/search-results"):
+                    query = parse_qs(parts.query)
+                    offset = int(query.get("from", ["0"])[0])
+                    with site._lock:
+                        if site.drift and site.counts["search"] == site.drift_after:
+                            site._apply_drift()
+                        site.counts["search"] += 1
+                        site.offsets[offset] += 1
+                    page = site.search_page(query.get("keywords", [""])[0], offset)
+                    return self._send(200, page)
+                if parts.path.startswith("/static/") and parts.path[8:] in ASSETS:
+                    mime, size = ASSETS[parts.path[8:]]
+                    with site._lock:
+                        site.counts["static"] += 1
+                    return self._send(200, "/" * size, mime)
+                if "/job/" in parts.path:
+                    page = site.job_page(parts.path.split("/job/", 1)[1].split("/")[0])
+                    if page is not None:
+                        site.counts["job"] += 1
+                        return self._send(200, page)
+                site.counts["404"] += 1
+                self._send(404, "Not Found")
+
+            def _send(self, status: int, text: str, mime: str = "text/html; charset=utf-8"):
+                payload = text.encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", mime)
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, *args):
+                pass
+
+        return Handler
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Serve a mock LabCorp careers site.")
+    parser.add_argument("--jobs", type=int, default=200)
+    parser.add_argument("--latency", type=float, default=0.05)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--no-json", action="store_true", help="omit the embedded search JSON")
+    parser.add_argument("--plain-cards", action="store_true",
+                        help="mark up results so the card selectors find nothing")
+    parser.add_argument("--drift", type=int, default=0,
+                        help="postings added to the front mid-crawl (negative: removed)")
+    parser.add_argument("--drift-after", type=int, default=3,
+                        help="search requests served before the drift (default: 3)")
+    parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args()
+    site = MockSite(args.jobs, latency=args.latency, error_rate=args.error_rate,
+                    embed_json=not args.no_json, port=args.port, drift=args.drift,
+                    drift_after=args.drift_after, plain_cards=args.plain_cards).start()
+    print(f"Mock careers site on {site.url} (LABCORP_SITE={site.url}); Ctrl+C to stop.")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        site.stop()
@@ -0,0 +1,94 @@
+"""
+Micro-benchmark for the card extractor.
+
+Times `common.cards.extract_page` against the full-tree BeautifulSoup
+implementation it replaced, on the saved pages in ``fixtures/`` (or the
+files given), and checks that both return the same result::
+
+    python -m benchmarks.parse_cards
+    python -m benchmarks.parse_cards page.html --repeat 200
+"""
+import argparse
+import time
+from pathlib import Path
+from typing import Callable, Dict, List
+from urllib.parse import parse_qs, urljoin, urlsplit
+
+from bs4 import BeautifulSoup
+
+from common.cards import (CARD_SELECTOR, CATEGORY_SELECTOR, LINK_SELECTOR, LOCATION_SELECTOR,
+                          NEXT_SELECTOR, extract_page, job_id_from, parse_total)
+from common.listing import SITE
+
+FIXTURES = Path(__file__).resolve().parent.parent / "fixtures"
+
+
+def _bs4_text(node) -> str:
+    return node.get_text(" ", strip=True) if node else ""
+
+
+def bs4_extract_page(html: str) -> Dict:
+    """The previous `extract_page`: a full BeautifulSoup tree and ``select_one`` per card."""
+    soup = BeautifulSoup(html, "lxml")
+    jobs: List[Dict] = []
+    for card in soup.select(CARD_SELECTOR):
+        link = card.select_one(LINK_SELECTOR)
+        if not link or not link.get("href"):
+            continue
+        url = urljoin(SITE, link["href"])
+        jobs.append({
+            "title": _bs4_text(link),
+            "location": _bs4_text(card.select_one(LOCATION_SELECTOR)),
+            "category": _bs4_text(card.select_one(CATEGORY_SELECTOR)),
+            "job_id": (link.get("data-ph-at-job-id-text")
+                       or card.get("data-job-id")
+                       or job_id_from(url)),
+            "url": url,
+        })
+
+    total = parse_total(html)
+    next_page = None
+    next_link = soup.select_one(NEXT_SELECTOR)
+    if next_link and next_link.get("href", "#") != "#":
+        next_page = urljoin(SITE, next_link["href"])
+        offset = parse_qs(urlsplit(next_page).query).get("from", [None])[0]
+        if total is not None and offset is not None and int(offset) >= total:
+            next_page = None
+
+    return {"jobs": jobs, "next_page": next_page, "total_jobs": total}
+
+
+def _time(func: Callable[[str], Dict], html: str, repeat: int) -> float:
+    """Best-of-three mean milliseconds per call."""
+    best = float("inf")
+    for _ in range(3):
+        started = time.perf_counter()
+        for _ in range(repeat):
+            func(html)
+        best = min(best, (time.perf_counter() - started) / repeat)
+    return best * 1000
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("files", nargs="*", help="Saved results pages (default: fixtures/*.html)")
+    parser.add_argument("--repeat", type=int, default=50, help="Calls per timing round")
+    args = parser.parse_args()
+
+    paths = [Path(f) for f in args.files] or sorted(FIXTURES.glob("*.html"))
+    mismatches = 0
+    print(f"{'page':<32}{'KB':>7}{'jobs':>6}{'bs4 ms':>9}{'new ms':>9}{'speedup':>9}")
+    for path in paths:
+        html = path.read_text(encoding="utf-8")
+        old, new = bs4_extract_page(html), extract_page(html)
+        if old != new:
+            mismatches += 1
+            print(f"{path.name}: results differ from the BeautifulSoup parser")
+        old_ms, new_ms = _time(bs4_extract_page, html, args.repeat), _time(extract_page, html, args.repeat)
+        print(f"{path.name:<32}{len(html) / 1024:>7.1f}{len(new['jobs']):>6}{old_ms:>9.2f}"
+              f"{new_ms:>9.2f}{old_ms / new_ms:>8.1f}x")
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,296 @@
+"""
+Offline crawler benchmarks.
+
+Each crawl implementation runs in its own Python process against a fresh
+`MockSite`, with the fake LLMs in place of OpenAI/Groq, an empty temporary
+cache directory and ``LABCORP_SITE`` pointing at the mock server. Results go
+to a JSON file so runs can be compared:
+
+    python -m benchmarks.run                          # all targets
+    python -m benchmarks.run --targets crawl_labcorp --jobs 400 --latency 0.1
+    python -m benchmarks.run --no-json                # force the HTML paths
+    python -m benchmarks.run --no-json --plain-cards  # ... and the LLM on every page
+    python -m benchmarks.run --details                # add job-detail enrichment
+    python -m benchmarks.run --drift 3                # postings added mid-crawl
+
+Reported per target: wall time, pages/sec, jobs, time to first job, peak
+RSS, LLM calls and tokens per page, and what the server saw (requests,
+503s, repeated page fetches, jobs listed at the end). With ``--drift`` a
+complete crawl has ``unique_jobs`` equal to ``jobs`` and at least the listed
+count. A target whose dependencies are not installed (crawl4ai, playwright)
+is reported as skipped.
+"""
+import argparse
+import asyncio
+import builtins
+import importlib.util
+import json
+import os
+import platform
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional
+from urllib.parse import quote
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+TARGETS = ["crawl_labcorp", "crawl_jobs", "scrape", "one_page"]
+RESULT_PREFIX = "BENCH_RESULT "
+
+
+# ── child process: run one crawler ───────────────────────────────────────────
+def _peak_rss_mb() -> float:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+def _timing_sink():
+    from common.sinks import JobSink
+    from common.tracing import Tracer
+
+    class TimingSink(JobSink):
+        """
+        Counts rows and pages and notes when the first job arrived; writes
+        nothing. Crawlers that take a tracer are given `tracer`.
+        """
+
+        def __init__(self):
+            super().__init__("<benchmark>")
+            self.tracer = Tracer()
+            self.started = time.perf_counter()
+            self.first_job: Optional[float] = None
+            self.pages = 0
+            self.job_ids = set()
+
+        def _open(self) -> None:
+            self._file = self
+
+        def _write(self, rows: List[Dict]) -> None:
+            if self.first_job is None:
+                self.first_job = time.perf_counter() - self.started
+            self.pages += 1
+            self.job_ids.update(row.get("job_id") for row in rows)
+
+        def _sync(self) -> None:
+            pass
+
+        def _close(self) -> None:
+            pass
+
+    return TimingSink()
+
+
+def _use_limiter(rate: float) -> None:
+    """Replaces the process-wide limiter's pacing; 0 keeps the production defaults."""
+    if rate <= 0:
+        return
+    from common import rate_limit
+    rate_limit.MAX_RATE = max(rate_limit.MAX_RATE, rate)
+    rate_limit._limiter = rate_limit.RateLimiter(rate=rate, burst=max(rate_limit.BURST, int(rate)))
+
+
+def _run_crawl_labcorp(args, sink) -> Iterator[None]:
+    import agent_runner
+    from benchmarks.fake_llm import FakeChatModel
+    from common.listing import SITE
+
+    agent_runner.ChatOpenAI = lambda **kwargs: FakeChatModel(latency=args.llm_latency, **kwargs)
+    yield
+    start_url = f"{SITE}/global/en/search-results?keywords={quote(args.keyword)}"
+    agent_runner.crawl_labcorp(start_url, sink=sink, tracer=sink.tracer, details=args.details)
+
+
+def _run_crawl_jobs(args, sink) -> Iterator[None]:
+    sys.path.insert(0, str(REPO_ROOT / "ai_web_crawler"))
+    import main
+    from benchmarks.fake_llm import FakeExtractionStrategy
+
+    main.get_llm_strategy = lambda budget, **kwargs: FakeExtractionStrategy(
+        budget, latency=args.llm_latency)
+    main.open_sink = lambda output, **kwargs: sink
+    builtins.input = lambda prompt="": args.keyword
+    yield
+    asyncio.run(main.crawl_jobs("bypass"))
+
+
+def _run_scrape(args, sink) -> Iterator[None]:
+    sys.path.insert(0, str(REPO_ROOT / "ai_web_crawler"))
+    # ai_web_crawler/test.py; loaded by path since "test" is a stdlib package name
+    spec = importlib.util.spec_from_file_location("labcorp_scrape",
+                                                  REPO_ROOT / "ai_web_crawler" / "test.py")
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    yield
+    asyncio.run(module.scrape(args.keyword, sink=sink, tracer=sink.tracer))
+
+
+def _run_one_page(args, sink) -> Iterator[None]:
+    # the agentic project's `tools` package, not the root tools.py
+    sys.path.insert(0, str(REPO_ROOT / "agentic_web_crawler"))
+    from tools import one_page, shutdown_browser
+    yield
+    try:
+        offset = 0
+        while True:
+            jobs = one_page(args.keyword, offset)
+            if not jobs:
+                break
+            sink.write_page(jobs)
+            offset += len(jobs)
+    finally:
+        shutdown_browser()
+
+
+RUNNERS = {"crawl_labcorp": _run_crawl_labcorp, "crawl_jobs": _run_crawl_jobs,
+           "scrape": _run_scrape, "one_page": _run_one_page}
+
+
+def run_child(args) -> Dict:
+    """
+    Runs one target in this process. Each runner is a generator: the code
+    before its ``yield`` imports and patches (timed as ``import_seconds``),
+    the code after it is the crawl.
+    """
+    from benchmarks.fake_llm import USAGE
+
+    started = time.perf_counter()
+    sink = _timing_sink()
+    runner = RUNNERS[args.child](args, sink)
+    try:
+        next(runner)
+    except ImportError as e:
+        return {"status": "skipped", "reason": f"{type(e).__name__}: {e}"}
+    _use_limiter(args.rate)
+    import_seconds = time.perf_counter() - started
+    rss_before = _peak_rss_mb()
+
+    sink.started = time.perf_counter()
+    error = None
+    try:
+        next(runner, None)
+    except Exception as e:
+        error = f"{type(e).__name__}: {e}"
+    wall = time.perf_counter() - sink.started
+
+    llm_tokens = USAGE["prompt_tokens"] + USAGE["completion_tokens"]
+    return {
+        "status": "error" if error else "ok",
+        "error": error,
+        "import_seconds": round(import_seconds, 3),
+        "wall_seconds": round(wall, 3),
+        "pages": sink.pages,
+        "jobs": sink.count,
+        "unique_jobs": len(sink.job_ids),
+        "pages_per_second": round(sink.pages / wall, 2) if wall else None,
+        "time_to_first_job": None if sink.first_job is None else round(sink.first_job, 3),
+        "peak_rss_mb": _peak_rss_mb(),
+        "rss_after_import_mb": rss_before,
+        "llm_calls": USAGE["calls"],
+        "llm_prompt_tokens": USAGE["prompt_tokens"],
+        "llm_completion_tokens": USAGE["completion_tokens"],
+        "llm_calls_per_page": round(USAGE["calls"] / sink.pages, 2) if sink.pages else None,
+        "llm_tokens_per_page": round(llm_tokens / sink.pages, 1) if sink.pages else None,
+        "stages": sink.tracer.summary(),
+    }
+
+
+# ── parent process: one mock site and one child per target ───────────────────
+def run_target(target: str, args) -> Dict:
+    from benchmarks.mock_site import MockSite
+
+    with MockSite(args.jobs, latency=args.latency, error_rate=args.error_rate,
+                  embed_json=not args.no_json, seed=args.seed, drift=args.drift,
+                  drift_after=args.drift_after, plain_cards=args.plain_cards) as site, \
+            tempfile.TemporaryDirectory(prefix="labcorp-bench-") as cache_dir:
+        env = dict(os.environ, LABCORP_SITE=site.url, LABCORP_CACHE_DIR=cache_dir,
+                   PYTHONUNBUFFERED="1")
+        command = [sys.executable, "-m", "benchmarks.run", "--child", target,
+                   "--keyword", args.keyword, "--llm-latency", str(args.llm_latency),
+                   "--rate", str(args.rate)] + (["--details"] if args.details else [])
+        try:
+            proc = subprocess.run(command, cwd=REPO_ROOT, env=env, capture_output=True,
+                                  text=True, timeout=args.timeout)
+        except subprocess.TimeoutExpired:
+            return {"status": "timeout", "timeout_seconds": args.timeout,
+                    "server": site.stats()}
+        lines = [line for line in proc.stdout.splitlines() if line.startswith(RESULT_PREFIX)]
+        if lines:
+            result = json.loads(lines[-1][len(RESULT_PREFIX):])
+        else:
+            result = {"status": "error", "error": f"exit code {proc.returncode}",
+                      "stderr": proc.stderr[-2000:]}
+        result["server"] = site.stats()
+        return result
+
+
+def _summary(results: Dict[str, Dict]) -> str:
+    header = (f"{'target':<14}{'status':<9}{'pages':>6}{'jobs':>6}{'pages/s':>9}"
+              f"{'first job':>11}{'peak MB':>9}{'LLM calls':>11}{'tok/page':>10}")
+    lines = [header, "-" * len(header)]
+    for target, r in results.items():
+        if r["status"] not in ("ok", "error"):
+            lines.append(f"{target:<14}{r['status']:<9}{r.get('reason', '')}")
+            continue
+        lines.append(f"{target:<14}{r['status']:<9}{r.get('pages', 0):>6}{r.get('jobs', 0):>6}"
+                     f"{r.get('pages_per_second') or 0:>9}"
+                     f"{r.get('time_to_first_job') or '-':>11}{r.get('peak_rss_mb', '-'):>9}"
+                     f"{r.get('llm_calls', 0):>11}{r.get('llm_tokens_per_page') or '-':>10}")
+        if r.get("error"):
+            lines.append(f"{'':<14}{r['error']}")
+    return "\n".join(lines)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark the crawlers against a local mock site.")
+    parser.add_argument("--targets", nargs="+", choices=TARGETS, default=TARGETS)
+    parser.add_argument("--jobs", type=int, default=200, help="results per search (default: 200)")
+    parser.add_argument("--latency", type=float, default=0.05,
+                        help="server seconds per response (default: 0.05)")
+    parser.add_argument("--error-rate", type=float, default=0.0,
+                        help="fraction of responses that are 503 (default: 0)")
+    parser.add_argument("--no-json", action="store_true",
+                        help="omit the embedded search JSON so crawlers take the HTML path")
+    parser.add_argument("--plain-cards", action="store_true",
+                        help="serve cards the selectors can't read, so the HTML path "
+                             "needs the (fake) LLM")
+    parser.add_argument("--llm-latency", type=float, default=0.2,
+                        help="seconds per fake LLM call (default: 0.2)")
+    parser.add_argument("--rate", type=float, default=100.0,
+                        help="rate limiter requests/sec per host; 0 keeps the production "
+                             "pacing (default: 100)")
+    parser.add_argument("--details", action="store_true",
+                        help="crawl_labcorp also fetches every job's detail page")
+    parser.add_argument("--keyword", default="QA Engineer")
+    parser.add_argument("--seed", type=int, default=0, help="seed for the server's 503s")
+    parser.add_argument("--drift", type=int, default=0,
+                        help="postings the site adds to the front mid-crawl (negative: removes)")
+    parser.add_argument("--drift-after", type=int, default=3,
+                        help="search requests served before the drift (default: 3)")
+    parser.add_argument("--timeout", type=float, default=600, help="seconds per target")
+    parser.add_argument("--output", default="benchmark_results.json")
+    parser.add_argument("--child", choices=TARGETS, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        print(RESULT_PREFIX + json.dumps(run_child(args)), flush=True)
+        return
+
+    config = {k: v for k, v in vars(args).items() if k not in ("child", "output")}
+    results = {}
+    for target in args.targets:
+        print(f"Benchmarking {target}...")
+        results[target] = run_target(target, args)
+    report = {"started": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+              "python": platform.python_version(), "platform": platform.platform(),
+              "config": config, "results": results}
+    Path(args.output).write_text(json.dumps(report, indent=2), encoding="utf-8")
+    print(_summary(results))
+    print(f"Results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
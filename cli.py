@@ -0,0 +1,261 @@
+"""
+One command line for every crawl backend.
+
+    python cli.py search "QA automation testing" --details --output jobs.csv
+    python cli.py delta "QA automation testing"
+    python cli.py batch keywords.txt --concurrency 8
+    python cli.py crawl4ai "QA automation testing" --page-cache bypass
+    python cli.py scrape "QA automation testing" --workers 8
+    python cli.py crew "QA automation testing"
+    python cli.py stored "QA automation testing"
+
+Only argparse is imported at startup. Each subcommand imports its backend
+(langchain, crawl4ai, Playwright, crewai) when it runs, so ``--help``, the
+cache-only ``stored`` query and scheduled short jobs start in milliseconds.
+``python -m benchmarks.import_time`` checks this against an import-time
+budget.
+
+The two sub-projects are loaded from their own directories, as if run from
+there: ``ai_web_crawler`` (``config``, ``utils``) and ``agentic_web_crawler``
+(whose ``tools`` package would shadow the root ``tools.py``). A process
+runs one subcommand, so the two never meet.
+"""
+import argparse
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent
+DEFAULT_OUTPUT = "labcorp_jobs.csv"
+# Where each backend's dependencies are listed
+REQUIREMENTS = {"crawl4ai": "ai_web_crawler/requirements.txt",
+                "scrape": "ai_web_crawler/requirements.txt",
+                "crew": "agentic_web_crawler/requirements.txt"}
+
+
+def _project(name: str) -> None:
+    """Puts a sub-project directory first on sys.path, like running a script from it."""
+    path = str(ROOT / name)
+    if path not in sys.path:
+        sys.path.insert(0, path)
+
+
+def _load(project: str, filename: str, module_name: str):
+    """Imports one script of a sub-project under a name that can't clash (e.g. ``test``)."""
+    import importlib.util
+
+    _project(project)
+    spec = importlib.util.spec_from_file_location(module_name, ROOT / project / filename)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[module_name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+def _tracer(args, keyword=None):
+    from common.tracing import Tracer
+    return Tracer(keyword, trace_path=args.trace)
+
+
+def _finish(tracer, args) -> None:
+    tracer.close()
+    if args.metrics:
+        tracer.write_prometheus(args.metrics)
+        print(f"Metrics written to {args.metrics}")
+
+
+def _print_progress(page, found, total=None, metrics=None) -> None:
+    of = f" of {total}" if total is not None else ""
+    print(f"Processed page {page}. Found {found}{of} jobs so far...")
+
+
+def cmd_search(args) -> int:
+    from urllib.parse import quote
+
+    from agent_runner import crawl_labcorp
+    from common.details import DETAILED_FIELDS
+    from common.listing import SITE
+    from common.sinks import open_sink
+
+    start_url = f"{SITE}/global/en/search-results?keywords={quote(args.keyword)}"
+    tracer = _tracer(args, args.keyword)
+    with open_sink(args.output, DETAILED_FIELDS if args.details else None,
+                   append=args.resume) as sink:
+        crawl_labcorp(start_url, _print_progress, use_agent=args.agent, sink=sink,
+                      resume=args.resume, tracer=tracer, details=args.details)
+    print(f"Saved {sink.count} jobs to {args.output}")
+    _finish(tracer, args)
+    return 0
+
+
+def cmd_delta(args) -> int:
+    from agent_runner import crawl_labcorp_delta
+
+    tracer = _tracer(args, args.keyword)
+    delta = crawl_labcorp_delta(args.keyword, progress_callback=_print_progress, tracer=tracer)
+    print(f"Pages fetched: {delta.pages}. Added: {len(delta.added)}, "
+          f"removed: {len(delta.removed)}, unchanged: {len(delta.unchanged)}")
+    _finish(tracer, args)
+    return 0
+
+
+def cmd_batch(args) -> int:
+    from agent_runner import crawl_labcorp_batch
+    from common.batch import BATCH_FIELDS, read_keywords
+    from common.sinks import open_sink
+
+    tracer = _tracer(args)
+    with open_sink(args.output, BATCH_FIELDS) as out:
+        batch = crawl_labcorp_batch(
+            read_keywords(args.file), max_concurrency=args.concurrency, sink=out,
+            render=args.render, tracer=tracer,
+            progress_callback=lambda kw, n, done: print(f"Query {kw!r}: {n} jobs ({done} done)"))
+    print(f"Unique jobs: {len(batch.jobs)} from {batch.pages} pages in {batch.seconds:.1f}s. "
+          f"Per query: {batch.per_keyword}")
+    _finish(tracer, args)
+    return 0
+
+
+def cmd_crawl4ai(args) -> int:
+    import asyncio
+
+    main = _load("ai_web_crawler", "main.py", "ai_web_crawler_main")
+    asyncio.run(main.crawl_jobs(args.page_cache or main.PAGE_CACHE_MODE, args.output,
+                                args.resume, args.trace, args.metrics, keyword=args.keyword))
+    return 0
+
+
+def cmd_scrape(args) -> int:
+    import asyncio
+
+    scraper = _load("ai_web_crawler", "test.py", "ai_web_crawler_scrape")
+    from common.sinks import open_sink
+
+    tracer = _tracer(args, args.keyword)
+    with open_sink(args.output) as sink:
+        asyncio.run(scraper.scrape(args.keyword, args.workers, sink=sink, tracer=tracer))
+    print(f"Saved {sink.count} rows to {args.output}")
+    _finish(tracer, args)
+    return 0
+
+
+def cmd_crew(args) -> int:
+    import asyncio
+
+    _project("agentic_web_crawler")
+    from crew_config import build_crew
+    from tools import shutdown_browser
+
+    try:
+        asyncio.run(build_crew(args.keyword).run())
+    finally:
+        shutdown_browser()
+    return 0
+
+
+def cmd_stored(args) -> int:
+    from common.job_store import JobStore
+
+    jobs = JobStore().jobs_for(args.keyword)
+    if args.output:
+        from common.sinks import open_sink
+        with open_sink(args.output) as sink:
+            sink.write_page(jobs)
+        print(f"Saved {sink.count} jobs to {args.output}")
+    else:
+        for job in jobs:
+            print(f"{job['job_id']:>10}  {job['title']}  ({job['location']})  {job['url']}")
+        print(f"{len(jobs)} stored jobs for {args.keyword!r}")
+    return 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    tracing = argparse.ArgumentParser(add_help=False)
+    tracing.add_argument("--trace", metavar="FILE",
+                         help="append a JSON line per stage span (navigation, extraction, llm, ...)")
+    tracing.add_argument("--metrics", metavar="FILE",
+                         help="write the stage metrics in Prometheus text format at the end")
+
+    parser = argparse.ArgumentParser(prog="cli.py", description="Crawl LabCorp job listings.")
+    commands = parser.add_subparsers(dest="command", required=True, metavar="COMMAND")
+
+    search = commands.add_parser("search", parents=[tracing],
+                                 help="direct crawl: embedded JSON, selectors, then the LLM")
+    search.add_argument("keyword")
+    search.add_argument("--output", default=DEFAULT_OUTPUT,
+                        help=f"results file: .csv, .jsonl or .parquet (default: {DEFAULT_OUTPUT})")
+    search.add_argument("--agent", action="store_true",
+                        help="drive every page through the ReAct agent")
+    search.add_argument("--resume", action="store_true",
+                        help="continue the last interrupted crawl of this search")
+    search.add_argument("--details", action="store_true",
+                        help="add employment type, dates and description from each job's page")
+    search.set_defaults(func=cmd_search)
+
+    delta = commands.add_parser("delta", parents=[tracing],
+                                help="fetch only pages with jobs the job store hasn't seen")
+    delta.add_argument("keyword")
+    delta.set_defaults(func=cmd_delta)
+
+    batch = commands.add_parser("batch", parents=[tracing],
+                                help="run every query in a keyword file concurrently")
+    batch.add_argument("file", help="one query per line; blank lines and # comments skipped")
+    batch.add_argument("--concurrency", type=int, default=4, help="queries in flight (default: 4)")
+    batch.add_argument("--render", action="store_true",
+                       help="render pages without embedded JSON in the shared browser")
+    batch.add_argument("--output", default="labcorp_batch.csv")
+    batch.set_defaults(func=cmd_batch)
+
+    crawl4ai = commands.add_parser("crawl4ai", parents=[tracing],
+                                   help="crawl4ai + LLM extraction (ai_web_crawler)")
+    crawl4ai.add_argument("keyword")
+    # the modes of common.page_cache, spelled out so the parser imports nothing
+    crawl4ai.add_argument("--page-cache",
+                          choices=("read-through", "write-only", "bypass", "revalidate"),
+                          help="page cache mode "
+                               "(default: PAGE_CACHE_MODE in ai_web_crawler/config.py)")
+    crawl4ai.add_argument("--output", default="complete_jobs.csv")
+    crawl4ai.add_argument("--resume", action="store_true")
+    crawl4ai.set_defaults(func=cmd_crawl4ai)
+
+    scrape = commands.add_parser("scrape", parents=[tracing],
+                                 help="parallel Playwright scraper (ai_web_crawler/test.py)")
+    scrape.add_argument("keyword")
+    scrape.add_argument("--workers", type=int, default=4, help="pages in flight (default: 4)")
+    scrape.add_argument("--output", default=DEFAULT_OUTPUT)
+    scrape.set_defaults(func=cmd_scrape)
+
+    crew = commands.add_parser("crew", help="crewai agents (agentic_web_crawler)")
+    crew.add_argument("keyword")
+    crew.set_defaults(func=cmd_crew)
+
+    stored = commands.add_parser("stored", help="list the job store's jobs for a query (no network)")
+    stored.add_argument("keyword")
+    stored.add_argument("--output", help="write them to a .csv, .jsonl or .parquet file instead")
+    stored.set_defaults(func=cmd_stored)
+    return parser
+
+
+def main(argv=None) -> int:
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if getattr(args, "resume", False):
+        from common.sinks import can_append
+
+        try:
+            appendable = can_append(args.output)
+        except ValueError as e:
+            parser.error(str(e))
+        if not appendable:
+            parser.error(f"--resume appends to --output, and {args.output} can't be appended "
+                         f"to; use a .csv or .jsonl file")
+    try:
+        return args.func(args)
+    except ModuleNotFoundError as e:
+        print(f"The {args.command} backend needs {e.name}; install it with "
+              f"pip install -r {REQUIREMENTS.get(args.command, 'requirements.txt')}",
+              file=sys.stderr)
+        return 2
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
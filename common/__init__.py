@@ -0,0 +1,3 @@
+# common/__init__.py
+# Crawler building blocks shared by the root app, ai_web_crawler and
+# agentic_web_crawler.
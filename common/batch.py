@@ -0,0 +1,183 @@
+"""
+Batch crawling: run many keyword queries concurrently and merge the results.
+
+Each query walks the result pages for one keyword. Queries share whatever the
+page fetcher closes over (HTTP session, browser pool, LLM client), and the
+number of queries in flight is capped globally. Jobs found by more than one
+query are kept once, with every keyword that matched them. Jobs with neither
+an id, a URL nor a name can't be matched up and are each kept as they are.
+"""
+import itertools
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+from common.columns import JobColumns
+from common.job_store import JobStore
+from common.listing import RESULTS_PER_PAGE
+from common.pagination import PageLedger, job_key
+from common.retry import MAX_ATTEMPTS, retry_call
+from common.sinks import JOB_FIELDS, JobSink
+from common.tracing import Tracer
+
+DEFAULT_CONCURRENCY = 4
+BATCH_FIELDS: List[str] = JOB_FIELDS + ["keywords"]
+
+# fetch_page(keyword, offset) -> (jobs on that page, total reported by the site or None)
+KeywordPageFetcher = Callable[[str, int], Tuple[List[Dict], Optional[int]]]
+
+_SPACE_RE = re.compile(r"\s+")
+
+
+def normalize_keyword(keyword: str) -> str:
+    """Collapses whitespace and case so equivalent queries are only run once."""
+    return _SPACE_RE.sub(" ", keyword).strip().casefold()
+
+
+def read_keywords(path) -> List[str]:
+    """
+    Reads a keyword file: one query per line, blank lines and ``#`` comments
+    ignored, repeated queries (ignoring case and spacing) dropped.
+
+    Args:
+        path: The keyword file.
+
+    Returns:
+        List[str]: Queries in file order, as first written.
+    """
+    keywords, seen = [], set()
+    for line in Path(path).read_text(encoding="utf-8").splitlines():
+        line = line.split("#", 1)[0].strip()
+        key = normalize_keyword(line)
+        if key and key not in seen:
+            seen.add(key)
+            keywords.append(line)
+    return keywords
+
+
+class BatchResult(NamedTuple):
+    jobs: JobColumns                 # unique jobs, each with its matching "keywords"
+    per_keyword: Dict[str, int]      # jobs found per query (before cross-query dedup)
+    failed: Dict[str, str]           # query -> error for queries that did not finish
+    pages: int
+    seconds: float
+
+
+def crawl_keyword(keyword: str, fetch_page: KeywordPageFetcher,
+                  page_size: int = RESULTS_PER_PAGE,
+                  attempts: int = MAX_ATTEMPTS) -> Tuple[List[Dict], int]:
+    """
+    Walks every result page for one query, then refetches only the offsets
+    that pagination drift may have hidden (common/pagination.py). Each page
+    fetch is retried with backoff on transient errors (common/retry.py), up
+    to `attempts` tries.
+
+    Returns:
+        Tuple[List[Dict], int]: The query's jobs (de-duplicated by canonical
+            job id) and the number of pages fetched.
+    """
+    jobs: List[Dict] = []
+    ledger = PageLedger(page_size)
+
+    def fetch(offset: int) -> Tuple[List[Dict], Optional[int]]:
+        return retry_call(fetch_page, keyword, offset, attempts=attempts,
+                          label=f"Query {keyword!r} at offset {offset}: ")
+
+    offset = 0
+    while True:
+        page_jobs, total = fetch(offset)
+        jobs.extend(ledger.add(offset, page_jobs, total))
+        offset += page_size
+        if not page_jobs or (total is not None and offset >= total):
+            break
+    for offset in ledger.repair_offsets():
+        jobs.extend(ledger.add(offset, *fetch(offset), repair=True))
+    return jobs, ledger.fetched
+
+
+def run_batch(
+    keywords: Iterable[str],
+    fetch_page: KeywordPageFetcher,
+    max_concurrency: int = DEFAULT_CONCURRENCY,
+    sink: Optional[JobSink] = None,
+    store: Optional[JobStore] = None,
+    progress_callback: Optional[Callable[[str, int, int], None]] = None,
+    tracer: Optional[Tracer] = None,
+) -> BatchResult:
+    """
+    Runs one crawl per keyword, at most `max_concurrency` at a time, and merges
+    the results by job_id.
+
+    Args:
+        keywords (Iterable[str]): Queries; equivalent ones are run once.
+        fetch_page (KeywordPageFetcher): Shared page fetcher; must be thread-safe.
+        max_concurrency (int): Queries (and so page fetches) in flight at once.
+        sink (Optional[JobSink]): Receives each query's jobs as soon as the
+            query finishes, so a crash keeps the finished ones. A job is
+            written once, by the first query to finish with it; its
+            "keywords" column names that query. BatchResult.jobs (and the
+            store) have every matching query. Use BATCH_FIELDS as its columns.
+        store (Optional[JobStore]): Records each query's matches persistently.
+        progress_callback: Called as (keyword, jobs found, queries finished).
+        tracer (Optional[Tracer]): Receives a "dedup" and a "write" span per
+            merged query.
+
+    Returns:
+        BatchResult: Merged jobs plus per-query counts and failures.
+    """
+    unique: Dict[str, str] = {}
+    for keyword in keywords:
+        unique.setdefault(normalize_keyword(keyword), keyword.strip())
+    started = time.monotonic()
+    merged: Dict[object, Dict] = {}
+    keyless = itertools.count()
+    per_keyword: Dict[str, int] = {}
+    failed: Dict[str, str] = {}
+    pages = 0
+    tracer = tracer or Tracer()
+
+    with ThreadPoolExecutor(max_workers=max(max_concurrency, 1),
+                            thread_name_prefix="labcorp-batch") as pool:
+        futures = {pool.submit(crawl_keyword, keyword, fetch_page): keyword
+                   for keyword in unique.values()}
+        for done, future in enumerate(as_completed(futures), start=1):
+            keyword = futures[future]
+            try:
+                jobs, keyword_pages = future.result()
+            except Exception as e:
+                print(f"Batch: query {keyword!r} failed: {e}")
+                failed[keyword] = str(e)
+                continue
+            pages += keyword_pages
+            per_keyword[keyword] = len(jobs)
+            with tracer.span("dedup", keyword=keyword, jobs=len(jobs)) as span:
+                new = []
+                for job in jobs:
+                    key = job_key(job)
+                    if key is None:
+                        key = ("keyless", next(keyless))
+                    entry = merged.get(key)
+                    if entry is None:
+                        entry = merged[key] = dict(job, keywords=[])
+                        new.append(job)
+                    entry["keywords"].append(keyword)
+                span["duplicates"] = len(jobs) - len(new)
+            if sink is not None:
+                with tracer.span("write", keyword=keyword, jobs=len(new)):
+                    sink.write_page([dict(job, keywords=keyword) for job in new])
+            if store is not None:
+                store.upsert(jobs, keyword)
+            if progress_callback:
+                progress_callback(keyword, len(jobs), done)
+
+    # order keywords as given, regardless of which query finished first
+    order = {keyword: i for i, keyword in enumerate(unique.values())}
+    rows = []
+    for job in merged.values():
+        job["keywords"] = sorted(job["keywords"], key=order.get)
+        rows.append(job)
+    rows.sort(key=lambda job: order[job["keywords"][0]])
+    return BatchResult(JobColumns.from_rows(rows), per_keyword, failed, pages,
+                       time.monotonic() - started)
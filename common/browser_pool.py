@@ -0,0 +1,176 @@
+import asyncio, atexit, threading, time
+from collections import Counter, deque
+from typing import Optional
+
+from playwright.async_api import Error as PlaywrightError, async_playwright
+from playwright.async_api import TimeoutError as PlaywrightTimeoutError
+
+from common.navigation import LEAN_PROFILE, NavProfile, async_route_handler
+from common.rate_limit import get_limiter
+
+# Warm contexts kept open; up to this many navigations run at once
+POOL_SIZE = 4
+
+
+class BrowserPool:
+    """One long-lived Chromium plus a few warm contexts, shared by the process.
+
+    Playwright objects belong to the event loop that created them, so the pool
+    runs its own asyncio loop on a dedicated (daemon) thread, which also keeps
+    it reachable from the atexit hook. `fetch` blocks the calling thread, any
+    thread, while its navigation runs on that loop. Each context serves one
+    navigation at a time: up to `size` concurrent `fetch` calls (e.g. a batch
+    with ``render=True``) navigate in parallel, and the rest wait for a free one.
+
+    Pages load with the lean navigation `profile` (common/navigation.py):
+    images, fonts, stylesheets and analytics are aborted, and a page is read
+    as soon as a job card or the no-results marker is present. `requests`
+    counts blocked and allowed subrequests.
+    """
+
+    def __init__(self, size: int = POOL_SIZE, headless: bool = True,
+                 profile: NavProfile = LEAN_PROFILE):
+        self.size = max(size, 1)
+        self.headless = headless
+        self.profile = profile
+        self.requests: Counter = Counter()
+        self._playwright = None
+        self._browser = None
+        self._pages: deque = deque()             # idle warm pages, one per context
+        self._slots = asyncio.Semaphore(self.size)
+        self._lock = asyncio.Lock()              # guards launch and relaunch
+        self.launches = 0
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, daemon=True,
+                                        name="labcorp-browser")
+        self._thread.start()
+
+    # ── public API ───────────────────────────────────────────────────────────
+    def fetch(self, url: str, wait_until: Optional[str] = None) -> str:
+        """Navigate a warm page to `url` and return its HTML.
+
+        By default the page is ready per the pool's profile; pass `wait_until`
+        (e.g. "networkidle") to wait for that load state instead. Navigations
+        go through the shared per-host rate limiter; the document's status and
+        Retry-After header are fed back into it.
+        """
+        limiter = get_limiter()
+        limiter.acquire(url)
+        started = time.monotonic()
+        try:
+            html, status, retry_after = self._call(self._fetch(url, wait_until))
+        except PlaywrightError:
+            limiter.record(url, None, time.monotonic() - started, channel="browser")
+            raise
+        limiter.record(url, status, time.monotonic() - started, retry_after, channel="browser")
+        return html
+
+    def shutdown(self) -> None:
+        """Close every context, the browser and the Playwright driver."""
+        self._call(self._close())
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._loop.close()
+
+    # ── loop-thread internals ────────────────────────────────────────────────
+    def _call(self, coro):
+        return asyncio.run_coroutine_threadsafe(coro, self._loop).result()
+
+    async def _launch(self) -> None:
+        await self._close()
+        self._playwright = await async_playwright().start()
+        self._browser = await self._playwright.chromium.launch(headless=self.headless)
+        self.launches += 1
+
+    async def _new_page(self):
+        context = await self._browser.new_context()
+        if self.profile.lean:
+            await context.route("**/*", async_route_handler(self.profile, self.requests))
+        return await context.new_page()
+
+    def _alive(self) -> bool:
+        return self._browser is not None and self._browser.is_connected()
+
+    async def _checkout(self):
+        async with self._lock:
+            if not self._alive():
+                await self._launch()
+        page = self._pages.popleft() if self._pages else None
+        if page is None or page.is_closed():     # none idle yet, or its context died
+            page = await self._new_page()
+        return page
+
+    async def _relaunch(self, launches: int) -> None:
+        """Relaunches a crashed browser, once however many navigations saw it die."""
+        async with self._lock:
+            if self.launches == launches and not self._alive():
+                await self._launch()
+
+    async def _navigate(self, page, url: str, wait_until: Optional[str]):
+        response = await page.goto(url, wait_until=wait_until or self.profile.wait_until)
+        if wait_until is None and self.profile.lean:
+            try:
+                await page.wait_for_selector(self.profile.ready_selector, state="attached",
+                                             timeout=self.profile.timeout_ms)
+            except PlaywrightTimeoutError:
+                print(f"{url}: no job cards or no-results marker after "
+                      f"{self.profile.ready_timeout:.0f}s; using the page as loaded")
+        return response, await page.content()
+
+    async def _fetch(self, url: str, wait_until: Optional[str]):
+        async with self._slots:
+            page = await self._checkout()
+            launches = self.launches
+            try:
+                try:
+                    response, html = await self._navigate(page, url, wait_until)
+                except PlaywrightError:
+                    if self._alive():
+                        raise
+                    # browser crashed mid-request: relaunch once and retry
+                    await self._relaunch(launches)
+                    page = await self._checkout()
+                    response, html = await self._navigate(page, url, wait_until)
+            finally:
+                # whatever happened, the page goes back; a dead one is replaced on checkout
+                self._pages.append(page)
+        if response is None:                 # same-document navigation
+            return html, 200, None
+        return html, response.status, response.headers.get("retry-after")
+
+    async def _close(self) -> None:
+        self._pages.clear()
+        if self._browser is not None:
+            try:
+                await self._browser.close()
+            except PlaywrightError:
+                pass                         # already gone
+            self._browser = None
+        if self._playwright is not None:
+            await self._playwright.stop()
+            self._playwright = None
+
+
+_pool: Optional[BrowserPool] = None
+_pool_lock = threading.Lock()
+
+
+def get_pool() -> BrowserPool:
+    """Return the process-wide pool, creating it on first use."""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = BrowserPool()
+        return _pool
+
+
+def shutdown_browser() -> None:
+    """Explicit shutdown hook; also registered with atexit."""
+    global _pool
+    with _pool_lock:
+        pool, _pool = _pool, None
+    if pool is not None:
+        pool.shutdown()
+
+
+atexit.register(shutdown_browser)
@@ -0,0 +1,192 @@
+"""
+Deterministic, selector-based extraction of LabCorp search-results pages.
+
+This is the one card parser shared by every crawler (`ParsePageTool`,
+`scrape()` and the crewai ``one_page`` tool). It does not build a tree for
+the whole page: it cuts out the job-list region (first job card to the
+next-page link) and parses only that slice with lxml, reading the fields with
+precompiled XPath. Results pages carry a large head and inline scripts, so
+this is many times faster than a full BeautifulSoup parse
+(``python -m benchmarks.parse_cards`` compares the two).
+"""
+import re
+from typing import Dict, List, Optional
+from urllib.parse import urljoin
+
+from lxml import etree
+
+from common.listing import SITE, offset_of
+
+CARD_SELECTOR = '[data-ph-at-id="jobs-list-item"]'
+LINK_SELECTOR = 'a[data-ph-at-id="job-link"]'
+LOCATION_SELECTOR = '[data-ph-at-id="job-location"]'
+CATEGORY_SELECTOR = '[data-ph-at-id="job-category"]'
+NEXT_SELECTOR = 'a[data-ph-at-id="pagination-next-link"]'
+
+_TOTAL_RE = re.compile(r"Showing\s+(\d+)\s+results", re.I)
+_JOB_PATH_RE = re.compile(r"/job/([^/?#]+)")
+_CARD_MARK_RE = re.compile(r"""data-ph-at-id\s*=\s*["']?jobs-list-item\b""")
+_NEXT_MARK_RE = re.compile(r"""data-ph-at-id\s*=\s*["']?pagination-next-link\b""")
+
+# XPath equivalents of the selectors above
+_CARDS = etree.XPath('//*[@data-ph-at-id="jobs-list-item"]')
+_LINK = etree.XPath('.//a[@data-ph-at-id="job-link"]')
+_LOCATION = etree.XPath('.//*[@data-ph-at-id="job-location"]')
+_CATEGORY = etree.XPath('.//*[@data-ph-at-id="job-category"]')
+_NEXT = etree.XPath('//a[@data-ph-at-id="pagination-next-link"]')
+_TEXTS = etree.XPath(".//text()")
+
+
+def job_id_from(url: str) -> str:
+    """
+    Derives the job id from a job URL (``/job/<id>/<slug>``).
+
+    Args:
+        url (str): Absolute or site-relative job URL.
+
+    Returns:
+        str: The id segment, or the last ``-`` separated token as a fallback.
+    """
+    match = _JOB_PATH_RE.search(url)
+    if match:
+        return match.group(1)
+    return url.rstrip("/").split("-")[-1]
+
+
+def job_url(href: str) -> str:
+    """
+    The absolute URL of a job or pagination link, whether `href` is absolute
+    or site-relative.
+
+    >>> job_url("/global/en/job/2530100/QA-Engineer") == SITE + "/global/en/job/2530100/QA-Engineer"
+    True
+    >>> job_url("https://example.com/global/en/job/1/x")
+    'https://example.com/global/en/job/1/x'
+    """
+    return urljoin(SITE, href.strip())
+
+
+def canonical_job_id(url: str, *candidates: Optional[str]) -> str:
+    """
+    The job id for a card: the first non-empty candidate (the link's
+    ``data-ph-at-job-id-text``, then the card's ``data-job-id``), else the id
+    in the job URL.
+
+    >>> canonical_job_id("https://x/global/en/job/2530100/QA-Engineer", None, " ")
+    '2530100'
+    >>> canonical_job_id("https://x/global/en/job/2530100/QA-Engineer", " 42 ")
+    '42'
+    """
+    for candidate in candidates:
+        if candidate and candidate.strip():
+            return candidate.strip()
+    return job_id_from(url)
+
+
+def _text(nodes: List) -> str:
+    """Whitespace-normalised text of the first node, like bs4's ``get_text(" ", strip=True)``."""
+    if not nodes:
+        return ""
+    return " ".join(part.strip() for part in _TEXTS(nodes[0]) if part.strip())
+
+
+def parse_total(html: str) -> Optional[int]:
+    """
+    Reads the "Showing N results" header.
+
+    Args:
+        html (str): Page HTML.
+
+    Returns:
+        Optional[int]: The reported total, or None if absent.
+    """
+    match = _TOTAL_RE.search(html)
+    return int(match.group(1)) if match else None
+
+
+def _job_region(html: str) -> Optional[str]:
+    """
+    The part of `html` that holds the job cards and the next-page link: from
+    the tag of the first card to the end of the next link, or to the end of
+    the page when that link is missing or precedes a card. None when the page
+    has neither.
+    """
+    first = _CARD_MARK_RE.search(html) or _NEXT_MARK_RE.search(html)
+    if first is None:
+        return None
+    start = max(html.rfind("<", 0, first.start()), 0)
+    end = len(html)
+    next_mark = _NEXT_MARK_RE.search(html, first.start())
+    if next_mark and not _CARD_MARK_RE.search(html, next_mark.end()):
+        close = html.find("</a>", next_mark.end())
+        if close != -1:
+            end = close + len("</a>")
+    return html[start:end]
+
+
+def _parse_region(html: str):
+    region = _job_region(html)
+    if region is None or not region.strip():
+        return None
+    return etree.HTML(region)
+
+
+def _cards(root) -> List[Dict]:
+    jobs: List[Dict] = []
+    if root is None:
+        return jobs
+    for card in _CARDS(root):
+        links = _LINK(card)
+        href = links[0].get("href") if links else None
+        if not href:
+            continue
+        link = links[0]
+        url = job_url(href)
+        jobs.append({
+            "title": _text(links),
+            "location": _text(_LOCATION(card)),
+            "category": _text(_CATEGORY(card)),
+            "job_id": canonical_job_id(url, link.get("data-ph-at-job-id-text"),
+                                       card.get("data-job-id")),
+            "url": url,
+        })
+    return jobs
+
+
+def parse_cards(html: str) -> List[Dict]:
+    """
+    Extracts the job cards from one results page.
+
+    Args:
+        html (str): Page HTML.
+
+    Returns:
+        List[Dict]: One dict per card with title, location, category, job_id
+            and url (absolute).
+    """
+    return _cards(_parse_region(html))
+
+
+def extract_page(html: str) -> Dict:
+    """
+    Extracts job cards, the next-page link and the total from one results page.
+
+    Args:
+        html (str): Page HTML.
+
+    Returns:
+        Dict: ``{"jobs": [...], "next_page": str | None, "total_jobs": int | None}``
+            where each job has title, location, category, job_id and url.
+    """
+    root = _parse_region(html)
+    jobs = _cards(root)
+
+    total = parse_total(html)
+    next_page = None
+    next_links = _NEXT(root) if root is not None else []
+    if next_links and next_links[0].get("href", "#") != "#":
+        next_page = job_url(next_links[0].get("href"))
+        if total is not None and offset_of(next_page) >= total:
+            next_page = None
+
+    return {"jobs": jobs, "next_page": next_page, "total_jobs": total}
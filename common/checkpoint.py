@@ -0,0 +1,208 @@
+"""
+Durable crawl checkpoints.
+
+After every completed page the crawler records which pages are done, where
+to go next and the rows found so far (or only their keys, when a sink holds
+them on disk). Each page is one line appended to a JSON Lines log next to
+the checkpoint, with the canonical keys of its rows and, when rows are kept,
+the rows themselves. The small state file (pages done, next page, counts) is
+then replaced atomically. Saving a page therefore costs the size of that page,
+not of the whole crawl, and an interrupted crawl can be resumed from its last
+good page without refetching or re-parsing anything.
+"""
+import hashlib
+import json
+import os
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from common.columns import JobColumns
+from common.llm_cache import CACHE_DIR
+from common.pagination import job_key
+
+CHECKPOINT_DIR = CACHE_DIR / "checkpoints"
+
+
+class CrawlIncomplete(RuntimeError):
+    """A crawl stopped before its last page; its checkpoint can resume it."""
+
+    def __init__(self, checkpoint: "Checkpoint"):
+        super().__init__(f"stopped after {len(checkpoint.completed)} page(s) and "
+                         f"{checkpoint.rows} row(s); progress saved to {checkpoint.path}")
+        self.checkpoint = checkpoint
+
+
+class Checkpoint:
+    """
+    Progress of one crawl, identified by a kind ("labcorp", "crawl4ai", ...)
+    and a key (start URL or keyword).
+
+    Args:
+        kind (str): Which crawler wrote it.
+        key (str): What was crawled.
+        keep_jobs (bool): Store the rows themselves. Leave off when a sink
+            already writes them to disk; only their keys and count are kept then.
+        directory (Optional[Path]): Where checkpoint files live.
+    """
+
+    def __init__(self, kind: str, key: str, keep_jobs: bool = True,
+                 directory: Optional[Path] = None):
+        digest = hashlib.sha1(f"{kind}\0{key}".encode("utf-8")).hexdigest()[:16]
+        self.path = Path(directory or CHECKPOINT_DIR) / f"{kind}-{digest}.json"
+        self.log_path = self.path.with_suffix(".jsonl")
+        self.keep_jobs = keep_jobs
+        self.state: Dict[str, Any] = {
+            "kind": kind, "key": key, "next": None, "total": None,
+            "completed": [], "rows": 0, "updated": None,
+        }
+        self._seen = set()
+        self._jobs = JobColumns()
+        self._log = None
+        self._loaded = False
+
+    # ── state ────────────────────────────────────────────────────────────────
+    @property
+    def next(self) -> Any:
+        return self.state["next"]
+
+    @property
+    def total(self) -> Optional[int]:
+        return self.state["total"]
+
+    @property
+    def completed(self) -> List[Any]:
+        return self.state["completed"]
+
+    @property
+    def rows(self) -> int:
+        return self.state["rows"]
+
+    @property
+    def jobs(self) -> JobColumns:
+        """The rows found so far; a sequence of dicts built on access."""
+        return self._jobs
+
+    @property
+    def seen(self) -> set:
+        """Canonical keys (common.pagination.job_key) of every row recorded so far."""
+        return self._seen
+
+    # ── persistence ──────────────────────────────────────────────────────────
+    def exists(self) -> bool:
+        return self.path.exists()
+
+    def load(self) -> bool:
+        """Reads the saved state and replays the page log; returns False when there is none."""
+        try:
+            state = json.loads(self.path.read_text(encoding="utf-8"))
+        except FileNotFoundError:
+            return False
+        except ValueError as e:
+            print(f"Checkpoint {self.path} is unreadable ({e}); starting over.")
+            return False
+        self.state.update(state)
+        self._replay()
+        self._loaded = True
+        return True
+
+    def _replay(self) -> None:
+        """
+        Adds the logged pages to the keys and rows. Lines past the last page
+        the state file records (a crash between the two writes) or cut short
+        are dropped from the log, so the resumed crawl appends after them.
+        """
+        pages, good = len(self.completed), 0
+        try:
+            f = open(self.log_path, "r+b")
+        except FileNotFoundError:
+            return
+        with f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    break
+                if not line.endswith(b"\n") or entry.get("page", pages + 1) > pages:
+                    break
+                self._seen.update(entry.get("keys") or [])
+                if self.keep_jobs:
+                    self._jobs.extend(entry.get("jobs") or [])
+                good += len(line)
+            f.truncate(good)
+
+    def save(self) -> None:
+        self.state["updated"] = datetime.now(timezone.utc).isoformat(timespec="seconds")
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix(".tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(self.state, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, self.path)
+
+    def _append(self, entry: Dict) -> None:
+        """Appends one page's line to the log and forces it to disk."""
+        if self._log is None:
+            self.log_path.parent.mkdir(parents=True, exist_ok=True)
+            # a fresh crawl replaces any old log; a resumed one continues it
+            self._log = open(self.log_path, "a" if self._loaded else "w", encoding="utf-8")
+        self._log.write(json.dumps(entry, ensure_ascii=False) + "\n")
+        self._log.flush()
+        os.fsync(self._log.fileno())
+
+    def page_done(self, page: Any, next_page: Any, jobs: List[Dict],
+                  total: Optional[int] = None) -> None:
+        """Logs a finished page, then saves where the crawl continues."""
+        keys = [key for key in map(job_key, jobs) if key is not None]
+        self.state["completed"].append(page)
+        self.state["next"] = next_page
+        if total is not None:
+            self.state["total"] = total
+        self.state["rows"] += len(jobs)
+        self._seen.update(keys)
+        entry = {"page": len(self.completed), "keys": keys}
+        if self.keep_jobs:
+            self._jobs.extend(jobs)
+            entry["jobs"] = list(jobs)
+        self._append(entry)
+        self.save()
+
+    def close(self) -> None:
+        if self._log is not None:
+            self._log.close()
+            self._log = None
+
+    def finish(self) -> None:
+        """The crawl reached its end: nothing left to resume."""
+        self.close()
+        for path in (self.path, self.log_path):
+            try:
+                path.unlink()
+            except FileNotFoundError:
+                pass
+
+
+def open_checkpoint(kind: str, key: str, resume: bool = False,
+                    keep_jobs: bool = True) -> Checkpoint:
+    """
+    Returns the checkpoint for a crawl, loaded from disk when resuming.
+
+    Args:
+        kind (str): Crawler name.
+        key (str): Start URL or keyword.
+        resume (bool): Continue from a saved checkpoint if there is one;
+            otherwise any old checkpoint is overwritten by the new crawl.
+        keep_jobs (bool): See Checkpoint.
+
+    Returns:
+        Checkpoint: Fresh or restored progress.
+    """
+    checkpoint = Checkpoint(kind, key, keep_jobs)
+    if resume:
+        if checkpoint.load():
+            print(f"Resuming {kind} crawl of {key!r}: {len(checkpoint.completed)} page(s), "
+                  f"{checkpoint.rows} row(s) already done; next is {checkpoint.next!r}.")
+        else:
+            print(f"No checkpoint for {kind} crawl of {key!r}; starting from the beginning.")
+    return checkpoint
@@ -0,0 +1,246 @@
+"""
+Compact, column-oriented accumulator for job rows.
+
+A crawl that keeps its rows in memory used to hold one dict per job (or one
+pydantic model), which costs several hundred bytes per row before the
+strings themselves, and every consumer copied them again into a DataFrame.
+`JobColumns` stores one list per field instead. The repetitive fields
+(location, category, employment_type) are dictionary-encoded: each distinct
+value is stored once and rows hold a 4-byte code in an ``array``.
+
+Pages are appended with `extend`. `to_pandas` and `to_arrow` build a
+DataFrame (categoricals for encoded fields) or an Arrow table (dictionary
+arrays) straight from the columns, without going through per-row objects.
+The accumulator is also a read-only ``Sequence`` of dicts, so existing
+callers can index, slice, iterate and ``len()`` it; those dicts are built on
+demand.
+
+Appends are thread-safe, and readers see whole rows. `len` grows only after
+every column has the new row, and readers slice the columns to the length
+they read first.
+"""
+import json
+import threading
+from array import array
+from collections.abc import Sequence
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Union
+
+from common.sinks import JOB_FIELDS
+
+ENCODED_FIELDS = ("location", "category", "employment_type")
+_MISSING = -1
+
+
+class _Encoded:
+    """A dictionary-encoded string column: distinct values plus one code per row."""
+
+    __slots__ = ("codes", "values", "index")
+
+    def __init__(self, length: int = 0):
+        self.codes = array("i", [_MISSING]) * length
+        self.values: List[str] = []
+        self.index: Dict[str, int] = {}
+
+    def append(self, value: Any) -> None:
+        if value is None:
+            self.codes.append(_MISSING)
+            return
+        value = value if isinstance(value, str) else str(value)
+        code = self.index.get(value)
+        if code is None:
+            code = self.index[value] = len(self.values)
+            self.values.append(value)
+        self.codes.append(code)
+
+    def __getitem__(self, i: int) -> Optional[str]:
+        code = self.codes[i]
+        return None if code == _MISSING else self.values[code]
+
+    def decoded(self, n: int) -> List[Optional[str]]:
+        values = self.values
+        return [None if code == _MISSING else values[code] for code in self.codes[:n]]
+
+
+class JobColumns(Sequence):
+    """
+    Append-only table of job rows, stored by column.
+
+    Args:
+        fields (Optional[Iterable[str]]): Initial column order (default: the Job
+            fields). Keys first seen in later rows become new columns,
+            backfilled with None.
+        encoded (Iterable[str]): Fields to dictionary-encode.
+
+    >>> jobs = JobColumns()
+    >>> jobs.extend([{"title": "QA", "location": "Durham", "job_id": "1"},
+    ...              {"title": "SDET", "location": "Durham", "job_id": "2", "extra": 5}])
+    >>> len(jobs), jobs[1]["location"], jobs[0]["extra"], jobs.fields[-1]
+    (2, 'Durham', None, 'extra')
+    >>> [row["title"] for row in jobs[-2:]]
+    ['QA', 'SDET']
+    """
+
+    def __init__(self, fields: Optional[Iterable[str]] = None,
+                 encoded: Iterable[str] = ENCODED_FIELDS):
+        self._encoded = set(encoded)
+        self._columns: Dict[str, Union[_Encoded, list]] = {}
+        self._length = 0
+        self._lock = threading.Lock()
+        for field in JOB_FIELDS if fields is None else fields:
+            self._add_column(field)
+
+    @classmethod
+    def from_rows(cls, rows: Iterable[Dict], fields: Optional[Iterable[str]] = None,
+                  encoded: Iterable[str] = ENCODED_FIELDS) -> "JobColumns":
+        table = cls(fields, encoded)
+        table.extend(rows)
+        return table
+
+    def _add_column(self, field: str) -> None:
+        self._columns[field] = (_Encoded(self._length) if field in self._encoded
+                                else [None] * self._length)
+
+    # ── writing ──────────────────────────────────────────────────────────────
+    def append(self, row: Dict) -> None:
+        self.extend((row,))
+
+    def extend(self, rows: Iterable[Dict]) -> None:
+        """Appends one page (or any iterable) of rows."""
+        with self._lock:
+            for row in rows:
+                for field in row:
+                    if field not in self._columns:
+                        self._add_column(field)
+                for field, column in self._columns.items():
+                    column.append(row.get(field))
+                self._length += 1
+
+    # ── reading ──────────────────────────────────────────────────────────────
+    @property
+    def fields(self) -> List[str]:
+        return list(self._columns)
+
+    def __len__(self) -> int:
+        return self._length
+
+    def _row(self, i: int, columns) -> Dict:
+        return {field: column[i] for field, column in columns}
+
+    def __getitem__(self, index):
+        n = self._length
+        columns = list(self._columns.items())
+        if isinstance(index, slice):
+            return [self._row(i, columns) for i in range(*index.indices(n))]
+        if index < 0:
+            index += n
+        if not 0 <= index < n:
+            raise IndexError("JobColumns index out of range")
+        return self._row(index, columns)
+
+    def __iter__(self) -> Iterator[Dict]:
+        n = self._length
+        columns = list(self._columns.items())
+        for i in range(n):
+            yield self._row(i, columns)
+
+    def rows(self, limit: Optional[int] = None) -> List[Dict]:
+        """The first `limit` rows (default: all) as dicts."""
+        return self[:len(self) if limit is None else limit]
+
+    def column(self, field: str, limit: Optional[int] = None) -> List[Any]:
+        """One field's values for the first `limit` rows (default: all)."""
+        n = self._length if limit is None else min(limit, self._length)
+        column = self._columns[field]
+        return column.decoded(n) if isinstance(column, _Encoded) else column[:n]
+
+    def distinct(self, field: str) -> List[str]:
+        """The distinct values of an encoded field, in order of first appearance."""
+        return list(self._columns[field].values)
+
+    # ── conversion ───────────────────────────────────────────────────────────
+    def to_pandas(self, limit: Optional[int] = None):
+        """
+        A DataFrame of the first `limit` rows (default: all). Encoded fields
+        become categoricals built from their codes.
+        """
+        import pandas as pd
+
+        n = self._length if limit is None else min(limit, self._length)
+        data = {}
+        for field, column in list(self._columns.items()):
+            if isinstance(column, _Encoded):
+                codes = _codes(column, n)
+                data[field] = pd.Categorical.from_codes(codes, categories=list(column.values))
+            else:
+                data[field] = column[:n]
+        return pd.DataFrame(data, columns=list(data))
+
+    def to_arrow(self, limit: Optional[int] = None):
+        """
+        A pyarrow Table of the first `limit` rows (default: all). Encoded fields
+        become dictionary arrays over a copy of their codes; other columns are
+        strings, or JSON text for non-scalar values.
+        """
+        import pyarrow as pa
+
+        n = self._length if limit is None else min(limit, self._length)
+        arrays, names = [], []
+        for field, column in list(self._columns.items()):
+            if isinstance(column, _Encoded):
+                codes = _codes(column, n)
+                indices = pa.array(codes, mask=codes == _MISSING)
+                arrays.append(pa.DictionaryArray.from_arrays(
+                    indices, pa.array(column.values, pa.string())))
+            else:
+                arrays.append(pa.array([_scalar(value) for value in column[:n]], pa.string()))
+            names.append(field)
+        return pa.Table.from_arrays(arrays, names=names)
+
+    # ── persistence ──────────────────────────────────────────────────────────
+    def to_state(self) -> Dict[str, Any]:
+        """A JSON-serialisable form, e.g. for checkpoints."""
+        n = self._length
+        columns = {}
+        for field, column in list(self._columns.items()):
+            if isinstance(column, _Encoded):
+                columns[field] = {"values": list(column.values), "codes": column.codes[:n].tolist()}
+            else:
+                columns[field] = column[:n]
+        return {"length": n, "columns": columns}
+
+    @classmethod
+    def from_state(cls, state: Union[Dict[str, Any], List[Dict]]) -> "JobColumns":
+        """Rebuilds a table from `to_state` output, or from a plain list of row dicts."""
+        if isinstance(state, list):
+            return cls.from_rows(state)
+        table = cls(fields=())
+        for field, data in state["columns"].items():
+            if isinstance(data, dict):
+                column = _Encoded()
+                column.values = list(data["values"])
+                column.index = {value: code for code, value in enumerate(column.values)}
+                column.codes = array("i", data["codes"])
+                table._encoded.add(field)
+            else:
+                column = list(data)
+            table._columns[field] = column
+        table._length = state["length"]
+        return table
+
+
+def _codes(column: _Encoded, n: int):
+    """
+    The first `n` codes as an int32 numpy array. The codes are copied: a numpy
+    view would export the ``array`` buffer, and while a DataFrame or Arrow table
+    built on it is alive ``extend`` could not grow the array (BufferError).
+    """
+    import numpy as np
+    return np.array(column.codes[:n], dtype=np.int32)
+
+
+def _scalar(value: Any) -> Optional[str]:
+    if value is None or isinstance(value, str):
+        return value
+    if isinstance(value, (int, float, bool)):
+        return str(value)
+    return json.dumps(value, ensure_ascii=False)
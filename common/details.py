@@ -0,0 +1,340 @@
+"""
+Job-detail enrichment.
+
+Search results only carry title, location, category, id and URL. This stage
+fetches each job's detail page and adds its employment type, posting and
+closing dates and description. The data comes from the page's JSON-LD
+``JobPosting`` block when there is one; otherwise, given a chat model, from
+an LLM reading the pruned page.
+
+Detail pages are fetched by a bounded thread pool through the shared per-host
+rate limiter. Results are cached on disk by ``job_id`` together with a hash of
+the listing row, so later runs only fetch jobs that are new, whose listing
+changed, or whose entry is older than the TTL. A refetched page whose posting
+content hashes the same as before reuses the stored fields without another
+model call.
+"""
+import hashlib
+import html as html_lib
+import json
+import re
+import sqlite3
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+import requests
+
+from common.listing import fetch_html
+from common.llm_cache import CACHE_DIR
+from common.llm_json import parse_json_reply
+from common.retry import retry_call
+from common.sinks import JOB_FIELDS
+from common.tracing import Tracer, llm_usage
+
+DETAIL_FIELDS: List[str] = ["employment_type", "date_posted", "valid_through", "description"]
+DETAILED_FIELDS: List[str] = JOB_FIELDS + DETAIL_FIELDS
+# Detail pages in flight at once; the rate limiter still paces each host
+DETAIL_CONCURRENCY = 4
+DETAIL_TTL = 7 * 24 * 3600
+NOT_SPECIFIED = "Not specified"
+
+# schema.org employmentType values
+EMPLOYMENT_TYPES = {
+    "FULL_TIME": "Full-time", "PART_TIME": "Part-time", "CONTRACTOR": "Contract",
+    "TEMPORARY": "Temporary", "INTERN": "Internship", "VOLUNTEER": "Volunteer",
+    "PER_DIEM": "Per diem", "OTHER": "Other",
+}
+
+_LD_JSON_RE = re.compile(
+    r"""<script[^>]*type\s*=\s*["']application/ld\+json["'][^>]*>(.*?)</script>""",
+    re.I | re.S)
+_TAG_RE = re.compile(r"<[^>]+>")
+_SPACE_RE = re.compile(r"\s+")
+
+DETAIL_PROMPT = """
+You're given the text of one LabCorp job posting.
+Return ONLY valid JSON with keys:
+- employment_type: "Full-time", "Part-time", "Contract", "Temporary", etc.,
+  or "Not specified" if the posting doesn't say
+- date_posted: the posting date as YYYY-MM-DD, or null
+- valid_through: the closing date as YYYY-MM-DD, or null
+- description: the job description as plain text
+
+Posting:
+{page}
+"""
+
+
+def _hash(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def listing_hash(job: Dict) -> str:
+    """Hash of a job's listing fields; a change means its detail page is fetched again."""
+    return _hash(json.dumps({field: job.get(field) for field in JOB_FIELDS}, sort_keys=True))
+
+
+def employment_type(value: Any) -> str:
+    """
+    Readable employment type from a JSON-LD ``employmentType``.
+
+    >>> employment_type("FULL_TIME")
+    'Full-time'
+    >>> employment_type(["PART_TIME", "TEMPORARY"])
+    'Part-time, Temporary'
+    >>> employment_type(None)
+    'Not specified'
+    """
+    values = value if isinstance(value, list) else [value]
+    names = [EMPLOYMENT_TYPES.get(str(v).strip().upper(), str(v).strip())
+             for v in values if v and str(v).strip()]
+    return ", ".join(names) or NOT_SPECIFIED
+
+
+def plain_text(markup: Optional[str]) -> str:
+    """
+    HTML fragment to whitespace-normalised text.
+
+    >>> plain_text("<p>QA &amp; test</p>\\n<ul><li>Duties</li></ul>")
+    'QA & test Duties'
+    """
+    if not markup:
+        return ""
+    return _SPACE_RE.sub(" ", html_lib.unescape(_TAG_RE.sub(" ", markup))).strip()
+
+
+def _postings(node: Any) -> Iterable[Dict]:
+    """JobPosting objects in a JSON-LD document, including inside lists and ``@graph``."""
+    if isinstance(node, list):
+        for item in node:
+            yield from _postings(item)
+    elif isinstance(node, dict):
+        types = node.get("@type")
+        if "JobPosting" in (types if isinstance(types, list) else [types]):
+            yield node
+        yield from _postings(node.get("@graph"))
+
+
+def find_job_posting(html: str) -> Optional[Dict]:
+    """The page's first JSON-LD ``JobPosting`` object, or None."""
+    for block in _LD_JSON_RE.findall(html):
+        try:
+            document = json.loads(block, strict=False)
+        except json.JSONDecodeError:
+            continue
+        for posting in _postings(document):
+            return posting
+    return None
+
+
+def _date(value: Any) -> Optional[str]:
+    return str(value)[:10] if value else None
+
+
+def parse_job_posting(posting: Dict) -> Dict:
+    """
+    Maps a JSON-LD ``JobPosting`` onto the detail fields.
+
+    >>> parse_job_posting({"employmentType": "FULL_TIME", "datePosted": "2026-10-01T00:00:00Z",
+    ...                    "description": "<p>Test things</p>"})
+    {'employment_type': 'Full-time', 'date_posted': '2026-10-01', 'valid_through': None, 'description': 'Test things'}
+    """
+    return {
+        "employment_type": employment_type(posting.get("employmentType")),
+        "date_posted": _date(posting.get("datePosted")),
+        "valid_through": _date(posting.get("validThrough")),
+        "description": plain_text(posting.get("description")),
+    }
+
+
+class CachedDetail(NamedTuple):
+    job_id: str
+    listing_hash: str
+    content_hash: Optional[str]
+    data: Dict
+    fetched_at: float
+
+
+class DetailCache:
+    """SQLite store of extracted detail fields, keyed by job id."""
+
+    def __init__(self, path: Optional[Path] = None, ttl: float = DETAIL_TTL):
+        self.path = Path(path or CACHE_DIR / "details.sqlite3")
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS details ("
+            " job_id TEXT PRIMARY KEY, listing_hash TEXT NOT NULL, content_hash TEXT,"
+            " data TEXT NOT NULL, fetched_at REAL NOT NULL)"
+        )
+        self._conn.commit()
+
+    def get(self, job_id: str) -> Optional[CachedDetail]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT job_id, listing_hash, content_hash, data, fetched_at"
+                " FROM details WHERE job_id = ?", (job_id,)
+            ).fetchone()
+        if row is None:
+            return None
+        return CachedDetail(row[0], row[1], row[2], json.loads(row[3]), row[4])
+
+    def is_current(self, entry: CachedDetail, job: Dict) -> bool:
+        """True when `entry` is recent enough and was made from the same listing row."""
+        return (entry.listing_hash == listing_hash(job)
+                and time.time() - entry.fetched_at <= self.ttl)
+
+    def put(self, job: Dict, content_hash: Optional[str], data: Dict) -> None:
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO details"
+                " (job_id, listing_hash, content_hash, data, fetched_at)"
+                " VALUES (?, ?, ?, ?, ?)",
+                (str(job["job_id"]), listing_hash(job), content_hash, json.dumps(data),
+                 time.time()),
+            )
+            self._conn.commit()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM details")
+            self._conn.commit()
+
+
+class DetailEnricher:
+    """
+    Adds the DETAIL_FIELDS to job rows, page by page.
+
+    Args:
+        llm: Optional chat model (``invoke``) used for pages without JSON-LD.
+            Without one, such jobs get "Not specified" and empty fields.
+        cache (Optional[DetailCache]): Defaults to the shared one on disk.
+        use_cache (bool): False fetches every job and stores nothing.
+        max_concurrency (int): Detail pages in flight at once.
+        session (Optional[requests.Session]): HTTP session (default: shared).
+        tracer (Optional[Tracer]): Receives an "enrichment" span per page, a
+            "navigation" span per detail page fetched and an "llm" span per
+            model call. Failed fetches and unreadable replies are recorded as
+            errors on them.
+    """
+
+    def __init__(self, llm=None, cache: Optional[DetailCache] = None, use_cache: bool = True,
+                 max_concurrency: int = DETAIL_CONCURRENCY,
+                 session: Optional[requests.Session] = None, tracer: Optional[Tracer] = None):
+        self.llm = llm
+        self.cache = (cache or DetailCache()) if use_cache else None
+        self.session = session
+        self.tracer = tracer or Tracer()
+        self.counts: Counter = Counter()
+        self._counts_lock = threading.Lock()
+        self._pool = ThreadPoolExecutor(max_workers=max(max_concurrency, 1),
+                                        thread_name_prefix="details")
+
+    def __enter__(self) -> "DetailEnricher":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def _count(self, name: str) -> None:
+        with self._counts_lock:
+            self.counts[name] += 1
+
+    def enrich(self, jobs: List[Dict], page: Optional[int] = None, **tags) -> List[Dict]:
+        """
+        Returns copies of `jobs` with the detail fields filled in, in the same order.
+
+        Cached jobs are served without a request; the rest are fetched
+        concurrently. A job whose page can't be fetched keeps its listing
+        fields and gets empty detail fields.
+        """
+        with self.tracer.span("enrichment", page, jobs=len(jobs), **tags) as span:
+            results = list(self._pool.map(lambda job: self._enrich_one(job, page, tags), jobs))
+            span["fetched"] = sum(fetched for _, fetched in results)
+        return [row for row, _ in results]
+
+    def _enrich_one(self, job: Dict, page: Optional[int], tags: Dict) -> Tuple[Dict, bool]:
+        """The enriched row, and whether its detail page was requested."""
+        job_id = str(job.get("job_id") or "")
+        entry = self.cache.get(job_id) if self.cache is not None and job_id else None
+        if entry is not None and self.cache.is_current(entry, job):
+            self._count("cached")
+            return {**job, **entry.data}, False
+        if not job.get("url"):
+            self._count("failed")
+            return {**job, **self._empty()}, False
+        try:
+            # a failure is recorded as the span's error
+            with self.tracer.span("navigation", page, source="details", job_id=job_id,
+                                  **tags) as span:
+                html = retry_call(lambda: fetch_html(job["url"], self.session, timeout=30).text,
+                                  label=f"Details {job_id}: ")
+                span["bytes"] = len(html)
+        except Exception:
+            self._count("failed")
+            return {**job, **self._empty()}, True
+        data = self._extract(html, entry, page, tags)
+        if data is None:
+            # unreadable model reply: not cached, so the next run asks again
+            return {**job, **self._empty()}, True
+        content_hash = data.pop("_content_hash")
+        if self.cache is not None and job_id:
+            self.cache.put(job, content_hash, data)
+        return {**job, **data}, True
+
+    def _extract(self, html: str, entry: Optional[CachedDetail], page,
+                 tags: Dict) -> Optional[Dict]:
+        """Detail fields plus ``_content_hash``; None when the model's reply doesn't parse."""
+        posting = find_job_posting(html)
+        if posting is not None:
+            content_hash = _hash(json.dumps(posting, sort_keys=True))
+            self._count("json_ld")
+            return {**parse_job_posting(posting), "_content_hash": content_hash}
+        if self.llm is None:
+            self._count("no_json_ld")
+            return {**self._empty(), "_content_hash": None}
+
+        from common.prune import prepare_for_llm
+        content = prepare_for_llm(html)[0]
+        content_hash = _hash(content)
+        if entry is not None and entry.content_hash == content_hash:
+            self._count("unchanged")
+            return {**entry.data, "_content_hash": content_hash}
+        prompt = DETAIL_PROMPT.format(page=content)
+        started = time.perf_counter()
+        reply = self.llm.invoke(prompt)
+        usage = llm_usage(prompt, reply, time.perf_counter() - started)
+        data = parse_json_reply(str(getattr(reply, "content", reply)))
+        error = None if isinstance(data, dict) else "UnparseableReply"
+        self.tracer.record("llm", usage.pop("seconds"), page, error=error, source="details",
+                           **tags, **usage)
+        if error:
+            self._count("unparseable")
+            return None
+        self._count("llm")
+        return {
+            "employment_type": data.get("employment_type") or NOT_SPECIFIED,
+            "date_posted": _date(data.get("date_posted")),
+            "valid_through": _date(data.get("valid_through")),
+            "description": plain_text(data.get("description")),
+            "_content_hash": content_hash,
+        }
+
+    @staticmethod
+    def _empty() -> Dict:
+        return {"employment_type": NOT_SPECIFIED, "date_posted": None,
+                "valid_through": None, "description": ""}
+
+    def stats(self) -> Dict[str, int]:
+        """Jobs served from the cache, fetched (by JSON-LD, LLM or neither), unparseable and failed."""
+        with self._counts_lock:
+            return dict(self.counts)
+
+    def close(self) -> None:
+        self._pool.shutdown(wait=True)
@@ -0,0 +1,100 @@
+"""
+On-demand export of result rows to in-memory files.
+
+Every writer streams the rows straight into a ``BytesIO`` without building a
+DataFrame copy first. Excel uses openpyxl's write-only mode, which serialises
+rows as it goes instead of keeping a cell object for each value.
+"""
+import csv
+import io
+import json
+from typing import Callable, Dict, Iterable, List, NamedTuple, Optional, Sequence
+
+
+class ExportFormat(NamedTuple):
+    extension: str
+    mime: str
+    write: Callable[[Sequence[Dict], List[str], io.BytesIO], None]
+
+
+def columns_of(rows: Iterable[Dict]) -> List[str]:
+    """Every key used by the rows, in order of first appearance."""
+    fields: Dict[str, None] = {}
+    for row in rows:
+        for key in row:
+            fields.setdefault(key, None)
+    return list(fields)
+
+
+def _cell(value):
+    if value is None or isinstance(value, (str, int, float, bool)):
+        return value
+    return json.dumps(value, ensure_ascii=False)
+
+
+def _write_csv(rows: Sequence[Dict], fields: List[str], out: io.BytesIO) -> None:
+    text = io.TextIOWrapper(out, encoding="utf-8", newline="", write_through=True)
+    writer = csv.DictWriter(text, fieldnames=fields, extrasaction="ignore", lineterminator="\n")
+    writer.writeheader()
+    writer.writerows(rows)
+    text.detach()                      # leave `out` open for the caller
+
+
+def _write_jsonl(rows: Sequence[Dict], fields: List[str], out: io.BytesIO) -> None:
+    for row in rows:
+        out.write(json.dumps({field: row.get(field) for field in fields},
+                             ensure_ascii=False).encode("utf-8"))
+        out.write(b"\n")
+
+
+def _write_xlsx(rows: Sequence[Dict], fields: List[str], out: io.BytesIO) -> None:
+    from openpyxl import Workbook
+
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet("Jobs")
+    sheet.append(fields)
+    for row in rows:
+        sheet.append([_cell(row.get(field)) for field in fields])
+    workbook.save(out)
+
+
+def _write_parquet(rows: Sequence[Dict], fields: List[str], out: io.BytesIO) -> None:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    if hasattr(rows, "to_arrow") and set(fields) <= set(rows.fields):
+        # JobColumns: straight from the columns, keeping the dictionary encoding
+        pq.write_table(rows.to_arrow().select(fields), out)
+        return
+    columns = {field: [None if row.get(field) is None else str(_cell(row.get(field)))
+                       for row in rows] for field in fields}
+    schema = pa.schema([(field, pa.string()) for field in fields])
+    pq.write_table(pa.table(columns, schema=schema), out)
+
+
+EXPORT_FORMATS: Dict[str, ExportFormat] = {
+    "CSV": ExportFormat("csv", "text/csv", _write_csv),
+    "Excel": ExportFormat(
+        "xlsx", "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet", _write_xlsx),
+    "Parquet": ExportFormat("parquet", "application/vnd.apache.parquet", _write_parquet),
+    "JSON Lines": ExportFormat("jsonl", "application/x-ndjson", _write_jsonl),
+}
+
+
+def export_rows(rows: Sequence[Dict], fmt: str, fields: Optional[List[str]] = None) -> bytes:
+    """
+    Serialises rows in one of EXPORT_FORMATS.
+
+    Args:
+        rows (Sequence[Dict]): The result rows.
+        fmt (str): A key of EXPORT_FORMATS ("CSV", "Excel", "Parquet", "JSON Lines").
+        fields (Optional[List[str]]): Column order; defaults to every key seen.
+
+    Returns:
+        bytes: The file contents.
+    """
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"Unknown export format {fmt!r}; use one of {list(EXPORT_FORMATS)}")
+    out = io.BytesIO()
+    EXPORT_FORMATS[fmt].write(rows, fields or columns_of(rows), out)
+    return out.getvalue()
@@ -0,0 +1,202 @@
+"""
+Persistent job store and incremental ("delta") crawling.
+
+The store keeps every job ever seen, keyed by its canonical id
+(common.pagination.job_key, the same key the crawlers de-duplicate by), with
+first/last seen timestamps, plus which keyword queries matched it. A delta crawl walks the
+recency-sorted results (``s=1``) and stops as soon as a page holds only jobs
+the store already knows for that query.
+"""
+import json
+import sqlite3
+import threading
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, NamedTuple, Optional, Set, Tuple
+
+from common.listing import RESULTS_PER_PAGE
+from common.llm_cache import CACHE_DIR
+from common.pagination import job_key
+
+# fetch_page(offset) -> (jobs on that page, total reported by the site or None)
+PageFetcher = Callable[[int], Tuple[List[Dict], Optional[int]]]
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat(timespec="seconds")
+
+
+class DeltaResult(NamedTuple):
+    added: List[Dict]
+    removed: List[str]
+    unchanged: List[str]
+    pages: int
+    complete: bool          # False when removals could not be verified
+
+
+class JobStore:
+    """SQLite store of jobs and the keyword queries that matched them."""
+
+    def __init__(self, path: Optional[Path] = None):
+        self.path = Path(path or CACHE_DIR / "jobs.sqlite3")
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.executescript(
+            "CREATE TABLE IF NOT EXISTS jobs ("
+            " job_id TEXT PRIMARY KEY, data TEXT NOT NULL,"
+            " first_seen TEXT NOT NULL, last_seen TEXT NOT NULL);"
+            "CREATE TABLE IF NOT EXISTS matches ("
+            " keyword TEXT NOT NULL, job_id TEXT NOT NULL,"
+            " first_seen TEXT NOT NULL, last_seen TEXT NOT NULL,"
+            " active INTEGER NOT NULL DEFAULT 1,"
+            " PRIMARY KEY (keyword, job_id));"
+        )
+        self._conn.commit()
+
+    def active_ids(self, keyword: str) -> Set[str]:
+        """Job ids currently listed for `keyword`, as of the last crawl."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT job_id FROM matches WHERE keyword = ? AND active = 1", (keyword,)
+            ).fetchall()
+        return {row[0] for row in rows}
+
+    def upsert(self, jobs: Iterable[Dict], keyword: str, seen_at: Optional[str] = None) -> None:
+        """
+        Records jobs as seen now for `keyword` (first_seen is kept). Jobs with
+        no key (no id, URL or name) can't be matched later and are skipped.
+        """
+        seen_at = seen_at or _now()
+        with self._lock:
+            for job in jobs:
+                job_id = job_key(job)
+                if job_id is None:
+                    continue
+                self._conn.execute(
+                    "INSERT INTO jobs (job_id, data, first_seen, last_seen) VALUES (?, ?, ?, ?)"
+                    " ON CONFLICT(job_id) DO UPDATE SET data = excluded.data,"
+                    " last_seen = excluded.last_seen",
+                    (job_id, json.dumps(job), seen_at, seen_at),
+                )
+                self._touch(keyword, job_id, seen_at)
+            self._conn.commit()
+
+    def touch(self, job_ids: Iterable[str], keyword: str, seen_at: Optional[str] = None) -> None:
+        """Marks known jobs as still listed without rewriting their data."""
+        seen_at = seen_at or _now()
+        with self._lock:
+            for job_id in job_ids:
+                self._conn.execute(
+                    "UPDATE jobs SET last_seen = ? WHERE job_id = ?", (seen_at, job_id)
+                )
+                self._touch(keyword, job_id, seen_at)
+            self._conn.commit()
+
+    def _touch(self, keyword: str, job_id: str, seen_at: str) -> None:
+        self._conn.execute(
+            "INSERT INTO matches (keyword, job_id, first_seen, last_seen, active)"
+            " VALUES (?, ?, ?, ?, 1)"
+            " ON CONFLICT(keyword, job_id) DO UPDATE SET last_seen = excluded.last_seen,"
+            " active = 1",
+            (keyword, job_id, seen_at, seen_at),
+        )
+
+    def mark_removed(self, job_ids: Iterable[str], keyword: str) -> None:
+        with self._lock:
+            self._conn.executemany(
+                "UPDATE matches SET active = 0 WHERE keyword = ? AND job_id = ?",
+                [(keyword, job_id) for job_id in job_ids],
+            )
+            self._conn.commit()
+
+    def get(self, job_id: str) -> Optional[Dict]:
+        """The stored job with its first_seen/last_seen timestamps."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT data, first_seen, last_seen FROM jobs WHERE job_id = ?", (job_id,)
+            ).fetchone()
+        if row is None:
+            return None
+        return dict(json.loads(row[0]), first_seen=row[1], last_seen=row[2])
+
+    def jobs_for(self, keyword: str) -> List[Dict]:
+        """Every job currently listed for `keyword`."""
+        return [job for job in (self.get(job_id) for job_id in sorted(self.active_ids(keyword))) if job]
+
+
+def delta_crawl(
+    keyword: str,
+    fetch_page: PageFetcher,
+    store: JobStore,
+    page_size: int = RESULTS_PER_PAGE,
+) -> DeltaResult:
+    """
+    Crawls only as far as needed to find new jobs for `keyword`.
+
+    Pages must come back newest first. Crawling stops at the first page with
+    no unknown jobs, provided the site's reported total equals the known count
+    plus the new jobs (i.e. nothing was removed). If the counts disagree, the
+    crawl continues to the end so the removed jobs can be identified.
+
+    Args:
+        keyword (str): The search query; the store tracks matches per query.
+        fetch_page (PageFetcher): Returns (jobs, reported total) for an offset.
+        store (JobStore): The persistent store to diff against and update.
+        page_size (int): Results per page.
+
+    Returns:
+        DeltaResult: Added jobs, removed and unchanged job ids, pages fetched,
+            and whether removals were verified.
+    """
+    known = store.active_ids(keyword)
+    full = not known                      # first run for this query: take everything
+    seen: Set[str] = set()
+    added: List[Dict] = []
+    total: Optional[int] = None
+    offset = pages = 0
+    reached_end = False
+    complete = True
+
+    while True:
+        jobs, page_total = fetch_page(offset)
+        pages += 1
+        total = page_total if page_total is not None else total
+        if not jobs:
+            reached_end = True
+            break
+
+        new_on_page = 0
+        for job in jobs:
+            job_id = job_key(job)
+            if job_id is None:                # nothing to match it by: always new
+                added.append(job)
+                new_on_page += 1
+                continue
+            if job_id in seen:
+                continue
+            seen.add(job_id)
+            if job_id not in known:
+                added.append(job)
+                new_on_page += 1
+        store.upsert(jobs, keyword)
+
+        offset += page_size
+        if total is not None and offset >= total:
+            reached_end = True
+            break
+        if not full and new_on_page == 0:
+            if total is None:
+                complete = False      # can't verify removals; assume none
+                break
+            if len(known) + len(added) == total:
+                break
+            print(f"Delta crawl: site reports {total} jobs, store expects "
+                  f"{len(known) + len(added)}; crawling on to find removals.")
+            full = True
+
+    removed = sorted(known - seen) if reached_end else []
+    unchanged = sorted(known - set(removed))
+    store.touch([job_id for job_id in unchanged if job_id not in seen], keyword)
+    store.mark_removed(removed, keyword)
+    return DeltaResult(added, removed, unchanged, pages, complete)
@@ -0,0 +1,284 @@
+"""
+Browserless fast path for Phenom-hosted search-results pages.
+
+The careers site ships the first page of search hits as JSON inside the page
+source (``phApp.ddo = {...}``). Fetching the results URL over a pooled HTTP
+session and decoding that blob gives the same job list a browser render would,
+without Chromium or an LLM. When the blob is missing, callers fall back to
+their browser path.
+"""
+import json
+import os
+import re
+import sys
+import threading
+import time
+from typing import List, NamedTuple, Optional
+from urllib.parse import parse_qs, quote, urlencode, urlsplit, urlunsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from ai_web_crawler.models.job import Job
+from common.rate_limit import get_limiter
+
+# Override to point every crawler at another host, e.g. the offline benchmark site
+SITE = os.getenv("LABCORP_SITE", "https://careers.labcorp.com").rstrip("/")
+RESULTS_PER_PAGE = 20
+JOB_URL = SITE + "/global/en/job/{job_id}/{slug}"
+SEARCH_URL = SITE + "/global/en/search-results?keywords={keywords}&from={offset}&s=1"
+HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36",
+    "Accept": "text/html,application/xhtml+xml",
+    "Accept-Encoding": "gzip, deflate",
+    "Connection": "keep-alive",
+}
+
+_DDO_MARKER = re.compile(r"phApp\.ddo\s*=\s*")
+_session: Optional[requests.Session] = None
+_session_lock = threading.Lock()
+
+
+class ListingPage(NamedTuple):
+    jobs: List[Job]
+    total: Optional[int]
+
+
+def search_url(keyword: str, offset: int = 0) -> str:
+    """
+    Builds a recency-sorted (``s=1``) search-results URL.
+
+    Args:
+        keyword (str): Search keywords.
+        offset (int): Result offset (``from=``).
+
+    Returns:
+        str: The URL.
+    """
+    return SEARCH_URL.format(keywords=quote(keyword), offset=offset)
+
+
+def get_session(pool_size: int = 10) -> requests.Session:
+    """
+    Returns the process-wide keep-alive session.
+
+    Args:
+        pool_size (int): Connections kept open per host.
+
+    Returns:
+        requests.Session: A session with a sized connection pool and gzip enabled.
+    """
+    global _session
+    with _session_lock:
+        if _session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            session.headers.update(HEADERS)
+            _session = session
+        return _session
+
+
+def extract_search_data(html: str) -> Optional[dict]:
+    """
+    Decodes the embedded ``eagerLoadRefineSearch`` block from a results page.
+
+    Args:
+        html (str): Raw page source.
+
+    Returns:
+        Optional[dict]: The search block, or None if the page doesn't embed it.
+    """
+    match = _DDO_MARKER.search(html)
+    if not match:
+        return None
+    try:
+        ddo, _ = json.JSONDecoder().raw_decode(html, match.end())
+    except json.JSONDecodeError:
+        return None
+    search = ddo.get("eagerLoadRefineSearch") if isinstance(ddo, dict) else None
+    if not isinstance(search, dict) or "data" not in search:
+        return None
+    return search
+
+
+def _slug(title: str) -> str:
+    return re.sub(r"[^A-Za-z0-9]+", "-", title).strip("-")
+
+
+def to_job(raw: dict) -> Job:
+    """
+    Maps one embedded job record onto the Job model.
+
+    Args:
+        raw (dict): A record from ``eagerLoadRefineSearch.data.jobs``.
+
+    Returns:
+        Job: The normalised job.
+    """
+    title = (raw.get("title") or "").strip()
+    job_id = str(raw.get("jobId") or raw.get("jobSeqNo") or "")
+    location = raw.get("location") or raw.get("cityStateCountry") or ", ".join(
+        part for part in (raw.get("city"), raw.get("state"), raw.get("country")) if part)
+    category = raw.get("category") or ""
+    if isinstance(category, list):
+        category = ", ".join(category)
+    return Job(
+        title=title,
+        location=location,
+        category=category,
+        job_id=job_id,
+        url=JOB_URL.format(job_id=job_id, slug=_slug(title)),
+    )
+
+
+def parse_listing(html: str) -> Optional[ListingPage]:
+    """
+    Parses the embedded search JSON of one results page.
+
+    Args:
+        html (str): Raw page source.
+
+    Returns:
+        Optional[ListingPage]: Jobs and the reported total, or None when the
+            page has no embedded search data (use the browser path instead).
+    """
+    search = extract_search_data(html)
+    if search is None:
+        return None
+    raw_jobs = (search.get("data") or {}).get("jobs") or []
+    total = search.get("totalHits")
+    return ListingPage(
+        jobs=[to_job(raw) for raw in raw_jobs],
+        total=int(total) if total is not None else None,
+    )
+
+
+def fetch_html(
+    url: str,
+    session: Optional[requests.Session] = None,
+    timeout: float = 15,
+    headers: Optional[dict] = None,
+    method: str = "GET",
+) -> requests.Response:
+    """
+    GETs (or, with `method`, HEADs) a URL through the shared per-host rate limiter.
+
+    Waits for the host's token bucket and then feeds the status, latency and
+    any Retry-After header back into it. A failed request also counts as a
+    throttling signal.
+
+    Args:
+        url (str): The URL.
+        session (Optional[requests.Session]): Defaults to the shared session.
+        timeout (float): Request timeout in seconds.
+        headers (Optional[dict]): Extra request headers.
+        method (str): HTTP method.
+
+    Returns:
+        requests.Response: The response, already checked with raise_for_status.
+    """
+    session = session or get_session()
+    limiter = get_limiter()
+    limiter.acquire(url)
+    started = time.monotonic()
+    try:
+        response = session.request(method, url, timeout=timeout, headers=headers)
+    except requests.RequestException:
+        limiter.record(url, None, time.monotonic() - started)
+        raise
+    limiter.record(url, response.status_code, time.monotonic() - started,
+                   response.headers.get("Retry-After"))
+    response.raise_for_status()
+    return response
+
+
+def fetch_listing(
+    url: str,
+    session: Optional[requests.Session] = None,
+    timeout: float = 15,
+) -> Optional[ListingPage]:
+    """
+    Fetches a results URL over plain HTTP and decodes its embedded job list.
+
+    Args:
+        url (str): The search-results URL.
+        session (Optional[requests.Session]): Session to use; defaults to the
+            shared keep-alive session.
+        timeout (float): Request timeout in seconds.
+
+    Returns:
+        Optional[ListingPage]: The parsed page, or None when the fast path
+            can't serve it (HTTP error or no embedded JSON).
+    """
+    try:
+        response = fetch_html(url, session, timeout)
+    except requests.RequestException as e:
+        print(f"Fast path failed for {url}: {e}")
+        return None
+    return parse_listing(response.text)
+
+
+def offset_of(url: str) -> int:
+    """
+    The result offset (``from=``) of a results URL; 0 when it has none.
+
+    >>> offset_of("https://x/global/en/search-results?keywords=qa&from=40&s=1")
+    40
+    """
+    try:
+        return int(parse_qs(urlsplit(url).query).get("from", ["0"])[0])
+    except ValueError:
+        return 0
+
+
+def page_url(url: str, offset: int) -> str:
+    """
+    The same results URL with ``from=`` set to `offset`.
+
+    >>> page_url("https://x/global/en/search-results?keywords=qa%20test&from=40&s=1", 7)
+    'https://x/global/en/search-results?keywords=qa%20test&from=7&s=1'
+    """
+    parts = urlsplit(url)
+    query = parse_qs(parts.query)
+    query["from"] = [str(offset)]
+    return urlunsplit(parts._replace(query=urlencode(query, doseq=True, quote_via=quote)))
+
+
+def next_page_url(
+    url: str,
+    total: Optional[int],
+    count: int,
+    page_size: int = RESULTS_PER_PAGE,
+) -> Optional[str]:
+    """
+    Builds the URL of the following results page by advancing ``from=``.
+
+    Args:
+        url (str): The current results URL.
+        total (Optional[int]): Total hits reported by the site, if known.
+        count (int): Number of jobs on the current page.
+        page_size (int): Results per page.
+
+    Returns:
+        Optional[str]: The next URL, or None on the last page.
+    """
+    offset = offset_of(url) + page_size
+    if total is None and count < page_size:
+        return None
+    if total is not None and offset >= total:
+        return None
+    return page_url(url, offset)
+
+
+if __name__ == "__main__":
+    # Offline check against a saved page: python -m common.listing fixtures/<file>.html
+    with open(sys.argv[1], encoding="utf-8") as f:
+        page = parse_listing(f.read())
+    if page is None:
+        print("No embedded search data; the browser path would be used.")
+    else:
+        print(f"{len(page.jobs)} jobs (total reported: {page.total})")
+        for job in page.jobs:
+            print(job.model_dump())
@@ -0,0 +1,150 @@
+"""
+Content-addressed, on-disk cache for LLM extraction results.
+
+Entries are keyed by a hash of the (pruned) page content, the prompt template,
+the model name and the output schema, so a page is only re-sent to the model
+when one of those changes. Entries expire after a TTL and the least recently
+used ones are evicted once the cache grows past its size limit.
+"""
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+CACHE_DIR = Path(os.getenv("LABCORP_CACHE_DIR", Path.home() / ".cache" / "labcorp_scraper"))
+# Bump to invalidate every cached extraction (e.g. after changing post-processing).
+SCHEMA_VERSION = "1"
+DEFAULT_TTL = 7 * 24 * 3600
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+
+def make_key(content: str, prompt: str, model: str, schema: str = "") -> str:
+    """
+    Builds the cache key for one extraction.
+
+    Args:
+        content (str): The (pruned) page content sent to the model.
+        prompt (str): The prompt template or instruction.
+        model (str): Model / provider name.
+        schema (str): Serialised output schema.
+
+    Returns:
+        str: Hex SHA-256 digest.
+    """
+    digest = hashlib.sha256()
+    for part in (SCHEMA_VERSION, model, schema, prompt, content):
+        digest.update(part.encode("utf-8"))
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+class LLMCache:
+    """SQLite-backed key/value store with TTL expiry and LRU size bounding."""
+
+    def __init__(
+        self,
+        path: Optional[Path] = None,
+        ttl: float = DEFAULT_TTL,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+    ):
+        self.path = Path(path or CACHE_DIR / "llm_cache.sqlite3")
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS entries ("
+            " key TEXT PRIMARY KEY, value TEXT NOT NULL,"
+            " created REAL NOT NULL, accessed REAL NOT NULL, size INTEGER NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS entries_accessed ON entries (accessed)")
+        self._conn.commit()
+
+    def get(self, key: str) -> Optional[Any]:
+        """Returns the cached value, or None on a miss or an expired entry."""
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, created FROM entries WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None or now - row[1] > self.ttl:
+                if row is not None:
+                    self._conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+                    self._conn.commit()
+                self.misses += 1
+                return None
+            self._conn.execute("UPDATE entries SET accessed = ? WHERE key = ?", (now, key))
+            self._conn.commit()
+            self.hits += 1
+        return json.loads(row[0])
+
+    def set(self, key: str, value: Any) -> None:
+        """Stores a JSON-serialisable value and evicts LRU entries over the size limit."""
+        payload = json.dumps(value)
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO entries (key, value, created, accessed, size)"
+                " VALUES (?, ?, ?, ?, ?)",
+                (key, payload, now, now, len(payload)),
+            )
+            self._evict()
+            self._conn.commit()
+
+    def _evict(self) -> None:
+        now = time.time()
+        expired = self._conn.execute(
+            "DELETE FROM entries WHERE created < ?", (now - self.ttl,)
+        ).rowcount
+        self.evictions += max(expired, 0)
+        total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        for key, size in self._conn.execute(
+            "SELECT key, size FROM entries ORDER BY accessed ASC"
+        ).fetchall():
+            self._conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+            self.evictions += 1
+            total -= size
+            if total <= self.max_bytes:
+                break
+
+    def clear(self) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM entries")
+            self._conn.commit()
+
+    def stats(self) -> Dict[str, int]:
+        """Hit/miss/eviction counters for this process plus the current entry count."""
+        with self._lock:
+            entries, size = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM entries"
+            ).fetchone()
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "entries": entries,
+            "bytes": size,
+        }
+
+
+_cache: Optional[LLMCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_cache() -> LLMCache:
+    """Returns the process-wide cache, opening it on first use."""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = LLMCache()
+        return _cache
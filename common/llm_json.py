@@ -0,0 +1,63 @@
+"""
+Recovering JSON from chat-model replies.
+
+Models asked for "ONLY valid JSON" still wrap it in Markdown fences or add a
+sentence before or after it. These helpers strip that and are shared by every
+place that parses model output. The examples double as tests:
+
+    python -m doctest common/llm_json.py -v
+"""
+import json
+import re
+from typing import Any, Optional
+
+_FENCE_RE = re.compile(r"```(?:json)?\s*\n?(.*?)```", re.DOTALL | re.IGNORECASE)
+
+
+def extract_json_text(reply: str) -> str:
+    """
+    Returns the JSON part of a model reply, as text.
+
+    Valid JSON is returned unchanged. Otherwise the first fenced code block
+    is used, and as a last resort everything from the first ``{`` to the last
+    ``}``.
+
+    >>> extract_json_text('{"jobs": []}')
+    '{"jobs": []}'
+    >>> extract_json_text('Here you go:\\n```json\\n{"jobs": []}\\n```')
+    '{"jobs": []}'
+    >>> extract_json_text('```\\n{"jobs": []}\\n```')
+    '{"jobs": []}'
+    >>> extract_json_text('Sure! {"jobs": [{"id": 1}]} Hope this helps.')
+    '{"jobs": [{"id": 1}]}'
+    >>> extract_json_text('no json at all')
+    'no json at all'
+    """
+    text = reply.strip()
+    try:
+        json.loads(text)
+        return text
+    except json.JSONDecodeError:
+        pass
+    match = _FENCE_RE.search(text)
+    if match:
+        return match.group(1).strip()
+    start, end = text.find("{"), text.rfind("}")
+    if start != -1 and end > start:
+        return text[start:end + 1]
+    return text
+
+
+def parse_json_reply(reply: str) -> Optional[Any]:
+    """
+    Parses a model reply as JSON after `extract_json_text`.
+
+    >>> parse_json_reply('```json\\n{"next_page": null}\\n```')
+    {'next_page': None}
+    >>> parse_json_reply('I could not find any jobs.') is None
+    True
+    """
+    try:
+        return json.loads(extract_json_text(reply))
+    except json.JSONDecodeError:
+        return None
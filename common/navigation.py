@@ -0,0 +1,129 @@
+"""
+Lean page loads for the browser paths.
+
+Rendering a results page only needs its document and scripts. The lean
+profile aborts images, media, fonts, stylesheets and requests to known
+analytics hosts, and it treats a page as ready as soon as a job card or the
+"No Results Found" marker is in the DOM, instead of waiting for
+``networkidle``. It is used by the shared Playwright `BrowserPool`, by
+`scrape()` and, through crawl4ai's hooks, by the ``ai_web_crawler`` path.
+
+Configuration (environment):
+    LABCORP_LEAN_NAV=0          load pages fully (``networkidle``) instead
+    LABCORP_BLOCK_TYPES=a,b     resource types to abort (replaces the default)
+    LABCORP_BLOCK_HOSTS=a,b     extra hosts to abort (added to the default)
+    LABCORP_READY_TIMEOUT=30    seconds to wait for the ready selector
+
+This module does not import Playwright; it works on whatever page, context
+and route objects the caller passes in, sync or async.
+"""
+import os
+from collections import Counter
+from typing import NamedTuple, Optional, Tuple
+from urllib.parse import urlsplit
+
+from common.cards import CARD_SELECTOR
+
+BLOCKED_RESOURCE_TYPES: Tuple[str, ...] = ("image", "media", "font", "stylesheet")
+BLOCKED_HOSTS: Tuple[str, ...] = (
+    "google-analytics.com", "googletagmanager.com", "doubleclick.net", "googleadservices.com",
+    "facebook.net", "facebook.com", "connect.facebook.net", "hotjar.com", "clarity.ms",
+    "bing.com", "linkedin.com", "licdn.com", "demdex.net", "omtrdc.net", "adobedtm.com",
+    "newrelic.com", "nr-data.net", "optimizely.com", "qualtrics.com", "segment.io",
+    "segment.com", "cookielaw.org", "onetrust.com", "youtube.com", "ytimg.com",
+)
+NO_RESULTS_SELECTOR = '[data-ph-at-id="no-results"]'
+READY_SELECTOR = f"{CARD_SELECTOR}, {NO_RESULTS_SELECTOR}"
+READY_TIMEOUT = 30.0
+
+
+def _env_list(name: str) -> Optional[Tuple[str, ...]]:
+    value = os.getenv(name)
+    if value is None:
+        return None
+    return tuple(item.strip().lower() for item in value.split(",") if item.strip())
+
+
+class NavProfile(NamedTuple):
+    """How a browser path loads a results page."""
+    lean: bool = True
+    resource_types: Tuple[str, ...] = BLOCKED_RESOURCE_TYPES
+    hosts: Tuple[str, ...] = BLOCKED_HOSTS
+    ready_selector: str = READY_SELECTOR
+    ready_timeout: float = READY_TIMEOUT
+
+    @classmethod
+    def from_env(cls) -> "NavProfile":
+        """The default profile, adjusted by the LABCORP_* variables above."""
+        return cls(
+            lean=os.getenv("LABCORP_LEAN_NAV", "1") != "0",
+            resource_types=_env_list("LABCORP_BLOCK_TYPES") or BLOCKED_RESOURCE_TYPES,
+            hosts=BLOCKED_HOSTS + (_env_list("LABCORP_BLOCK_HOSTS") or ()),
+            ready_timeout=float(os.getenv("LABCORP_READY_TIMEOUT", READY_TIMEOUT)),
+        )
+
+    @property
+    def wait_until(self) -> str:
+        """The ``goto`` wait state: the DOM only when readiness comes from the selector."""
+        return "domcontentloaded" if self.lean else "networkidle"
+
+    @property
+    def timeout_ms(self) -> float:
+        return self.ready_timeout * 1000
+
+    def should_block(self, url: str, resource_type: str) -> bool:
+        """
+        True when a request is not needed to read the job cards.
+
+        >>> profile = NavProfile()
+        >>> profile.should_block("https://careers.labcorp.com/logo.png", "image")
+        True
+        >>> profile.should_block("https://www.google-analytics.com/g/collect", "xhr")
+        True
+        >>> profile.should_block("https://careers.labcorp.com/global/en/search-results", "document")
+        False
+        >>> NavProfile(lean=False).should_block("https://careers.labcorp.com/logo.png", "image")
+        False
+        """
+        if not self.lean:
+            return False
+        if resource_type in self.resource_types:
+            return True
+        host = (urlsplit(url).hostname or "").lower()
+        return any(host == blocked or host.endswith("." + blocked) for blocked in self.hosts)
+
+
+LEAN_PROFILE = NavProfile.from_env()
+
+
+def route_handler(profile: NavProfile = LEAN_PROFILE, counter: Optional[Counter] = None):
+    """
+    A sync Playwright route handler that aborts what `profile` blocks. Counts
+    "blocked" and "allowed" requests in `counter` when one is given.
+    """
+    tally = counter if counter is not None else Counter()
+
+    def handle(route) -> None:
+        request = route.request
+        if profile.should_block(request.url, request.resource_type):
+            tally["blocked"] += 1
+            route.abort()
+        else:
+            tally["allowed"] += 1
+            route.continue_()
+    return handle
+
+
+def async_route_handler(profile: NavProfile = LEAN_PROFILE, counter: Optional[Counter] = None):
+    """Async version of `route_handler`, for Playwright's async API and crawl4ai."""
+    tally = counter if counter is not None else Counter()
+
+    async def handle(route) -> None:
+        request = route.request
+        if profile.should_block(request.url, request.resource_type):
+            tally["blocked"] += 1
+            await route.abort()
+        else:
+            tally["allowed"] += 1
+            await route.continue_()
+    return handle
@@ -0,0 +1,147 @@
+"""
+On-disk cache of raw fetched page HTML with HTTP revalidation.
+
+Modes:
+    read-through  serve cached pages as-is, fetch and store on a miss
+    write-only    always fetch, store the result (warms the cache)
+    bypass        never read or write the cache (the default)
+    revalidate    serve a cached page only after a conditional HEAD request
+                  says it is unchanged (304, or the same ETag/Last-Modified)
+
+Validators come from the headers of the response that was cached, so storing
+a page costs no request. There is no content-hash fallback: a page stored
+without an ETag or Last-Modified is never served in revalidate mode and costs
+no request either. For such pages, which include the dynamic search-results
+pages, revalidate is effectively write-only.
+"""
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Mapping, NamedTuple, Optional
+
+import requests
+
+from common.listing import fetch_html
+from common.llm_cache import CACHE_DIR
+
+READ_THROUGH = "read-through"
+WRITE_ONLY = "write-only"
+BYPASS = "bypass"
+REVALIDATE = "revalidate"
+MODES = (READ_THROUGH, WRITE_ONLY, BYPASS, REVALIDATE)
+
+
+class CachedPage(NamedTuple):
+    url: str
+    html: str
+    etag: Optional[str]
+    last_modified: Optional[str]
+    fetched_at: float
+
+
+class PageCache:
+    """URL -> HTML store plus the validators needed to revalidate it."""
+
+    def __init__(self, mode: str = BYPASS, path: Optional[Path] = None):
+        if mode not in MODES:
+            raise ValueError(f"Unknown page cache mode {mode!r}; expected one of {MODES}")
+        self.mode = mode
+        self.path = Path(path or CACHE_DIR / "pages.sqlite3")
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.hits = 0
+        self.misses = 0
+        self.revalidated = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS pages ("
+            " url TEXT PRIMARY KEY, html TEXT NOT NULL, etag TEXT,"
+            " last_modified TEXT, fetched_at REAL NOT NULL)"
+        )
+        self._conn.commit()
+
+    @property
+    def reads(self) -> bool:
+        return self.mode in (READ_THROUGH, REVALIDATE)
+
+    @property
+    def writes(self) -> bool:
+        return self.mode != BYPASS
+
+    def get(self, url: str) -> Optional[CachedPage]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT url, html, etag, last_modified, fetched_at"
+                " FROM pages WHERE url = ?", (url,)
+            ).fetchone()
+        return CachedPage(*row) if row else None
+
+    def put(self, url: str, html: str, headers: Optional[Mapping[str, str]] = None) -> None:
+        """
+        Stores a page, with the ETag and Last-Modified of the response it came
+        from (`headers`, e.g. a crawl result's ``response_headers``) for later
+        revalidation.
+        """
+        headers = {k.lower(): v for k, v in (headers or {}).items()}
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO pages"
+                " (url, html, etag, last_modified, fetched_at)"
+                " VALUES (?, ?, ?, ?, ?)",
+                (url, html, headers.get("etag"), headers.get("last-modified"), time.time()),
+            )
+            self._conn.commit()
+
+    def is_fresh(self, page: CachedPage) -> bool:
+        """
+        Revalidates a cached page against the site with a conditional HEAD.
+
+        A 304 means unchanged, as does a 200 carrying the stored ETag or
+        Last-Modified (servers that ignore conditions on HEAD). A page stored
+        without validators is stale without asking.
+        """
+        if not (page.etag or page.last_modified):
+            return False
+        headers = {}
+        if page.etag:
+            headers["If-None-Match"] = page.etag
+        if page.last_modified:
+            headers["If-Modified-Since"] = page.last_modified
+        try:
+            response = fetch_html(page.url, headers=headers, method="HEAD")
+        except requests.RequestException as e:
+            print(f"Page cache: revalidation failed for {page.url}: {e}")
+            return False
+        if response.status_code == 304:
+            return True
+        if page.etag:
+            return response.headers.get("ETag") == page.etag
+        return response.headers.get("Last-Modified") == page.last_modified
+
+    def lookup(self, url: str) -> Optional[str]:
+        """
+        Returns cached HTML for `url` when the mode allows serving it, else None.
+        """
+        if not self.reads:
+            return None
+        page = self.get(url)
+        if page is None:
+            self.misses += 1
+            return None
+        if self.mode == REVALIDATE:
+            if not self.is_fresh(page):
+                self.misses += 1
+                return None
+            self.revalidated += 1
+        self.hits += 1
+        return page.html
+
+    def store(self, url: str, html: str, headers: Optional[Mapping[str, str]] = None) -> None:
+        """Stores freshly fetched HTML, and its response's validators, when the mode writes."""
+        if self.writes:
+            self.put(url, html, headers)
+
+    def stats(self) -> dict:
+        return {"mode": self.mode, "hits": self.hits, "misses": self.misses,
+                "revalidated": self.revalidated}
@@ -0,0 +1,195 @@
+"""
+Drift-safe pagination over ``from=`` offsets.
+
+Results pages are addressed by offset (``from=0,20,40...``), so a posting
+added or removed while a query is being walked shifts every later row. An
+insertion before a page pushes rows already seen onto it (duplicates) and
+leaves the new posting behind on a page already fetched. A removal pulls
+rows back across a page boundary, so they are never seen.
+
+`PageLedger` records every page a crawl fetches: its offset, the canonical
+ids of its rows, the total the site reported and when it was fetched. It
+drops rows seen before, so each crawl yields every job once. At each
+boundary between adjacent pages it compares the two pages:
+
+- overlap, where the later-fetched page repeats rows of the other: that many
+  postings were inserted before it, and are looked for from the first page on;
+- a lower total on the later-fetched page with no overlap: that many postings
+  were removed, and the rows that slid back across the boundary are refetched
+  with a ``from=`` pointing just before it.
+
+Pages past the last one fetched are refetched too when the latest total says
+the walk stopped short.
+
+`repair_offsets` yields only those offsets. Each gap stops as soon as its
+missing rows are back, so drift costs a page or two, not a second crawl::
+
+    ledger = PageLedger()
+    for offset in walk:                     # the crawler's own loop
+        new_rows = ledger.add(offset, *fetch(offset))
+    for offset in ledger.repair_offsets():
+        new_rows = ledger.add(offset, *fetch(offset), repair=True)
+"""
+import time
+from typing import Dict, Iterator, List, NamedTuple, Optional, Set, Tuple
+
+from common.cards import canonical_job_id
+from common.listing import RESULTS_PER_PAGE
+
+
+def job_key(job: Dict) -> Optional[str]:
+    """
+    The id rows are de-duplicated by: the job id, else the id in the job URL,
+    else the name. None when the row has none of them.
+
+    >>> job_key({"job_id": " 2530100 ", "url": "https://x/global/en/job/2530100/QA"})
+    '2530100'
+    >>> job_key({"job_id": "", "url": "/global/en/job/2530100/QA"})
+    '2530100'
+    """
+    job_id, url = job.get("job_id"), job.get("url")
+    if job_id is not None and str(job_id).strip() or url:
+        return canonical_job_id(str(url or ""), str(job_id) if job_id is not None else None)
+    name = job.get("name")
+    return str(name) if name is not None else None
+
+
+class PageRecord(NamedTuple):
+    offset: int
+    keys: Tuple[str, ...]            # canonical ids on the page, duplicates included
+    total: Optional[int]             # total the site reported with it
+    fetched_at: float
+
+
+class Gap(NamedTuple):
+    start: int                       # first offset to refetch
+    stop: int                        # refetch offsets below this
+    missing: int                     # rows expected back
+    reason: str                      # "inserted" or "removed"
+    boundary: int                    # offset of the page where the drift showed
+
+
+class PageLedger:
+    """
+    Pages fetched by one crawl, with in-run dedup and drift detection.
+
+    Args:
+        page_size (int): Results per page.
+        seen (Optional[Set[str]]): Keys already emitted, e.g. a resumed
+            checkpoint's. Updated in place.
+    """
+
+    def __init__(self, page_size: int = RESULTS_PER_PAGE, seen: Optional[Set[str]] = None):
+        self.page_size = page_size
+        self.seen: Set[str] = seen if seen is not None else set()
+        self.pages: Dict[int, PageRecord] = {}
+        self.fetched = 0
+        self.duplicates = 0
+        self.recovered = 0
+        self._refetched: Set[int] = set()
+
+    def add(self, offset: int, jobs: List[Dict], total: Optional[int] = None,
+            repair: bool = False, fetched_at: Optional[float] = None) -> List[Dict]:
+        """
+        Records one fetched page and returns its rows not seen before, in order.
+
+        Args:
+            offset (int): The page's ``from=`` offset.
+            jobs (List[Dict]): Every row on the page, empty pages included.
+            total (Optional[int]): Total results reported with the page;
+                ignored for an empty page.
+            repair (bool): The page was refetched for `repair_offsets`; it
+                does not take part in drift detection.
+            fetched_at (Optional[float]): ``time.monotonic()`` when the page was
+                fetched (default: now). Pass it when pages are recorded in
+                another order than they were fetched.
+        """
+        keys, new = [], []
+        for job in jobs:
+            key = job_key(job)
+            if key is not None:
+                keys.append(key)
+                if key in self.seen:
+                    self.duplicates += 1
+                    continue
+                self.seen.add(key)
+            new.append(job)
+        self.fetched += 1
+        if repair:
+            self.recovered += len(new)
+        else:
+            # past the end the site reports a total of 0, which says nothing about drift
+            self.pages[offset] = PageRecord(offset, tuple(keys), total if jobs else None,
+                                            time.monotonic() if fetched_at is None else fetched_at)
+        return new
+
+    @property
+    def total(self) -> Optional[int]:
+        """The total reported by the most recently fetched page that had one."""
+        latest = max((page for page in self.pages.values() if page.total is not None),
+                     key=lambda page: page.fetched_at, default=None)
+        return latest.total if latest is not None else None
+
+    def gaps(self) -> List[Gap]:
+        """Ranges of offsets whose rows drift may have hidden, one per affected boundary."""
+        gaps = []
+        below: Set[str] = set()                 # keys on every page before `offset`
+        for offset in sorted(self.pages):
+            lower, upper = self.pages.get(offset - self.page_size), self.pages[offset]
+            keys = set(upper.keys)
+            if lower is None:
+                below |= keys
+                continue
+            newer, older = ((upper, lower) if upper.fetched_at >= lower.fetched_at
+                            else (lower, upper))
+            overlap = len(set(lower.keys) & keys)
+            # rows pushed forward by more than a page repeat earlier pages only
+            repeated = len(below & keys)
+            below |= keys
+            if newer.total is not None and older.total is not None:
+                shift = newer.total - older.total
+            else:
+                shift = 0
+            if newer is upper and repeated:
+                # rows pushed forward onto `upper`: postings were added before it
+                gaps.append(Gap(0, offset, max(repeated, shift), "inserted", offset))
+            elif newer is upper and shift < 0:
+                # rows pulled back across the boundary, behind `lower`
+                gaps.append(Gap(max(offset + shift, 0), offset, -shift, "removed", offset))
+            elif newer is lower and shift > 0 and not overlap:
+                # `lower` was pushed forward past rows `upper` (older) never reached
+                gaps.append(Gap(offset, offset + shift, shift, "inserted", offset))
+        total = self.total
+        end = max(self.pages, default=0) + self.page_size
+        if self.pages and total is not None and total > end:
+            # the walk stopped before the end the latest total reports
+            gaps.append(Gap(end, total, total - end, "inserted", end))
+        return gaps
+
+    def repair_offsets(self) -> Iterator[int]:
+        """
+        Yields the offsets to refetch, gap by gap. Record each refetched page
+        with ``add(..., repair=True)`` before asking for the next offset: a gap
+        ends once as many new rows as it is missing have come back.
+        """
+        for gap in self.gaps():
+            print(f"Pagination drift at offset {gap.boundary}: {gap.missing} posting(s) "
+                  f"{gap.reason}; refetching from offset {gap.start}.")
+            before = self.recovered
+            offset = gap.start
+            while offset < gap.stop and self.recovered - before < gap.missing:
+                if offset not in self._refetched:
+                    self._refetched.add(offset)
+                    yield offset
+                offset += self.page_size
+
+    def shortfall(self) -> int:
+        """How many rows the latest reported total says are still missing."""
+        total = self.total
+        return max(total - len(self.seen), 0) if total is not None else 0
+
+    def stats(self) -> Dict[str, int]:
+        """Pages fetched, duplicates dropped, drift gaps, rows recovered and still missing."""
+        return {"pages": self.fetched, "duplicates": self.duplicates,
+                "gaps": len(self.gaps()), "recovered": self.recovered,
+                "refetched": len(self._refetched), "missing": self.shortfall()}
@@ -0,0 +1,157 @@
+"""
+Pre-processing for LLM extraction: prune a results page down to the parts the
+prompt needs and split it into chunks that fit a token budget.
+"""
+import re
+from typing import Dict, List, Optional
+
+from bs4 import BeautifulSoup
+
+from common.cards import CARD_SELECTOR
+
+try:
+    import tiktoken
+    _ENCODING = tiktoken.get_encoding("cl100k_base")
+except Exception:                     # not installed, or no BPE file offline
+    _ENCODING = None
+
+LLM_TOKEN_BUDGET = 6000
+CONTEXT_SELECTORS = [
+    '[data-ph-at-id="search-page-top-job-count"]',   # "Showing N results"
+    '[data-ph-at-id="no-results"]',
+]
+PAGINATION_SELECTORS = ['[data-ph-at-id="pagination"]']
+DROP_TAGS = ["script", "style", "noscript", "svg", "iframe", "link", "meta",
+             "head", "nav", "header", "footer"]
+KEEP_ATTRS = {"href", "data-ph-at-id", "data-ph-at-job-id-text", "data-job-id"}
+
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+def count_tokens(text: str) -> int:
+    """
+    Counts prompt tokens with tiktoken, or estimates ~4 characters per token.
+
+    Args:
+        text (str): The text to measure.
+
+    Returns:
+        int: Token count.
+    """
+    if _ENCODING is not None:
+        return len(_ENCODING.encode(text, disallowed_special=()))
+    return len(text) // 4
+
+
+def _strip(node) -> str:
+    for tag in node.find_all(True):
+        tag.attrs = {k: v for k, v in tag.attrs.items() if k in KEEP_ATTRS}
+    if getattr(node, "attrs", None) is not None:
+        node.attrs = {k: v for k, v in node.attrs.items() if k in KEEP_ATTRS}
+    return _WHITESPACE_RE.sub(" ", str(node)).strip()
+
+
+def prune_blocks(html: str, list_selector: str = CARD_SELECTOR) -> List[str]:
+    """
+    Reduces a page to the result header, one block per job card and the
+    pagination controls, with attributes the prompt doesn't need removed.
+
+    Args:
+        html (str): Raw page HTML.
+        list_selector (str): Selector of one job card.
+
+    Returns:
+        List[str]: HTML fragments in page order (header, cards, pagination).
+            When no card matches, the de-cluttered body is returned as one block.
+    """
+    soup = BeautifulSoup(html, "lxml")
+    for tag in soup(DROP_TAGS):
+        tag.decompose()
+
+    cards = soup.select(list_selector)
+    if not cards:
+        body = soup.body or soup
+        text = _strip(body)
+        return [text] if text else []
+
+    blocks = [_strip(node) for sel in CONTEXT_SELECTORS for node in soup.select(sel)]
+    blocks += [_strip(card) for card in cards]
+    blocks += [_strip(node) for sel in PAGINATION_SELECTORS for node in soup.select(sel)]
+    return [block for block in blocks if block]
+
+
+def chunk_blocks(blocks: List[str], budget: int = LLM_TOKEN_BUDGET) -> List[str]:
+    """
+    Packs blocks greedily into chunks of at most `budget` tokens.
+
+    Args:
+        blocks (List[str]): Fragments from prune_blocks.
+        budget (int): Maximum tokens per chunk. A single oversized block
+            becomes its own chunk.
+
+    Returns:
+        List[str]: The chunks.
+    """
+    chunks, current, used = [], [], 0
+    for block in blocks:
+        size = count_tokens(block)
+        if current and used + size > budget:
+            chunks.append("\n".join(current))
+            current, used = [], 0
+        current.append(block)
+        used += size
+    if current:
+        chunks.append("\n".join(current))
+    return chunks
+
+
+def prepare_for_llm(html: str, budget: int = LLM_TOKEN_BUDGET, label: str = "") -> List[str]:
+    """
+    Prunes a page and chunks it to the token budget, logging the reduction.
+
+    Args:
+        html (str): Raw page HTML.
+        budget (int): Maximum tokens per chunk.
+        label (str): Prefix for the log line (e.g. the page URL).
+
+    Returns:
+        List[str]: Prompt-ready chunks; the original HTML if pruning left nothing.
+    """
+    before = count_tokens(html)
+    blocks = prune_blocks(html)
+    if not blocks:
+        print(f"{label}prune: nothing kept, sending the page as-is ({before} tokens)")
+        return [html]
+    chunks = chunk_blocks(blocks, budget)
+    after = sum(count_tokens(chunk) for chunk in chunks)
+    print(f"{label}prune: {before} -> {after} tokens "
+          f"({len(chunks)} chunk(s), budget {budget})")
+    return chunks
+
+
+def merge_results(results: List[Dict]) -> Dict:
+    """
+    Merges per-chunk extraction results and drops duplicate jobs.
+
+    Args:
+        results (List[Dict]): Parsed chunk outputs with jobs/next_page/total_jobs.
+
+    Returns:
+        Dict: A single result; jobs are de-duplicated by job_id (or url).
+    """
+    jobs: List[Dict] = []
+    seen = set()
+    next_page: Optional[str] = None
+    total_jobs: Optional[int] = None
+    for result in results:
+        for job in result.get("jobs") or []:
+            key = job.get("job_id") or job.get("url")
+            if key is not None:
+                if key in seen:
+                    continue
+                seen.add(key)
+            jobs.append(job)
+        next_page = next_page or result.get("next_page")
+        if total_jobs is None:
+            total_jobs = result.get("total_jobs")
+    return {"jobs": jobs, "next_page": next_page, "total_jobs": total_jobs}
@@ -0,0 +1,185 @@
+"""
+Adaptive per-host rate limiting shared by every crawler.
+
+Each host gets a token bucket whose refill rate is tuned by AIMD: every
+response that comes back quickly adds a little to the rate; a 429/503, a
+failed request, or a response much slower than the host's usual latency
+cuts the rate by a factor. A ``Retry-After`` header pauses the host for as
+long as the server asks. The result is that crawls run as fast as the site
+tolerates without hand-tuned sleeps.
+
+Usage, sync or async:
+
+    limiter = get_limiter()
+    limiter.acquire(url)                 # or: await limiter.aacquire(url)
+    started = time.monotonic()
+    response = session.get(url)
+    limiter.record(url, response.status_code, time.monotonic() - started,
+                   response.headers.get("Retry-After"))
+
+Hosts start at `INITIAL_RATE` with a burst of `BURST`, which matches the
+crawlers' default of four pages in flight, so the first pages of a crawl are
+not serialised while the rate ramps up.
+
+Configuration (environment):
+    LABCORP_RATE=4      starting requests per second per host
+    LABCORP_BURST=4     requests a host may take back to back
+"""
+import asyncio
+import os
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from typing import Dict, Optional
+from urllib.parse import urlsplit
+
+INITIAL_RATE = 4.0          # requests per second per host
+MIN_RATE = 0.1
+MAX_RATE = 10.0
+BURST = 4                   # requests a host may take back to back
+INCREASE = 0.1              # added to the rate after a fast success
+DECREASE = 0.5              # rate multiplier after a 429/503 or error
+SLOW_DECREASE = 0.8         # rate multiplier after a slow response
+SLOW_FACTOR = 3.0           # "slow" = this many times the host's baseline latency
+SLOW_MARGIN = 0.25          # ... and at least this many seconds over it
+THROTTLE_STATUSES = (429, 503)
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Seconds to wait from a Retry-After header (delta-seconds or HTTP date)."""
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        return max(parsedate_to_datetime(value).timestamp() - time.time(), 0.0)
+    except (TypeError, ValueError):
+        return None
+
+
+class HostBucket:
+    """Token bucket plus AIMD state for one host. Not thread-safe on its own."""
+
+    def __init__(self, rate: float = INITIAL_RATE, burst: int = BURST):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+        self.paused_until = 0.0
+        # smoothed typical latency per channel ("http", "browser", ...), since a
+        # full render is always much slower than a plain GET to the same host
+        self.baselines: Dict[str, float] = {}
+        self.throttled = 0
+
+    def reserve(self) -> float:
+        """Takes a token and returns how long the caller must wait before using it."""
+        now = time.monotonic()
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        self.tokens -= 1
+        wait = -self.tokens / self.rate if self.tokens < 0 else 0.0
+        return max(wait, self.paused_until - now)
+
+    def record(self, status: Optional[int], latency: Optional[float],
+               retry_after: Optional[float], channel: str = "http") -> None:
+        if retry_after is not None:
+            self.paused_until = max(self.paused_until, time.monotonic() + retry_after)
+        if status is None or status in THROTTLE_STATUSES:
+            self.throttled += 1
+            self.rate = max(MIN_RATE, self.rate * DECREASE)
+            return
+        if latency is None:
+            return
+        baseline = self.baselines.get(channel)
+        slow = (baseline is not None and latency > SLOW_FACTOR * baseline
+                and latency - baseline > SLOW_MARGIN)
+        # the baseline follows drops quickly and rises slowly, tracking the fast path
+        if baseline is None or latency < baseline:
+            self.baselines[channel] = latency
+        else:
+            self.baselines[channel] = baseline + 0.1 * (latency - baseline)
+        if slow:
+            self.rate = max(MIN_RATE, self.rate * SLOW_DECREASE)
+        else:
+            self.rate = min(MAX_RATE, self.rate + INCREASE)
+
+
+class RateLimiter:
+    """Per-host buckets, usable from threads and from asyncio tasks."""
+
+    def __init__(self, rate: float = INITIAL_RATE, burst: int = BURST):
+        self.rate = rate
+        self.burst = burst
+        self._hosts: Dict[str, HostBucket] = {}
+        self._lock = threading.Lock()
+
+    def _bucket(self, url: str) -> HostBucket:
+        host = urlsplit(url).netloc or url
+        bucket = self._hosts.get(host)
+        if bucket is None:
+            bucket = self._hosts[host] = HostBucket(self.rate, self.burst)
+        return bucket
+
+    def _reserve(self, url: str) -> float:
+        with self._lock:
+            return self._bucket(url).reserve()
+
+    def acquire(self, url: str) -> float:
+        """Blocks until a request to `url`'s host is allowed; returns the wait."""
+        wait = self._reserve(url)
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+    async def aacquire(self, url: str) -> float:
+        """Async version of `acquire`."""
+        wait = self._reserve(url)
+        if wait > 0:
+            await asyncio.sleep(wait)
+        return wait
+
+    def record(self, url: str, status: Optional[int] = None, latency: Optional[float] = None,
+               retry_after=None, channel: str = "http") -> None:
+        """
+        Feeds one response back into the host's rate.
+
+        Args:
+            url (str): The requested URL.
+            status (Optional[int]): HTTP status; None for a failed request.
+            latency (Optional[float]): Seconds the request took.
+            retry_after: A Retry-After header value or a number of seconds.
+            channel (str): How the page was fetched; latency baselines are
+                kept per channel.
+        """
+        if not isinstance(retry_after, (int, float)):
+            retry_after = parse_retry_after(retry_after)
+        with self._lock:
+            self._bucket(url).record(status, latency, retry_after, channel)
+
+    def stats(self) -> Dict[str, Dict]:
+        with self._lock:
+            return {host: {"rate": round(bucket.rate, 2), "throttled": bucket.throttled,
+                           "baseline_latency": {channel: round(latency, 3) for channel, latency
+                                                in bucket.baselines.items()}}
+                    for host, bucket in self._hosts.items()}
+
+
+_limiter: Optional[RateLimiter] = None
+_limiter_lock = threading.Lock()
+
+
+def _configured() -> RateLimiter:
+    """A limiter with the starting rate and burst from LABCORP_RATE / LABCORP_BURST."""
+    rate = float(os.getenv("LABCORP_RATE") or INITIAL_RATE)
+    burst = int(os.getenv("LABCORP_BURST") or BURST)
+    return RateLimiter(min(max(rate, MIN_RATE), MAX_RATE), max(burst, 1))
+
+
+def get_limiter() -> RateLimiter:
+    """Returns the process-wide limiter, creating it on first use."""
+    global _limiter
+    with _limiter_lock:
+        if _limiter is None:
+            _limiter = _configured()
+        return _limiter
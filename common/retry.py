@@ -0,0 +1,96 @@
+"""
+Retry policy shared by the crawlers: exponential backoff with full jitter,
+and a split between errors worth retrying and errors no retry can fix.
+"""
+import asyncio
+import json
+import random
+import time
+from typing import Awaitable, Callable, TypeVar
+
+import requests
+
+T = TypeVar("T")
+
+MAX_ATTEMPTS = 4
+BACKOFF_BASE = 1.0          # seconds before the first retry (before jitter)
+BACKOFF_CAP = 60.0
+RETRYABLE_STATUSES = {408, 425, 429, 500, 502, 503, 504}
+# Raised by LLM clients for bad keys, missing models and the like.
+FATAL_ERROR_NAMES = {"AuthenticationError", "PermissionDeniedError", "NotFoundError",
+                     "BadRequestError"}
+
+
+class RetryableError(Exception):
+    """A transient failure, e.g. a page that came back without any jobs."""
+
+
+class FatalError(Exception):
+    """An error that retrying cannot fix; the crawl should stop."""
+
+
+def is_retryable(error: BaseException) -> bool:
+    """
+    Classifies an error as transient (retry) or fatal (stop).
+
+    Network failures, timeouts, 408/425/429/5xx responses and malformed model
+    output are retryable. Other 4xx responses, credential/model errors from
+    the LLM client and FatalError are not.
+    """
+    if isinstance(error, RetryableError):
+        return True
+    if isinstance(error, FatalError):
+        return False
+    if isinstance(error, requests.HTTPError) and error.response is not None:
+        return error.response.status_code in RETRYABLE_STATUSES
+    if type(error).__name__ in FATAL_ERROR_NAMES:
+        return False
+    if isinstance(error, (requests.RequestException, json.JSONDecodeError,
+                          TimeoutError, ConnectionError)):
+        return True
+    return not isinstance(error, (TypeError, AttributeError, NameError, ImportError))
+
+
+def backoff_delay(attempt: int, base: float = BACKOFF_BASE, cap: float = BACKOFF_CAP) -> float:
+    """
+    Seconds to wait before retry number `attempt` (1-based): uniform in
+    [0, min(cap, base * 2**(attempt - 1))], so concurrent workers spread out.
+    """
+    return random.uniform(0, min(cap, base * 2 ** (attempt - 1)))
+
+
+def retry_call(fn: Callable[..., T], *args, attempts: int = MAX_ATTEMPTS,
+               label: str = "", **kwargs) -> T:
+    """
+    Calls `fn`, retrying retryable errors with backoff.
+
+    Raises:
+        The last error once attempts run out, or a fatal error immediately.
+    """
+    for attempt in range(1, attempts + 1):
+        try:
+            return fn(*args, **kwargs)
+        except Exception as e:
+            if not is_retryable(e) or attempt == attempts:
+                raise
+            delay = backoff_delay(attempt)
+            print(f"{label}{type(e).__name__}: {e}. Retry {attempt}/{attempts - 1} "
+                  f"in {delay:.1f}s...")
+            time.sleep(delay)
+    raise AssertionError("unreachable")
+
+
+async def aretry_call(fn: Callable[..., Awaitable[T]], *args, attempts: int = MAX_ATTEMPTS,
+                      label: str = "", **kwargs) -> T:
+    """Async version of `retry_call` for coroutine functions."""
+    for attempt in range(1, attempts + 1):
+        try:
+            return await fn(*args, **kwargs)
+        except Exception as e:
+            if not is_retryable(e) or attempt == attempts:
+                raise
+            delay = backoff_delay(attempt)
+            print(f"{label}{type(e).__name__}: {e}. Retry {attempt}/{attempts - 1} "
+                  f"in {delay:.1f}s...")
+            await asyncio.sleep(delay)
+    raise AssertionError("unreachable")
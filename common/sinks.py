@@ -0,0 +1,204 @@
+"""
+Streaming result writers.
+
+A sink receives rows page by page as a crawl progresses and appends them to
+disk in small batches, flushing and fsync-ing each batch, so a crash mid-crawl
+keeps everything written so far. Unless told otherwise, the columns are the
+``Job`` model's fields followed by any other keys of the first rows written
+(e.g. the detail fields), so enriched columns are kept.
+"""
+import csv
+import json
+import os
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence
+
+from ai_web_crawler.models.job import Job
+
+JOB_FIELDS: List[str] = list(Job.model_fields)
+
+
+class JobSink(ABC):
+    """
+    Base sink: buffers rows and writes them out once at least `batch_rows`
+    are queued. The default of 1 makes every page its own durable batch.
+
+    Subclasses implement ``_open`` and ``_write``, and ``_close`` when
+    closing `_file` is not enough. Without `fields` the columns are fixed by
+    the first batch; keys that only later rows have are dropped.
+    """
+    # whether an existing file can be continued (append=True)
+    appendable = True
+
+    def __init__(
+        self,
+        path,
+        fields: Optional[Sequence[str]] = None,
+        batch_rows: int = 1,
+        append: bool = False,
+    ):
+        self.path = Path(path)
+        self.fields: Optional[List[str]] = list(fields) if fields else None
+        self.batch_rows = max(batch_rows, 1)
+        self.append = append
+        self.count = 0
+        self._buffer: List[Dict] = []
+        self._file = None
+
+    def __enter__(self) -> "JobSink":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def write_page(self, rows: Iterable[Dict]) -> None:
+        """Queues one page of rows; writes a batch once enough are buffered."""
+        self._buffer.extend(rows)
+        if len(self._buffer) >= self.batch_rows:
+            self.flush()
+
+    def flush(self) -> None:
+        """Writes buffered rows and forces them to disk."""
+        if not self._buffer:
+            return
+        if self._file is None:
+            if self.fields is None:
+                self.fields = self._default_fields(self._buffer)
+            self._open()
+        rows = [{field: row.get(field, "") for field in self.fields} for row in self._buffer]
+        self._write(rows)
+        self.count += len(rows)
+        self._buffer = []
+        self._sync()
+
+    def close(self) -> None:
+        self.flush()
+        if self._file is not None:
+            self._close()
+            self._file = None
+
+    def _sync(self) -> None:
+        if hasattr(self._file, "flush"):
+            self._file.flush()
+        if hasattr(self._file, "fileno"):
+            os.fsync(self._file.fileno())
+
+    def _existing(self) -> bool:
+        return self.append and self.path.exists() and self.path.stat().st_size > 0
+
+    def _default_fields(self, rows: List[Dict]) -> List[str]:
+        """The Job fields, then every other key of `rows` in first-seen order."""
+        fields = dict.fromkeys(JOB_FIELDS)
+        for row in rows:
+            fields.update(dict.fromkeys(row))
+        return list(fields)
+
+    @abstractmethod
+    def _open(self) -> None:
+        """Opens the output and sets `_file`."""
+
+    @abstractmethod
+    def _write(self, rows: List[Dict]) -> None:
+        """Writes one batch of rows, already cut down to `fields`."""
+
+    def _close(self) -> None:
+        self._file.close()
+
+
+class CsvSink(JobSink):
+    def _default_fields(self, rows: List[Dict]) -> List[str]:
+        if self._existing():
+            # continue with the header already on disk
+            with open(self.path, newline="", encoding="utf-8") as f:
+                header = next(csv.reader(f), None)
+            if header:
+                return header
+        return super()._default_fields(rows)
+
+    def _open(self) -> None:
+        existing = self._existing()
+        self._file = open(self.path, "a" if self.append else "w", newline="", encoding="utf-8")
+        self._writer = csv.DictWriter(self._file, fieldnames=self.fields)
+        if not existing:
+            self._writer.writeheader()
+
+    def _write(self, rows: List[Dict]) -> None:
+        self._writer.writerows(rows)
+
+
+class JsonLinesSink(JobSink):
+    def _open(self) -> None:
+        self._file = open(self.path, "a" if self.append else "w", encoding="utf-8")
+
+    def _write(self, rows: List[Dict]) -> None:
+        self._file.writelines(json.dumps(row, ensure_ascii=False) + "\n" for row in rows)
+
+
+class ParquetSink(JobSink):
+    """
+    Writes one Parquet row group per batch (default 1,000 rows).
+
+    Parquet's footer is only written on close, so unlike CSV/JSON Lines an
+    interrupted file is not readable; pair it with checkpoints for long runs.
+    """
+    appendable = False
+
+    def __init__(self, path, fields: Optional[Sequence[str]] = None,
+                 batch_rows: int = 1000, append: bool = False):
+        if append:
+            raise ValueError("Parquet files can't be appended to; write a new file")
+        super().__init__(path, fields, batch_rows)
+
+    def _open(self) -> None:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        self._schema = pa.schema([(field, pa.string()) for field in self.fields])
+        self._file = pq.ParquetWriter(str(self.path), self._schema)
+
+    def _write(self, rows: List[Dict]) -> None:
+        import pyarrow as pa
+
+        columns = {field: [None if row[field] is None else str(row[field]) for row in rows]
+                   for field in self.fields}
+        self._file.write_table(pa.table(columns, schema=self._schema))
+
+    def _sync(self) -> None:
+        pass                  # row groups are only durable once the footer is written
+
+
+SINKS = {".csv": CsvSink, ".jsonl": JsonLinesSink, ".ndjson": JsonLinesSink, ".parquet": ParquetSink}
+
+
+def _sink_class(path) -> type:
+    suffix = Path(path).suffix.lower()
+    if suffix not in SINKS:
+        raise ValueError(f"Unsupported output format {suffix!r}; use one of {sorted(SINKS)}")
+    return SINKS[suffix]
+
+
+def can_append(path) -> bool:
+    """
+    Whether results can be appended to `path` (e.g. by a resumed crawl).
+
+    >>> can_append("jobs.csv"), can_append("jobs.parquet")
+    (True, False)
+    """
+    return _sink_class(path).appendable
+
+
+def open_sink(path, fields: Optional[Sequence[str]] = None, **kwargs) -> JobSink:
+    """
+    Picks a sink from the file extension (.csv, .jsonl/.ndjson, .parquet).
+
+    Args:
+        path: Output file.
+        fields (Optional[Sequence[str]]): Column order; defaults to the Job
+            fields plus any other keys of the first rows written.
+        **kwargs: Passed to the sink (batch_rows, append).
+
+    Returns:
+        JobSink: An open-on-first-write sink.
+    """
+    return _sink_class(path)(path, fields, **kwargs)
@@ -0,0 +1,214 @@
+"""
+Per-stage timing and counters for crawls.
+
+A `Tracer` records timed spans for the stages of each page: navigation,
+render_wait, extraction, llm, enrichment, dedup, write and checkpoint. Spans
+are tagged with the page and the keyword and can carry counts (bytes, jobs,
+duplicates, LLM calls, prompt and completion tokens). Spans may nest, e.g. an ``llm``
+span lies inside its page's ``extraction`` span.
+
+The tracer keeps per-stage aggregates for `summary` (also handed to
+progress callbacks) and `prometheus`. When given a `trace_path`, it also
+appends every span to a JSON-lines file as the span ends.
+"""
+import json
+import math
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional
+
+STAGES = ("navigation", "render_wait", "extraction", "llm", "enrichment", "dedup", "write",
+          "checkpoint")
+# Span attributes that are summed per stage
+COUNTERS = ("bytes", "jobs", "duplicates", "calls", "prompt_tokens", "completion_tokens")
+QUANTILES = (0.5, 0.95)
+METRIC_PREFIX = "labcorp_crawl"
+
+
+def _quantile(ordered: List[float], q: float) -> float:
+    """Nearest-rank quantile of an already sorted, non-empty list."""
+    return ordered[max(0, math.ceil(q * len(ordered)) - 1)]
+
+
+def _label(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+class Tracer:
+    """
+    Thread-safe span recorder for one crawl (or one batch of crawls).
+
+    Args:
+        keyword (Optional[str]): Default keyword tag for every span.
+        trace_path (Optional[str]): JSON-lines file that spans are appended to.
+    """
+
+    def __init__(self, keyword: Optional[str] = None, trace_path=None):
+        self.keyword = keyword
+        self.trace_path = Path(trace_path) if trace_path else None
+        self._durations: Dict[str, List[float]] = {}
+        self._errors: Counter = Counter()
+        self._totals: Dict[str, Counter] = {}
+        self._lock = threading.Lock()
+        self._file = None
+
+    def __enter__(self) -> "Tracer":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    @contextmanager
+    def span(self, stage: str, page=None, **attrs) -> Iterator[Dict]:
+        """
+        Times the block as one span of `stage`.
+
+        Yields the span's attribute dict, so the block can add counts it only
+        knows at the end (``span["bytes"] = len(html)``). A block that raises
+        is recorded with the exception's type as ``error``.
+        """
+        started, wall = time.perf_counter(), time.time()
+        error = None
+        try:
+            yield attrs
+        except BaseException as e:
+            error = type(e).__name__
+            raise
+        finally:
+            self.record(stage, time.perf_counter() - started, page, error=error, ts=wall, **attrs)
+
+    def record(self, stage: str, seconds: float, page=None, error: Optional[str] = None,
+               ts: Optional[float] = None, **attrs) -> None:
+        """Records a span that was timed elsewhere, e.g. from an LLM usage report."""
+        event = {"ts": round(ts if ts is not None else time.time() - seconds, 3),
+                 "stage": stage, "seconds": round(seconds, 6), "page": page,
+                 "keyword": attrs.pop("keyword", self.keyword), **attrs}
+        if error:
+            event["error"] = error
+        with self._lock:
+            self._durations.setdefault(stage, []).append(seconds)
+            if error:
+                self._errors[stage] += 1
+            totals = self._totals.setdefault(stage, Counter())
+            for name in COUNTERS:
+                if isinstance(attrs.get(name), (int, float)):
+                    totals[name] += attrs[name]
+            if self.trace_path is not None:
+                if self._file is None:
+                    self.trace_path.parent.mkdir(parents=True, exist_ok=True)
+                    self._file = self.trace_path.open("a", encoding="utf-8")
+                self._file.write(json.dumps(event, default=str) + "\n")
+                self._file.flush()
+
+    def summary(self) -> Dict[str, Dict]:
+        """
+        Aggregates per stage.
+
+        Returns:
+            Dict[str, Dict]: stage -> count, errors, total_seconds, mean_ms,
+                p50_ms, p95_ms, max_ms and the summed COUNTERS seen for it.
+        """
+        with self._lock:
+            durations = {stage: sorted(values) for stage, values in self._durations.items()}
+            totals = {stage: dict(counter) for stage, counter in self._totals.items()}
+            errors = dict(self._errors)
+        summary = {}
+        for stage in sorted(durations, key=_stage_order):
+            values = durations[stage]
+            total = sum(values)
+            summary[stage] = {
+                "count": len(values),
+                "errors": errors.get(stage, 0),
+                "total_seconds": round(total, 3),
+                "mean_ms": round(1000 * total / len(values), 1),
+                "p50_ms": round(1000 * _quantile(values, 0.5), 1),
+                "p95_ms": round(1000 * _quantile(values, 0.95), 1),
+                "max_ms": round(1000 * values[-1], 1),
+                **totals.get(stage, {}),
+            }
+        return summary
+
+    def format_summary(self) -> str:
+        """The summary as a plain-text table for the console."""
+        summary = self.summary()
+        if not summary:
+            return "Stages: nothing recorded"
+        lines = [f"{'stage':<12}{'count':>7}{'errors':>7}{'total s':>9}{'mean ms':>9}"
+                 f"{'p95 ms':>9}  counts"]
+        for stage, row in summary.items():
+            counts = ", ".join(f"{name}={row[name]}" for name in COUNTERS if name in row)
+            lines.append(f"{stage:<12}{row['count']:>7}{row['errors']:>7}{row['total_seconds']:>9}"
+                         f"{row['mean_ms']:>9}{row['p95_ms']:>9}  {counts}")
+        return "\n".join(lines)
+
+    def prometheus(self, prefix: str = METRIC_PREFIX) -> str:
+        """The aggregates in the Prometheus text exposition format."""
+        summary = self.summary()
+        base = f'keyword="{_label(self.keyword)}",' if self.keyword else ""
+        lines = [f"# HELP {prefix}_stage_seconds Time spent in each crawl stage.",
+                 f"# TYPE {prefix}_stage_seconds summary"]
+        for stage, row in summary.items():
+            labels = f'{base}stage="{_label(stage)}"'
+            for q in QUANTILES:
+                lines.append(f'{prefix}_stage_seconds{{{labels},quantile="{q}"}} '
+                             f"{row[f'p{int(q * 100)}_ms'] / 1000}")
+            lines.append(f"{prefix}_stage_seconds_sum{{{labels}}} {row['total_seconds']}")
+            lines.append(f"{prefix}_stage_seconds_count{{{labels}}} {row['count']}")
+        lines += [f"# HELP {prefix}_stage_errors_total Spans that ended with an exception.",
+                  f"# TYPE {prefix}_stage_errors_total counter"]
+        for stage, row in summary.items():
+            lines.append(f'{prefix}_stage_errors_total{{{base}stage="{_label(stage)}"}} '
+                         f"{row['errors']}")
+        for name in COUNTERS:
+            rows = [(stage, row[name]) for stage, row in summary.items() if name in row]
+            if not rows:
+                continue
+            lines += [f"# HELP {prefix}_{name}_total Sum of {name} over spans, per stage.",
+                      f"# TYPE {prefix}_{name}_total counter"]
+            lines += [f'{prefix}_{name}_total{{{base}stage="{_label(stage)}"}} {value}'
+                      for stage, value in rows]
+        return "\n".join(lines) + "\n"
+
+    def write_prometheus(self, path) -> None:
+        Path(path).write_text(self.prometheus(), encoding="utf-8")
+
+    def close(self) -> None:
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+
+def _stage_order(stage: str):
+    return (STAGES.index(stage) if stage in STAGES else len(STAGES), stage)
+
+
+def llm_usage(prompt: str, message, seconds: float) -> Dict:
+    """
+    Usage of one chat-model call: the provider's token counts when the reply
+    carries them (``usage_metadata`` or OpenAI's ``token_usage``), otherwise
+    estimates from the prompt and reply text.
+    """
+    meta = getattr(message, "usage_metadata", None) or {}
+    prompt_tokens, completion_tokens = meta.get("input_tokens"), meta.get("output_tokens")
+    if prompt_tokens is None:
+        reported = (getattr(message, "response_metadata", None) or {}).get("token_usage") or {}
+        prompt_tokens = reported.get("prompt_tokens")
+        completion_tokens = reported.get("completion_tokens")
+    if prompt_tokens is None:
+        from common.prune import count_tokens
+        prompt_tokens = count_tokens(prompt)
+        completion_tokens = count_tokens(str(getattr(message, "content", "")))
+    return {"calls": 1, "prompt_tokens": prompt_tokens,
+            "completion_tokens": completion_tokens or 0, "seconds": round(seconds, 6)}
+
+
+def merge_usage(usages: Iterable[Dict]) -> Dict:
+    """Sums `llm_usage` reports."""
+    merged = Counter()
+    for usage in usages:
+        merged.update(usage)
+    return {key: round(value, 6) if key == "seconds" else value for key, value in merged.items()}
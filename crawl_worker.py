@@ -0,0 +1,145 @@
+# imports
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import quote
+from common.batch import normalize_keyword
+from common.columns import JobColumns
+from common.listing import SITE
+from common.sinks import JobSink
+
+SEARCH_URL = SITE + "/global/en/search-results?keywords={keywords}"
+# How long a finished search is served from memory before it is crawled again
+SEARCH_TTL = 30 * 60
+
+class _TaskSink(JobSink):
+    """Hands each page's rows to the task as soon as the crawler emits them."""
+
+    def __init__(self, task: "CrawlTask"):
+        super().__init__("<memory>")
+        self._task = task
+
+    def _open(self) -> None:
+        self._file = self._task
+
+    def _write(self, rows: List[dict]) -> None:
+        self._task._add_rows(rows)
+
+    def _sync(self) -> None:
+        pass
+
+    def _close(self) -> None:
+        pass
+
+class CrawlTask:
+    """
+    One keyword search running on a background thread.
+
+    The Streamlit script only reads from it (`snapshot`), so reruns never
+    restart or block the crawl; rows become visible page by page.
+    """
+
+    def __init__(self, keywords: str, use_agent: bool = False, details: bool = False):
+        self.keywords = keywords
+        self.use_agent = use_agent
+        self.details = details
+        self.started = time.time()
+        self.finished: Optional[float] = None
+        self.error: Optional[str] = None
+        # set when the crawl stopped at a failing page; the rows are partial
+        self.incomplete: Optional[str] = None
+        self._rows = JobColumns()
+        self._page = 0
+        self._total: Optional[int] = None
+        self._metrics: Dict[str, dict] = {}
+        self._lock = threading.Lock()
+        self._thread = threading.Thread(target=self._run, daemon=True,
+                                        name=f"crawl-{normalize_keyword(keywords)}")
+
+    def start(self) -> "CrawlTask":
+        self._thread.start()
+        return self
+
+    @property
+    def done(self) -> bool:
+        return self.finished is not None
+
+    def snapshot(self) -> dict:
+        """
+        A consistent view of the task's state for rendering. ``rows`` is the
+        task's live, append-only JobColumns table; only its first ``count``
+        rows belong to this snapshot.
+        """
+        with self._lock:
+            count = len(self._rows)
+            page, total, metrics = self._page, self._total, self._metrics
+        if self.done and self.error is None and self.incomplete is None:
+            progress = 1.0
+        elif total:
+            progress = min(count / total, 0.99)
+        else:
+            progress = 0.0
+        return {"rows": self._rows, "count": count, "page": page, "total": total,
+                "progress": progress, "metrics": metrics, "done": self.done,
+                "error": self.error, "incomplete": self.incomplete, "elapsed": (self.finished or time.time()) - self.started}
+
+    def _add_rows(self, rows: List[dict]) -> None:
+        with self._lock:
+            self._rows.extend(rows)
+
+    def _progress(self, page: int, found: int, total: Optional[int] = None,
+                  metrics: Optional[Dict[str, dict]] = None) -> None:
+        with self._lock:
+            self._page = page
+            if total is not None:
+                self._total = total
+            if metrics is not None:
+                self._metrics = metrics
+
+    def _run(self) -> None:
+        start_url = SEARCH_URL.format(keywords=quote(self.keywords))
+        try:
+            # imported here so the app's cold start doesn't load langchain
+            from agent_runner import crawl_labcorp
+            from common.checkpoint import CrawlIncomplete
+            try:
+                crawl_labcorp(start_url, self._progress, use_agent=self.use_agent,
+                              sink=_TaskSink(self), details=self.details, strict=True)
+            except CrawlIncomplete as e:
+                self.incomplete = str(e)
+        except Exception as e:
+            self.error = str(e)
+        finally:
+            self.finished = time.time()
+
+class SearchRegistry:
+    """
+    Process-wide map of (keyword, details) -> CrawlTask, shared by every browser session.
+
+    A search that is running or finished within `ttl` seconds is reused, so
+    repeated or shared queries return at once. Failed or incomplete searches
+    are not reused.
+    """
+
+    def __init__(self, ttl: float = SEARCH_TTL):
+        self.ttl = ttl
+        self._tasks: Dict[Tuple[str, bool], CrawlTask] = {}
+        self._lock = threading.Lock()
+
+    def search(self, keywords: str, refresh: bool = False, details: bool = False) -> CrawlTask:
+        key = (normalize_keyword(keywords), details)
+        with self._lock:
+            for stale in [k for k, t in self._tasks.items() if not self._reusable(t)]:
+                del self._tasks[stale]
+            task = self._tasks.get(key)
+            if task is not None and not refresh and self._reusable(task):
+                return task
+            task = self._tasks[key] = CrawlTask(" ".join(keywords.split()),
+                                                details=details).start()
+            return task
+
+    def _reusable(self, task: CrawlTask) -> bool:
+        if not task.done:
+            return True
+        return (task.error is None and task.incomplete is None
+                and time.time() - task.finished < self.ttl)
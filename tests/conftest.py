@@ -0,0 +1,35 @@
+"""
+Puts the repository root on sys.path, as running a script from it would, and
+points the on-disk caches at a temporary directory.
+"""
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parent.parent
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+# read when common.llm_cache is first imported
+os.environ.setdefault("LABCORP_CACHE_DIR", tempfile.mkdtemp(prefix="labcorp-tests-"))
+
+
+@pytest.fixture
+def labcorp_site(monkeypatch, tmp_path):
+    """
+    A 45-job MockSite, with agent_runner using the fake chat model and
+    keeping its checkpoints under `tmp_path`.
+    """
+    import agent_runner
+    from benchmarks.fake_llm import FakeChatModel
+    from benchmarks.mock_site import MockSite
+    from common.checkpoint import Checkpoint
+
+    monkeypatch.setattr(agent_runner, "ChatOpenAI", FakeChatModel)
+    monkeypatch.setattr(agent_runner, "open_checkpoint",
+                        lambda kind, key, resume=False, keep_jobs=True:
+                        Checkpoint(kind, key, keep_jobs, tmp_path))
+    with MockSite(45, latency=0) as site:
+        yield site
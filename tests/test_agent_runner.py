@@ -0,0 +1,76 @@
+from functools import partial
+
+import pytest
+
+import agent_runner
+from common.checkpoint import CrawlIncomplete
+from common.retry import FatalError
+
+
+def _start(site):
+    return f"{site.url}/global/en/search-results?keywords=qa"
+
+
+def _fail_page(monkeypatch, page):
+    fetch = agent_runner._fetch_traced
+
+    def fetch_or_fail(url, tracer, page_num=None, *args, **kwargs):
+        if page_num == page:
+            raise FatalError("page gone")
+        return fetch(url, tracer, page_num, *args, **kwargs)
+
+    monkeypatch.setattr(agent_runner, "_fetch_traced", fetch_or_fail)
+
+
+def test_legacy_two_argument_callback(labcorp_site):
+    calls = []
+
+    def on_page(page_num, total_jobs):
+        calls.append((page_num, total_jobs))
+
+    jobs = agent_runner.crawl_labcorp(_start(labcorp_site), on_page)
+    assert len(jobs) == 45
+    assert calls == [(1, 20), (2, 40), (3, 45)]
+
+
+def test_full_callback_gets_total_and_metrics(labcorp_site):
+    calls = []
+    agent_runner.crawl_labcorp(_start(labcorp_site), lambda page, found, total, metrics:
+                               calls.append((page, found, total, sorted(metrics))))
+    assert [call[:3] for call in calls] == [(1, 20, 45), (2, 40, 45), (3, 45, 45)]
+    assert "navigation" in calls[-1][3]
+
+
+def test_reporter_passes_what_the_callback_accepts():
+    seen = []
+    agent_runner._progress_reporter(partial(seen.append))(1, 20, 45, {})
+    agent_runner._progress_reporter(lambda *args: seen.append(args))(2, 40, 45, {})
+    agent_runner._progress_reporter(lambda page, found, total=None: seen.append(total))(3, 45, 45, {})
+    assert seen == [1, (2, 40, 45, {}), 45]
+    assert agent_runner._progress_reporter(None) is None
+
+
+def test_callback_error_stops_the_crawl_with_a_checkpoint(labcorp_site):
+    def on_page(page_num, total_jobs):
+        if page_num == 2:
+            raise RuntimeError("display went away")
+
+    agent_runner.crawl_labcorp(_start(labcorp_site), on_page)
+    checkpoint = agent_runner.open_checkpoint("labcorp", _start(labcorp_site))
+    assert checkpoint.load()
+    assert checkpoint.rows == 40
+
+
+def test_strict_raises_when_a_page_fails(labcorp_site, monkeypatch):
+    _fail_page(monkeypatch, 2)
+    assert len(agent_runner.crawl_labcorp(_start(labcorp_site))) == 20
+    with pytest.raises(CrawlIncomplete, match="1 page"):
+        agent_runner.crawl_labcorp(_start(labcorp_site), strict=True)
+
+
+def test_details_crawls_keep_their_own_checkpoint(labcorp_site, monkeypatch):
+    _fail_page(monkeypatch, 2)
+    agent_runner.crawl_labcorp(_start(labcorp_site))
+    plain = agent_runner.open_checkpoint("labcorp", _start(labcorp_site))
+    detailed = agent_runner.open_checkpoint("labcorp", f"{_start(labcorp_site)} details")
+    assert plain.load() and not detailed.load()
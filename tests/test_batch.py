@@ -0,0 +1,82 @@
+from common import retry
+from common.batch import BATCH_FIELDS, crawl_keyword, run_batch
+from common.retry import FatalError, RetryableError
+from common.sinks import JobSink
+
+
+def _job(i, **extra):
+    return dict({"title": f"QA {i}", "location": "Durham", "category": "Quality",
+                 "job_id": str(i), "url": f"https://x/job/{i}/qa"}, **extra)
+
+
+PAGES = {
+    "qa": [_job(1), _job(2), {"title": None, "location": "Durham"}],
+    "sdet": [_job(2), _job(3), {"title": None, "location": "Remote"}],
+}
+
+
+def fetch_page(keyword, offset):
+    if keyword == "broken":
+        raise FatalError("site down")
+    return (PAGES[keyword] if offset == 0 else []), len(PAGES[keyword])
+
+
+class MemorySink(JobSink):
+    def __init__(self):
+        super().__init__("<memory>", BATCH_FIELDS)
+        self.pages = []
+
+    def _open(self):
+        self._file = self.pages
+
+    def _write(self, rows):
+        self.pages.append(rows)
+
+    def _sync(self):
+        pass
+
+    def _close(self):
+        pass
+
+
+def test_keyless_jobs_are_kept_apart():
+    result = run_batch(["qa", "sdet"], fetch_page, max_concurrency=1)
+    assert len(result.jobs) == 5
+    assert sorted(job["location"] for job in result.jobs if not job["job_id"]) == [
+        "Durham", "Remote"]
+    shared = next(job for job in result.jobs if job["job_id"] == "2")
+    assert shared["keywords"] == ["qa", "sdet"]
+
+
+def test_each_query_is_written_when_it_finishes():
+    sink = MemorySink()
+    written = []
+    seen_at_progress = []
+
+    def progress(keyword, found, done):
+        seen_at_progress.append(sum(map(len, sink.pages)))
+        written.append(keyword)
+
+    result = run_batch(["qa", "broken", "sdet"], fetch_page, max_concurrency=1, sink=sink,
+                       progress_callback=progress)
+    assert result.failed == {"broken": "site down"}
+    # each query's new jobs reached the sink before the next query was reported
+    assert seen_at_progress == [3, 5]
+    assert sink.count == 5
+    rows = [row for page in sink.pages for row in page]
+    assert [row["keywords"] for row in rows if row["job_id"] == "2"] == ["qa"]
+    assert len(result.jobs) == 5
+
+
+def test_transient_page_errors_are_retried(monkeypatch):
+    monkeypatch.setattr(retry, "backoff_delay", lambda attempt: 0)
+    calls = []
+
+    def flaky(keyword, offset):
+        calls.append(offset)
+        if len(calls) == 1:
+            raise RetryableError("503")
+        return fetch_page(keyword, offset)
+
+    jobs, pages = crawl_keyword("qa", flaky)
+    assert len(jobs) == 3 and pages == 1 and calls == [0, 0]
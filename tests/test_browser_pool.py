@@ -0,0 +1,99 @@
+import asyncio
+
+import pytest
+
+pytest.importorskip("playwright")
+
+from playwright.async_api import Error as PlaywrightError  # noqa: E402
+
+from common import browser_pool  # noqa: E402
+
+
+class _Page:
+    in_flight = max_in_flight = 0
+
+    def __init__(self, fail=None, delay=0.0):
+        self.fail = fail
+        self.delay = delay
+
+    def is_closed(self):
+        return False
+
+    async def goto(self, url, wait_until=None):
+        if self.fail is not None:
+            raise self.fail
+        _Page.in_flight += 1
+        _Page.max_in_flight = max(_Page.max_in_flight, _Page.in_flight)
+        await asyncio.sleep(self.delay)
+        _Page.in_flight -= 1
+        return None
+
+    async def content(self):
+        return "<html/>"
+
+
+def _pool(monkeypatch, size=1, page=_Page):
+    pool = browser_pool.BrowserPool.__new__(browser_pool.BrowserPool)
+    pool.size, pool.profile = size, browser_pool.LEAN_PROFILE._replace(lean=False)
+    pool._pages, pool._browser, pool.launches = browser_pool.deque(), None, 0
+    pool._slots, pool._lock = asyncio.Semaphore(size), asyncio.Lock()
+    pages = []
+
+    async def new_page():
+        pages.append(page())
+        return pages[-1]
+
+    monkeypatch.setattr(pool, "_alive", lambda: True)
+    monkeypatch.setattr(pool, "_new_page", new_page)
+    pool.created = pages
+    return pool
+
+
+@pytest.fixture
+def pool(monkeypatch):
+    pool = _pool(monkeypatch)
+    pool._pages.append(_Page())
+    return pool
+
+
+def test_page_returns_after_an_unexpected_error(pool):
+    pool._pages[0].fail = KeyError("boom")
+    with pytest.raises(KeyError):
+        asyncio.run(pool._fetch("http://x/", None))
+    assert len(pool._pages) == 1
+    pool._pages[0].fail = None
+    assert asyncio.run(pool._fetch("http://x/", None))[0] == "<html/>"
+
+
+def test_page_returns_when_the_retry_after_a_relaunch_fails(pool, monkeypatch):
+    pool._pages[0].fail = PlaywrightError("crashed")
+    # checkout, after the crash, in _relaunch, checkout after the relaunch
+    alive = iter([True, False, False, True])
+    monkeypatch.setattr(pool, "_alive", lambda: next(alive))
+
+    async def launch():
+        pool._pages.clear()
+        pool._pages.append(_Page(PlaywrightError("again")))
+        pool.launches += 1
+
+    monkeypatch.setattr(pool, "_launch", launch)
+    with pytest.raises(PlaywrightError, match="again"):
+        asyncio.run(pool._fetch("http://x/", None))
+    assert len(pool._pages) == 1 and pool.launches == 1
+
+
+def test_checkout_never_runs_dry(pool):
+    pool._pages.clear()
+    assert isinstance(asyncio.run(pool._checkout()), _Page)
+
+
+def test_contexts_navigate_concurrently(monkeypatch):
+    _Page.in_flight = _Page.max_in_flight = 0
+    pool = _pool(monkeypatch, size=3, page=lambda: _Page(delay=0.05))
+
+    async def fetch_all():
+        return await asyncio.gather(*(pool._fetch(f"http://x/{i}", None) for i in range(7)))
+
+    assert len(asyncio.run(fetch_all())) == 7
+    assert _Page.max_in_flight == 3
+    assert len(pool.created) == 3 and len(pool._pages) == 3
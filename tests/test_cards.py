@@ -0,0 +1,89 @@
+import json
+from pathlib import Path
+
+import pytest
+
+import agent_runner
+from common.cards import extract_page
+from common.listing import parse_listing
+from common.llm_cache import LLMCache
+from common.tracing import Tracer
+from tools import ParsePageTool
+
+FIXTURES = Path(__file__).resolve().parent.parent / "fixtures"
+SITE = "https://careers.labcorp.com"
+FIRST = {"title": "QA Automation Engineer",
+         "location": "Durham, North Carolina, United States of America",
+         "category": "Information Technology", "job_id": "2530100",
+         "url": f"{SITE}/global/en/job/2530100/QA-Automation-Engineer"}
+
+
+def _fixture(name):
+    return (FIXTURES / name).read_text(encoding="utf-8")
+
+
+@pytest.mark.parametrize("name", ["search_results.html", "search_results_no_json.html"])
+def test_extract_page(name):
+    data = extract_page(_fixture(name))
+    assert len(data["jobs"]) == 20
+    assert data["total_jobs"] == 47
+    assert data["jobs"][0] == FIRST
+    assert len({job["job_id"] for job in data["jobs"]}) == 20
+    assert data["next_page"] == f"{SITE}/global/en/search-results?keywords=QA%20automation&from=20&s=1"
+
+
+def test_extract_page_empty():
+    assert extract_page(_fixture("search_results_empty.html")) == {
+        "jobs": [], "next_page": None, "total_jobs": None}
+
+
+def test_extract_page_non_numeric_offset():
+    html = _fixture("search_results_no_json.html").replace("from=20", "from=next")
+    assert extract_page(html)["next_page"].endswith("from=next&s=1")
+
+
+def test_parse_listing():
+    listing = parse_listing(_fixture("search_results.html"))
+    assert listing.total == 47 and len(listing.jobs) == 20
+    assert listing.jobs[0].model_dump() == FIRST
+    assert parse_listing(_fixture("search_results_empty.html")).jobs == []
+    assert parse_listing(_fixture("search_results_no_json.html")) is None
+
+
+class _ReplyLLM:
+    model_name = "fixture"
+
+    def __init__(self, reply):
+        self.reply, self.calls = reply, 0
+
+    def invoke(self, prompt, *args, **kwargs):
+        self.calls += 1
+        return type("Message", (), {"content": self.reply})()
+
+
+@pytest.mark.parametrize("name, source, jobs, calls", [
+    ("search_results.html", "embedded-json", 20, 0),
+    ("search_results_no_json.html", "selectors", 20, 0),
+    ("search_results_empty.html", "embedded-json", 0, 0),
+])
+def test_parse_chain(tmp_path, name, source, jobs, calls):
+    llm = _ReplyLLM('{"jobs": []}')
+    tracer = Tracer(trace_path=tmp_path / "spans.jsonl")
+    found, _, _ = agent_runner._parse_html(
+        f"{SITE}/global/en/search-results?keywords=QA%20automation", _fixture(name),
+        ParsePageTool(llm, cache=LLMCache(tmp_path / "llm.sqlite3")), tracer, 1)
+    assert len(found) == jobs and llm.calls == calls
+    tracer.close()
+    spans = [json.loads(line) for line in (tmp_path / "spans.jsonl").read_text().splitlines()]
+    assert spans[-1]["stage"] == "extraction" and spans[-1]["source"] == source
+
+
+def test_llm_fallback_when_selectors_find_nothing(tmp_path):
+    # the page without its card markup: only the model can read it
+    html = _fixture("search_results_no_json.html").replace("jobs-list-item", "tile")
+    reply = json.dumps({"jobs": [dict(FIRST, employment_type="Full-time")], "total_jobs": 47})
+    llm = _ReplyLLM(f"```json\n{reply}\n```")
+    data = json.loads(ParsePageTool(llm, cache=LLMCache(tmp_path / "llm.sqlite3")).run(html))
+    assert data["source"] == "llm" and llm.calls >= 1
+    assert data["total_jobs"] == 47
+    assert data["jobs"][0]["job_id"] == "2530100"
@@ -0,0 +1,72 @@
+import json
+
+from common.checkpoint import Checkpoint
+
+
+def _jobs(start, n):
+    return [{"title": f"QA {i}", "location": "Durham", "category": "Quality",
+             "job_id": str(i), "url": f"https://x/job/{i}/qa"} for i in range(start, start + n)]
+
+
+def _crawl(tmp_path, pages, keep_jobs=True):
+    checkpoint = Checkpoint("test", "qa", keep_jobs, tmp_path)
+    for page in range(pages):
+        checkpoint.page_done(f"u{page}", f"u{page + 1}", _jobs(page * 20, 20), 100)
+    checkpoint.close()
+    return checkpoint
+
+
+def test_state_file_stays_small(tmp_path):
+    checkpoint = _crawl(tmp_path, 1)
+    first = checkpoint.path.stat().st_size
+    checkpoint = _crawl(tmp_path, 5)
+    state = json.loads(checkpoint.path.read_text())
+    assert "jobs" not in state and "seen" not in state
+    assert checkpoint.path.stat().st_size < first + 5 * 10
+    assert len(checkpoint.log_path.read_text().splitlines()) == 5
+
+
+def test_resume_replays_the_log(tmp_path):
+    _crawl(tmp_path, 3)
+    restored = Checkpoint("test", "qa", True, tmp_path)
+    assert restored.load()
+    assert restored.rows == 60 and len(restored.jobs) == 60
+    assert restored.seen == {str(i) for i in range(60)}
+    restored.page_done("u3", None, _jobs(60, 5))
+    restored.close()
+    again = Checkpoint("test", "qa", True, tmp_path)
+    assert again.load() and len(again.jobs) == 65 and again.next is None
+
+
+def test_keys_only_when_a_sink_holds_the_rows(tmp_path):
+    _crawl(tmp_path, 2, keep_jobs=False)
+    restored = Checkpoint("test", "qa", False, tmp_path)
+    assert restored.load() and len(restored.seen) == 40 and len(restored.jobs) == 0
+    assert '"jobs"' not in restored.log_path.read_text()
+
+
+def test_log_lines_past_the_state_are_dropped(tmp_path):
+    checkpoint = _crawl(tmp_path, 2)
+    with open(checkpoint.log_path, "a", encoding="utf-8") as f:
+        f.write(json.dumps({"page": 3, "keys": ["999"], "jobs": _jobs(999, 1)}) + "\n")
+        f.write('{"page": 4, "keys": ["10')                    # cut short by a crash
+    restored = Checkpoint("test", "qa", True, tmp_path)
+    assert restored.load() and len(restored.jobs) == 40 and "999" not in restored.seen
+    restored.page_done("u2", None, _jobs(40, 1))
+    restored.close()
+    again = Checkpoint("test", "qa", True, tmp_path)
+    assert again.load() and len(again.jobs) == 41
+
+
+def test_fresh_crawl_replaces_an_old_log(tmp_path):
+    _crawl(tmp_path, 3)
+    _crawl(tmp_path, 1)
+    restored = Checkpoint("test", "qa", True, tmp_path)
+    assert restored.load() and len(restored.jobs) == 20
+
+
+def test_finish_removes_both_files(tmp_path):
+    checkpoint = Checkpoint("test", "qa", True, tmp_path)
+    checkpoint.page_done("u0", None, _jobs(0, 1))
+    checkpoint.finish()
+    assert not checkpoint.path.exists() and not checkpoint.log_path.exists()
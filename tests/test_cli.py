@@ -0,0 +1,20 @@
+import pytest
+
+import cli
+from common.page_cache import MODES
+
+
+def _page_cache_action():
+    crawl4ai = cli.build_parser()._subparsers._group_actions[0].choices["crawl4ai"]
+    return next(action for action in crawl4ai._actions if action.dest == "page_cache")
+
+
+def test_page_cache_choices_match_the_cache_modes():
+    assert sorted(_page_cache_action().choices) == sorted(MODES)
+
+
+def test_unknown_page_cache_mode_is_a_usage_error(capsys):
+    with pytest.raises(SystemExit) as exit_info:
+        cli.build_parser().parse_args(["crawl4ai", "qa", "--page-cache", "read-thru"])
+    assert exit_info.value.code == 2
+    assert "invalid choice" in capsys.readouterr().err
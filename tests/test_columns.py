@@ -0,0 +1,37 @@
+import pytest
+
+from common.columns import JobColumns
+
+pa = pytest.importorskip("pyarrow")
+
+
+def _rows(start, n):
+    return [{"title": f"QA {i}", "location": "Durham" if i % 2 else "Remote",
+             "category": "Quality", "job_id": str(i), "url": f"https://x/job/{i}/qa"}
+            for i in range(start, start + n)]
+
+
+def test_extend_after_to_arrow():
+    jobs = JobColumns.from_rows(_rows(0, 3))
+    table = jobs.to_arrow()
+    jobs.extend(_rows(3, 2))               # must not raise BufferError while `table` lives
+    assert table.num_rows == 3
+    assert len(jobs) == 5
+    assert jobs.to_arrow().column("location").to_pylist()[-2:] == ["Durham", "Remote"]
+
+
+def test_extend_after_to_pandas():
+    pytest.importorskip("pandas")
+    jobs = JobColumns.from_rows(_rows(0, 3))
+    frame = jobs.to_pandas()
+    jobs.extend(_rows(3, 1))
+    assert len(frame) == 3
+    assert list(jobs.to_pandas()["job_id"]) == ["0", "1", "2", "3"]
+
+
+def test_state_round_trip_and_missing_values():
+    jobs = JobColumns.from_rows(_rows(0, 2) + [{"title": "No location", "job_id": "9"}])
+    restored = JobColumns.from_state(jobs.to_state())
+    assert list(restored) == list(jobs)
+    assert restored[2]["location"] is None
+    assert restored.to_arrow().column("location").null_count == 1
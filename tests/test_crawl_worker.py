@@ -0,0 +1,45 @@
+import time
+
+import pytest
+
+import agent_runner
+import crawl_worker
+from common.retry import FatalError
+
+
+@pytest.fixture
+def registry(labcorp_site, monkeypatch):
+    monkeypatch.setattr(crawl_worker, "SEARCH_URL",
+                        labcorp_site.url + "/global/en/search-results?keywords={keywords}")
+    return crawl_worker.SearchRegistry()
+
+
+def _wait(task, timeout=30):
+    deadline = time.time() + timeout
+    while not task.done and time.time() < deadline:
+        time.sleep(0.05)
+    return task.snapshot()
+
+
+def test_finished_search_is_reused(registry):
+    task = registry.search("qa")
+    state = _wait(task)
+    assert state["count"] == 45 and state["progress"] == 1.0
+    assert state["error"] is None and state["incomplete"] is None
+    assert registry.search("QA ") is task
+
+
+def test_incomplete_search_is_reported_and_not_reused(registry, monkeypatch):
+    fetch = agent_runner._fetch_traced
+
+    def fetch_or_fail(url, tracer, page=None, *args, **kwargs):
+        if page == 2:
+            raise FatalError("page gone")
+        return fetch(url, tracer, page, *args, **kwargs)
+
+    monkeypatch.setattr(agent_runner, "_fetch_traced", fetch_or_fail)
+    task = registry.search("qa")
+    state = _wait(task)
+    assert state["count"] == 20 and state["progress"] < 1.0
+    assert state["error"] is None and "1 page(s)" in state["incomplete"]
+    assert registry.search("qa") is not task
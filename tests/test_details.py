@@ -0,0 +1,73 @@
+import json
+from types import SimpleNamespace
+
+import pytest
+
+from common import details
+from common.details import NOT_SPECIFIED, DetailCache, DetailEnricher
+from common.tracing import Tracer
+
+JOB = {"title": "QA Engineer", "location": "Durham", "category": "Quality",
+       "job_id": "2530100", "url": "https://x/global/en/job/2530100/QA-Engineer"}
+PAGE = "<html><body><main><h1>QA Engineer</h1><p>Full-time role in Durham.</p></main></body></html>"
+REPLY = ('```json\n{"employment_type": "Full-time", "date_posted": "2026-10-01",'
+         ' "valid_through": null, "description": "Test things."}\n```')
+
+
+class _LLM:
+    def __init__(self, *replies):
+        self.replies = list(replies)
+
+    def invoke(self, prompt):
+        return SimpleNamespace(content=self.replies.pop(0))
+
+
+@pytest.fixture
+def enricher_for(monkeypatch, tmp_path):
+    pages = {"fetches": 0}
+
+    def fetch_html(url, session=None, timeout=15, **kwargs):
+        pages["fetches"] += 1
+        if url.endswith("/gone"):
+            raise details.requests.HTTPError("404 Client Error",
+                                             response=SimpleNamespace(status_code=404))
+        return SimpleNamespace(text=PAGE)
+
+    monkeypatch.setattr(details, "fetch_html", fetch_html)
+    cache = DetailCache(tmp_path / "details.sqlite3")
+
+    def make(llm, tracer=None):
+        return DetailEnricher(llm, cache=cache, max_concurrency=1, tracer=tracer)
+
+    make.pages = pages
+    return make
+
+
+def test_unparseable_reply_is_not_cached(enricher_for):
+    with enricher_for(_LLM("I can't read this page.", REPLY)) as enricher:
+        first = enricher.enrich([JOB])[0]
+        assert first["employment_type"] == NOT_SPECIFIED and first["description"] == ""
+        second = enricher.enrich([JOB])[0]
+    assert second["employment_type"] == "Full-time"
+    assert second["date_posted"] == "2026-10-01"
+    assert enricher.stats() == {"unparseable": 1, "llm": 1}
+    assert enricher_for.pages["fetches"] == 2
+
+
+def test_parsed_reply_is_cached(enricher_for):
+    with enricher_for(_LLM(REPLY)) as enricher:
+        enricher.enrich([JOB])
+        assert enricher.enrich([JOB])[0]["employment_type"] == "Full-time"
+    assert enricher.stats() == {"llm": 1, "cached": 1}
+
+
+def test_failures_are_traced(enricher_for, tmp_path):
+    tracer = Tracer(trace_path=tmp_path / "spans.jsonl")
+    with enricher_for(_LLM("nope"), tracer) as enricher:
+        rows = enricher.enrich([dict(JOB, url="https://x/gone"), dict(JOB, job_id="7")])
+    tracer.close()
+    assert [row["employment_type"] for row in rows] == [NOT_SPECIFIED, NOT_SPECIFIED]
+    spans = [json.loads(line) for line in (tmp_path / "spans.jsonl").read_text().splitlines()]
+    errors = {(span["stage"], span.get("error")) for span in spans if span.get("error")}
+    assert errors == {("navigation", "HTTPError"), ("llm", "UnparseableReply")}
+    assert tracer.summary()["navigation"]["errors"] == 1
@@ -0,0 +1,21 @@
+import json
+
+from benchmarks.fake_llm import USAGE, FakeChatModel
+from benchmarks.mock_site import MockSite
+from common.cards import extract_page
+from tools import ParsePageTool
+
+
+def test_plain_cards_go_to_the_llm_and_come_back_right():
+    with MockSite(45, latency=0, embed_json=False) as site:
+        expected = extract_page(site.search_page("qa", 20))
+        site.plain_cards = True
+        page = site.search_page("qa", 20)
+    assert extract_page(page)["jobs"] == []
+
+    calls = USAGE["calls"]
+    result = json.loads(ParsePageTool(FakeChatModel(latency=0), use_cache=False)._run(page))
+    assert result["source"] == "llm" and USAGE["calls"] > calls
+    assert [job["job_id"] for job in result["jobs"]] == [job["job_id"] for job in expected["jobs"]]
+    assert result["jobs"][0]["url"] == expected["jobs"][0]["url"]
+    assert (result["next_page"], result["total_jobs"]) == (expected["next_page"], 45)
@@ -0,0 +1,25 @@
+"""
+The import-time budgets of benchmarks/import_time.py, as tests. Each module is
+imported in a fresh ``python -X importtime`` interpreter; the best of three
+runs counts. Set IMPORT_TIME_SCALE (e.g. 2) on slow machines.
+"""
+import os
+
+import pytest
+
+from benchmarks.import_time import BUDGETS, best_of, measure
+
+SCALE = float(os.getenv("IMPORT_TIME_SCALE", "1"))
+
+
+@pytest.mark.parametrize("module", sorted(BUDGETS))
+def test_import_budget(module):
+    timing = best_of(module, 3)
+    assert not timing.heavy, f"import {module} loads {sorted(timing.heavy)}"
+    assert timing.ms <= BUDGETS[module] * SCALE
+
+
+def test_heavy_packages_are_detected():
+    # a module that does load langchain, so a broken parser can't pass silently
+    timing = measure("tools")
+    assert "langchain" in timing.heavy and timing.ms > 0
@@ -0,0 +1,29 @@
+from common.job_store import JobStore, delta_crawl
+
+JOBS = [
+    {"title": "QA 1", "job_id": "", "url": "https://x/global/en/job/2530100/QA-1"},
+    {"title": "QA 2", "job_id": " 2530101 ", "url": "https://x/global/en/job/2530101/QA-2"},
+    {"title": "QA 3", "job_id": "2530102", "url": "https://x/global/en/job/2530102/QA-3"},
+]
+
+
+def _fetch(jobs):
+    return lambda offset: (jobs if offset == 0 else [], len(jobs))
+
+
+def test_jobs_are_matched_by_canonical_key(tmp_path):
+    store = JobStore(tmp_path / "jobs.sqlite3")
+    first = delta_crawl("qa", _fetch(JOBS), store)
+    assert len(first.added) == 3
+    assert store.active_ids("qa") == {"2530100", "2530101", "2530102"}
+
+    again = delta_crawl("qa", _fetch(JOBS), store)
+    assert again.added == [] and again.removed == []
+    assert store.get("2530100")["title"] == "QA 1"
+
+
+def test_removed_jobs_are_found_by_key(tmp_path):
+    store = JobStore(tmp_path / "jobs.sqlite3")
+    delta_crawl("qa", _fetch(JOBS), store)
+    result = delta_crawl("qa", _fetch(JOBS[1:]), store)
+    assert result.added == [] and result.removed == ["2530100"]
@@ -0,0 +1,27 @@
+import pytest
+
+from common.llm_json import extract_json_text, parse_json_reply
+
+
+@pytest.mark.parametrize("reply, expected", [
+    ('{"jobs": []}', '{"jobs": []}'),
+    ('  {"jobs": []}\n', '{"jobs": []}'),
+    ('Here you go:\n```json\n{"jobs": []}\n```', '{"jobs": []}'),
+    ('```JSON\n{"jobs": []}\n```\nAnything else?', '{"jobs": []}'),
+    ('```\n[1, 2]\n```', '[1, 2]'),
+    ('Sure! {"jobs": [{"id": 1}]} Hope this helps.', '{"jobs": [{"id": 1}]}'),
+    ('no json at all', 'no json at all'),
+])
+def test_extract_json_text(reply, expected):
+    assert extract_json_text(reply) == expected
+
+
+def test_parse_json_reply():
+    assert parse_json_reply('```json\n{"next_page": null, "total_jobs": 3}\n```') == {
+        "next_page": None, "total_jobs": 3}
+    assert parse_json_reply('[{"title": "QA"}]') == [{"title": "QA"}]
+
+
+@pytest.mark.parametrize("reply", ["I could not find any jobs.", '{"jobs": [', "```json\n```", ""])
+def test_parse_json_reply_unparseable(reply):
+    assert parse_json_reply(reply) is None
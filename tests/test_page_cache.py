@@ -0,0 +1,73 @@
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from common.page_cache import BYPASS, READ_THROUGH, REVALIDATE, PageCache
+
+ETAG = '"v1"'
+
+
+class _Handler(BaseHTTPRequestHandler):
+    requests = []
+
+    def do_HEAD(self):
+        self.requests.append((self.command, self.headers.get("If-None-Match")))
+        if self.headers.get("If-None-Match") == ETAG:
+            self.send_response(304)
+        else:
+            self.send_response(200)
+            self.send_header("ETag", '"v2"')
+        self.end_headers()
+
+    do_GET = do_HEAD
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    _Handler.requests = []
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{httpd.server_address[1]}"
+    httpd.shutdown()
+
+
+def test_default_mode_bypasses(tmp_path):
+    cache = PageCache(path=tmp_path / "pages.sqlite3")
+    assert cache.mode == BYPASS
+    cache.store("http://x/", "<html/>")
+    assert cache.get("http://x/") is None
+
+
+def test_store_makes_no_request(server, tmp_path):
+    cache = PageCache(REVALIDATE, tmp_path / "pages.sqlite3")
+    cache.store(f"{server}/a", "<html>a</html>", {"etag": ETAG})
+    assert _Handler.requests == []
+    assert cache.get(f"{server}/a").etag == ETAG
+
+
+def test_revalidate_uses_conditional_head(server, tmp_path):
+    cache = PageCache(REVALIDATE, tmp_path / "pages.sqlite3")
+    cache.store(f"{server}/a", "<html>a</html>", {"ETag": ETAG})
+    cache.store(f"{server}/b", "<html>b</html>", {"ETag": '"old"'})
+    assert cache.lookup(f"{server}/a") == "<html>a</html>"
+    assert cache.lookup(f"{server}/b") is None
+    assert _Handler.requests == [("HEAD", ETAG), ("HEAD", '"old"')]
+    assert cache.stats() == {"mode": REVALIDATE, "hits": 1, "misses": 1, "revalidated": 1}
+
+
+def test_page_without_validators_is_stale_without_a_request(server, tmp_path):
+    cache = PageCache(REVALIDATE, tmp_path / "pages.sqlite3")
+    cache.store(f"{server}/a", "<html>a</html>")
+    assert cache.lookup(f"{server}/a") is None
+    assert _Handler.requests == []
+
+
+def test_read_through_serves_without_asking(server, tmp_path):
+    cache = PageCache(READ_THROUGH, tmp_path / "pages.sqlite3")
+    cache.store(f"{server}/a", "<html>a</html>")
+    assert cache.lookup(f"{server}/a") == "<html>a</html>"
+    assert _Handler.requests == []
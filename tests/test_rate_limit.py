@@ -0,0 +1,34 @@
+from common import rate_limit
+from common.rate_limit import BURST, INITIAL_RATE, RateLimiter
+
+URL = "http://example.test/page"
+
+
+def test_default_burst_covers_four_pages_in_flight():
+    limiter = RateLimiter()
+    waits = [limiter._reserve(URL) for _ in range(4)]
+    assert waits == [0.0, 0.0, 0.0, 0.0]
+    assert limiter._reserve(URL) > 0
+
+
+def test_starting_rate_from_environment(monkeypatch):
+    monkeypatch.setattr(rate_limit, "_limiter", None)
+    monkeypatch.setenv("LABCORP_RATE", "8")
+    monkeypatch.setenv("LABCORP_BURST", "6")
+    limiter = rate_limit.get_limiter()
+    assert (limiter.rate, limiter.burst) == (8.0, 6)
+    assert rate_limit.get_limiter() is limiter
+
+
+def test_unset_environment_keeps_defaults(monkeypatch):
+    monkeypatch.setattr(rate_limit, "_limiter", None)
+    monkeypatch.delenv("LABCORP_RATE", raising=False)
+    monkeypatch.delenv("LABCORP_BURST", raising=False)
+    limiter = rate_limit.get_limiter()
+    assert (limiter.rate, limiter.burst) == (INITIAL_RATE, BURST)
+
+
+def test_throttle_halves_the_rate():
+    limiter = RateLimiter()
+    limiter.record(URL, 429, 0.1)
+    assert limiter.stats()["example.test"]["rate"] == INITIAL_RATE / 2
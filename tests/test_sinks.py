@@ -0,0 +1,72 @@
+import csv
+import json
+
+import pytest
+
+import cli
+from common.sinks import JOB_FIELDS, CsvSink, JobSink, can_append, open_sink
+
+ROWS = [{"title": "QA", "location": "Durham", "category": "Quality", "job_id": "1",
+         "url": "https://x/job/1", "employment_type": "Full-time", "date_posted": "2026-10-01"},
+        {"title": "SDET", "location": "Remote", "category": "Quality", "job_id": "2",
+         "url": "https://x/job/2", "employment_type": "Contract", "date_posted": None}]
+
+
+def test_sink_must_implement_open_and_write():
+    class Incomplete(JobSink):
+        def _open(self):
+            pass
+
+    with pytest.raises(TypeError):
+        Incomplete("x.csv")
+
+
+def test_csv_keeps_enriched_columns(tmp_path):
+    path = tmp_path / "jobs.csv"
+    with CsvSink(path) as sink:
+        sink.write_page(ROWS)
+    with open(path, newline="", encoding="utf-8") as f:
+        rows = list(csv.DictReader(f))
+    assert list(rows[0]) == JOB_FIELDS + ["employment_type", "date_posted"]
+    assert [row["employment_type"] for row in rows] == ["Full-time", "Contract"]
+
+
+def test_explicit_fields_still_select_columns(tmp_path):
+    path = tmp_path / "jobs.jsonl"
+    with open_sink(path, ["job_id", "title"]) as sink:
+        sink.write_page(ROWS)
+    assert json.loads(path.read_text().splitlines()[0]) == {"job_id": "1", "title": "QA"}
+
+
+def test_csv_append_follows_the_existing_header(tmp_path):
+    path = tmp_path / "jobs.csv"
+    with CsvSink(path) as sink:
+        sink.write_page(ROWS[:1])
+    with CsvSink(path, append=True) as sink:
+        sink.write_page([dict(ROWS[1], description="Test things.")])
+    with open(path, newline="", encoding="utf-8") as f:
+        rows = list(csv.DictReader(f))
+    assert len(rows) == 2 and "description" not in rows[1]
+
+
+def test_parquet_keeps_enriched_columns(tmp_path):
+    pq = pytest.importorskip("pyarrow.parquet")
+    path = tmp_path / "jobs.parquet"
+    with open_sink(path) as sink:
+        sink.write_page(ROWS)
+    table = pq.read_table(path)
+    assert table.column("employment_type").to_pylist() == ["Full-time", "Contract"]
+    assert table.column("date_posted").to_pylist() == ["2026-10-01", None]
+
+
+def test_can_append():
+    assert can_append("jobs.csv") and can_append("jobs.JSONL")
+    assert not can_append("jobs.parquet")
+
+
+@pytest.mark.parametrize("command", ["search", "crawl4ai"])
+def test_cli_rejects_resume_into_parquet(command, capsys):
+    with pytest.raises(SystemExit) as exit_info:
+        cli.main([command, "qa", "--resume", "--output", "jobs.parquet"])
+    assert exit_info.value.code == 2
+    assert "can't be appended to" in capsys.readouterr().err
@@ -0,0 +1,94 @@
+import asyncio
+import json
+import re
+from pathlib import Path
+
+import pytest
+
+from common.llm_cache import LLMCache
+from tools import ParsePageTool
+
+FIXTURES = Path(__file__).resolve().parent.parent / "fixtures"
+
+PAGE = "<html><body><main><p>Opening: QA Engineer {n}, Durham</p></main></body></html>"
+
+
+class ScriptedLLM:
+    """Chat model that answers every prompt with `reply`, counting calls in flight."""
+
+    model_name = "scripted"
+
+    def __init__(self, reply, delay=0.0):
+        self.reply = reply
+        self.delay = delay
+        self.calls = 0
+        self.in_flight = self.max_in_flight = 0
+
+    def _message(self, prompt):
+        self.calls += 1
+        n = re.search(r"QA Engineer (\d+)", str(prompt)).group(1)
+        return type("Message", (), {"content": self.reply.replace("{n}", n)})()
+
+    def invoke(self, prompt, *args, **kwargs):
+        return self._message(prompt)
+
+    async def ainvoke(self, prompt, *args, **kwargs):
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        await asyncio.sleep(self.delay)
+        self.in_flight -= 1
+        return self._message(prompt)
+
+
+GOOD_REPLY = ('```json\n{"jobs": [{"title": "QA Engineer {n}", "location": "Durham", '
+              '"job_id": "{n}", "url": "/global/en/job/{n}/QA"}], "total_jobs": 1}\n```')
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return LLMCache(tmp_path / "llm.sqlite3")
+
+
+def test_selectors_come_first(cache):
+    llm = ScriptedLLM(GOOD_REPLY)
+    html = (FIXTURES / "search_results_no_json.html").read_text(encoding="utf-8")
+    data = json.loads(ParsePageTool(llm, cache=cache).run(html))
+    assert data["source"] == "selectors" and data["jobs"]
+    assert llm.calls == 0
+
+
+def test_llm_fallback_is_cached(cache):
+    llm = ScriptedLLM(GOOD_REPLY)
+    tool = ParsePageTool(llm, cache=cache)
+    first = json.loads(tool.run(PAGE.format(n=7)))
+    assert first["source"] == "llm"
+    assert [job["job_id"] for job in first["jobs"]] == ["7"]
+    assert first["llm_usage"]["calls"] == 1
+    assert json.loads(tool.run(PAGE.format(n=7)))["source"] == "llm-cache"
+    assert llm.calls == 1
+
+
+def test_unparseable_reply_is_an_empty_result_and_not_cached(cache):
+    llm = ScriptedLLM("Sorry, I can't help with that.")
+    tool = ParsePageTool(llm, cache=cache)
+    data = json.loads(tool.run(PAGE.format(n=1)))
+    assert data["jobs"] == [] and data["source"] == "llm-unparseable"
+    assert "parsed" in data["error"]
+    json.loads(tool.run(PAGE.format(n=1)))
+    assert llm.calls == 2
+    assert cache.stats()["entries"] == 0
+
+
+def test_aparse_unparseable_reply(cache):
+    tool = ParsePageTool(ScriptedLLM("not json"), cache=cache)
+    data = json.loads(asyncio.run(tool._aparse(PAGE.format(n=2))))
+    assert data["jobs"] == [] and data["source"] == "llm-unparseable"
+
+
+def test_aparse_pages_keeps_order_and_limits_concurrency(cache):
+    llm = ScriptedLLM(GOOD_REPLY, delay=0.02)
+    tool = ParsePageTool(llm, cache=cache)
+    results = asyncio.run(tool.aparse_pages([PAGE.format(n=n) for n in range(6)],
+                                            max_concurrency=2))
+    assert [json.loads(r)["jobs"][0]["job_id"] for r in results] == [str(n) for n in range(6)]
+    assert llm.calls == 6 and llm.max_in_flight == 2
@@ -1,10 +1,21 @@
 # imports
-from pydantic import BaseModel, Field, PrivateAttr
+import asyncio
+import time
+from typing import Dict, List, Optional, Tuple
+from pydantic import BaseModel, Field, PrivateAttr, ValidationError
 from langchain.tools import BaseTool
 from langchain_core.prompts import PromptTemplate
 from langchain_openai import ChatOpenAI
+from common.cards import extract_page
+from common.llm_cache import LLMCache, get_cache, make_key
+from common.llm_json import extract_json_text, parse_json_reply
+from common.prune import LLM_TOKEN_BUDGET, merge_results, prepare_for_llm
+from common.tracing import llm_usage, merge_usage
 import json
 
+# LLM requests in flight at once when parsing pages in a batch
+LLM_CONCURRENCY = 4
+
 parse_prompt = PromptTemplate(
     input_variables=["html"],
     template="""
@@ -15,8 +26,8 @@ Extract ALL job cards on that page, returning JSON with keys:
 - total_jobs: the total number of jobs found (from page header/metadata if available)
 
 For job_id, extract only the numeric ID without any prefix.
-For employment_type, determine if it's "Full-time", "Part-time", "Contract", etc. based on job description.
-If employment_type is not explicitly mentioned, set it to "Not specified".
+Set employment_type ("Full-time", "Part-time", "Contract", etc.) only when the card states it;
+do not guess. Otherwise set it to "Not specified".
 
 Return ONLY valid JSON.
 HTML:
@@ -24,42 +35,162 @@ HTML:
 """
 )
 
+class JobCard(BaseModel):
+    title: str = Field(min_length=1)
+    location: str = ""
+    category: str = ""
+    job_id: str = Field(min_length=1)
+    url: str = Field(min_length=1)
+    employment_type: str = "Not specified"
+
+
+class PageResult(BaseModel):
+    jobs: List[JobCard]
+    next_page: Optional[str] = None
+    total_jobs: Optional[int] = None
+
+
 class ParsePageTool(BaseTool):
     name: str = "parse_page"
     description: str = (
         "Parse LabCorp search-results HTML and return JSON with "
-        "a list of jobs + next_page URL."
+        "a list of jobs + next_page URL. Uses the page's job-card "
+        "selectors and only falls back to the LLM when they find nothing."
     )
 
     _llm: ChatOpenAI = PrivateAttr()
     _prompt: PromptTemplate = PrivateAttr()
+    _token_budget: int = PrivateAttr()
+    _cache: Optional[LLMCache] = PrivateAttr()
 
-    def __init__(self, llm: ChatOpenAI):
+    def __init__(self, llm: ChatOpenAI, token_budget: int = LLM_TOKEN_BUDGET,
+                 cache: Optional[LLMCache] = None, use_cache: bool = True):
         super().__init__()
         object.__setattr__(self, "_llm", llm)
         object.__setattr__(self, "_prompt", parse_prompt)
+        object.__setattr__(self, "_token_budget", token_budget)
+        object.__setattr__(self, "_cache", (cache or get_cache()) if use_cache else None)
+
+    @property
+    def cache(self) -> Optional[LLMCache]:
+        """The LLM result cache (None when disabled); exposes hit/miss stats."""
+        return self._cache
 
     def _run(self, html: str) -> str:
-        formatted_prompt = self._prompt.format(html=html)
-        result = self._llm.invoke(formatted_prompt).content
-        try:
-            json_result = json.loads(result)
-            return result
-        except json.JSONDecodeError:
-            import re
-            json_pattern = r'```json\n(.*?)```'
-            matches = re.search(json_pattern, result, re.DOTALL)
-            if matches:
-                json_text = matches.group(1)
-                return json_text
-            
-            result = result.strip()
-            if not result.startswith('{'):
-                result = '{' + result.split('{', 1)[1]
-            if not result.endswith('}'):
-                result = result.rsplit('}', 1)[0] + '}'
-            
-            return result
+        data = self._parse_with_selectors(html)
+        if data is not None:
+            return self._result(data, "selectors")
+        chunks, key, cached = self._prepare_llm(html)
+        if cached is not None:
+            return self._result(cached, "llm-cache")
+        return self._llm_result([self._parse_with_llm(chunk) for chunk in chunks], key)
 
     async def _arun(self, html: str) -> str:
-        raise NotImplementedError("Async not supported")
\ No newline at end of file
+        return await self._aparse(html)
+
+    def parse_pages(self, pages: List[str],
+                    max_concurrency: int = LLM_CONCURRENCY) -> List[str]:
+        """Blocking wrapper around `aparse_pages` for synchronous callers."""
+        return asyncio.run(self.aparse_pages(pages, max_concurrency))
+
+    async def aparse_pages(self, pages: List[str],
+                           max_concurrency: int = LLM_CONCURRENCY) -> List[str]:
+        """
+        Parses many pages concurrently.
+
+        Selector parsing and cache lookups run for every page at once; at
+        most `max_concurrency` LLM requests are in flight across all pages.
+
+        Returns:
+            List[str]: One JSON result per page, in input order.
+        """
+        limit = asyncio.Semaphore(max(max_concurrency, 1))
+        return list(await asyncio.gather(*(self._aparse(html, limit) for html in pages)))
+
+    async def _aparse(self, html: str, limit: Optional[asyncio.Semaphore] = None) -> str:
+        data = await asyncio.to_thread(self._parse_with_selectors, html)
+        if data is not None:
+            return self._result(data, "selectors")
+        chunks, key, cached = await asyncio.to_thread(self._prepare_llm, html)
+        if cached is not None:
+            return self._result(cached, "llm-cache")
+        replies = await asyncio.gather(*(self._aparse_with_llm(chunk, limit) for chunk in chunks))
+        return await asyncio.to_thread(self._llm_result, list(replies), key)
+
+    def _prepare_llm(self, html: str) -> Tuple[List[str], str, Optional[dict]]:
+        """Prompt chunks, their cache key and the cached result, if any."""
+        chunks = prepare_for_llm(html, self._token_budget, "parse_page: ")
+        key = self._cache_key(chunks)
+        cached = self._cache.get(key) if self._cache else None
+        return chunks, key, cached
+
+    def _llm_result(self, replies: List[Tuple[str, Dict]], key: str) -> str:
+        """
+        Merges per-chunk (reply, usage) pairs and caches the merged result.
+        The summed usage is reported in the result as ``llm_usage``. When no
+        reply parses, the result has no jobs, source "llm-unparseable" and an
+        ``error``, and nothing is cached.
+        """
+        usage = merge_usage(u for _, u in replies)
+        results = []
+        for reply, _ in replies:
+            data = parse_json_reply(reply)
+            if isinstance(data, dict):
+                results.append(data)
+            else:
+                print("parse_page: LLM returned unparseable JSON")
+        if not results:
+            error = f"none of {len(replies)} LLM replies parsed as JSON"
+            return self._result({"jobs": [], "next_page": None, "total_jobs": None,
+                                 "error": error}, "llm-unparseable", usage)
+        data = merge_results(results)
+        if self._cache:
+            self._cache.set(key, data)
+        return self._result(data, "llm", usage)
+
+    @staticmethod
+    def _result(data: dict, source: str, usage: Optional[Dict] = None) -> str:
+        data["source"] = source
+        if usage:
+            data["llm_usage"] = usage
+        print(f"parse_page: {len(data.get('jobs') or [])} jobs via {source}")
+        return json.dumps(data)
+
+    def _cache_key(self, chunks: List[str]) -> str:
+        model = getattr(self._llm, "model_name", None) or type(self._llm).__name__
+        schema = json.dumps(PageResult.model_json_schema(), sort_keys=True)
+        return make_key("\n".join(chunks), self._prompt.template, model, schema)
+
+    def _parse_with_selectors(self, html: str) -> Optional[dict]:
+        """Deterministic card parsing; None when it finds nothing usable."""
+        try:
+            page = PageResult.model_validate(extract_page(html))
+        except ValidationError as e:
+            print(f"parse_page: selector output failed validation ({e.error_count()} errors)")
+            return None
+        except Exception as e:
+            print(f"parse_page: selector parsing failed: {e}")
+            return None
+        if not page.jobs:
+            return None
+        return page.model_dump()
+
+    def _parse_with_llm(self, html: str) -> Tuple[str, Dict]:
+        formatted_prompt = self._prompt.format(html=html)
+        started = time.perf_counter()
+        reply = self._llm.invoke(formatted_prompt)
+        usage = llm_usage(formatted_prompt, reply, time.perf_counter() - started)
+        return extract_json_text(reply.content), usage
+
+    async def _aparse_with_llm(self, html: str,
+                               limit: Optional[asyncio.Semaphore] = None) -> Tuple[str, Dict]:
+        formatted_prompt = self._prompt.format(html=html)
+        if limit is None:
+            started = time.perf_counter()
+            reply = await self._llm.ainvoke(formatted_prompt)
+        else:
+            async with limit:
+                started = time.perf_counter()
+                reply = await self._llm.ainvoke(formatted_prompt)
+        usage = llm_usage(formatted_prompt, reply, time.perf_counter() - started)
+        return extract_json_text(reply.content), usage